@@ -0,0 +1,38 @@
+"""compress_tokenomics_cache_payload
+
+Revision ID: e3a9f6c1b582
+Revises: b7e41c9a2d10
+Create Date: 2026-10-16 11:47:05.631092
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e3a9f6c1b582'
+down_revision = 'b7e41c9a2d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Cached payloads are disposable, so recreate the table with a binary
+    # column instead of converting existing JSON text rows.
+    op.drop_table('tokenomics_cache')
+    op.create_table('tokenomics_cache',
+    sa.Column('coin_id', sa.String(length=50), nullable=False),
+    sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.PrimaryKeyConstraint('coin_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('tokenomics_cache')
+    op.create_table('tokenomics_cache',
+    sa.Column('coin_id', sa.String(length=50), nullable=False),
+    sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.PrimaryKeyConstraint('coin_id')
+    )
@@ -8,14 +8,17 @@ Handles API calls to OpenAI/OpenRouter with:
 - Daily budget tracking
 - Cost calculation
 - Structured output support via Instructor
+- Optional exact-match response cache (settings.llm_cache)
 """
 import asyncio
-import json
+import hashlib
 import time
-from datetime import datetime, date
-from typing import Optional, Dict, Any, List, TypeVar, Type
+import zlib
+from datetime import datetime, date, timezone
+from typing import Optional, Dict, Any, Callable, List, Tuple, TypeVar, Type
 from decimal import Decimal
 
+import orjson
 import tiktoken
 from openai import AsyncOpenAI, OpenAI
 from sqlalchemy.orm import Session
@@ -23,7 +26,7 @@ from pydantic import BaseModel
 import instructor
 
 from app.core.config import settings
-from app.models.database import AgentLog
+from app.models.database import AgentLog, LLMResponseCache
 
 # Type variable for generic Pydantic models
 T = TypeVar('T', bound=BaseModel)
@@ -183,6 +186,60 @@ class LLMClient:
         
         return Decimal(str(input_cost + output_cost)).quantize(Decimal("0.000001"))
     
+    @staticmethod
+    def _cache_key(model: str, messages: List[Dict[str, str]], **params: Any) -> str:
+        """Hash the model, messages and sampling params into a response cache key."""
+        blob = orjson.dumps([model, messages, params], option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(blob).hexdigest()
+    
+    def _load_cached_response(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a cached completion if the response cache is enabled and the entry is fresh.
+        
+        Args:
+            cache_key: Key from _cache_key
+            
+        Returns:
+            Cached result dict (marked cached, with zero cost), or None on a miss
+        """
+        if not settings.llm_cache:
+            return None
+        
+        # A corrupt entry is treated as a miss so the call falls back to the API
+        try:
+            row = self.db.get(LLMResponseCache, cache_key)
+            if row is None:
+                return None
+            
+            created_at = row.created_at
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            age = (datetime.now(timezone.utc) - created_at).total_seconds()
+            if age > settings.llm_cache_ttl_seconds:
+                return None
+            
+            result = orjson.loads(zlib.decompress(row.payload))
+        except Exception as e:
+            print(f"Warning: Could not read LLM response cache: {e}")
+            return None
+        return {**result, "cost": 0.0, "latency": 0.0, "cached": True}
+    
+    def _store_cached_response(self, cache_key: str, result: Dict[str, Any]):
+        """Store a completion in the response cache if it is enabled."""
+        if not settings.llm_cache:
+            return
+        
+        try:
+            self.db.merge(LLMResponseCache(
+                cache_key=cache_key,
+                created_at=datetime.now(timezone.utc),
+                payload=zlib.compress(orjson.dumps(result), 3),
+            ))
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            print(f"Warning: Could not write LLM response cache: {e}")
+    
     def call(
         self,
         messages: List[Dict[str, str]],
@@ -214,6 +271,15 @@ class LLMClient:
         """
         model = model or settings.cheap_model
         
+        # Serve identical requests from the response cache when enabled
+        cache_key = self._cache_key(
+            model, messages,
+            temperature=temperature, max_tokens=max_tokens, response_format=response_format
+        )
+        cached = self._load_cached_response(cache_key)
+        if cached is not None:
+            return cached
+        
         # Estimate input tokens
         input_text = "\n".join(msg["content"] for msg in messages)
         estimated_input_tokens = self.count_tokens(input_text)
@@ -267,7 +333,7 @@ class LLMClient:
                 log_entry = AgentLog(
                     agent_name=agent_name or "unknown",
                     model=model,
-                    input_data=json.dumps(messages),
+                    input_data=orjson.dumps(messages).decode(),
                     output_data=content,
                     tokens_used=total_tokens,
                     input_tokens=input_tokens,
@@ -279,7 +345,7 @@ class LLMClient:
                 self.db.add(log_entry)
                 self.db.commit()
                 
-                return {
+                result = {
                     "content": content,
                     "finish_reason": finish_reason,
                     "model": model,
@@ -289,6 +355,8 @@ class LLMClient:
                     "cost": float(cost),
                     "latency": latency,
                 }
+                self._store_cached_response(cache_key, result)
+                return result
                 
             except Exception as e:
                 last_exception = e
@@ -310,7 +378,7 @@ class LLMClient:
                     log_entry = AgentLog(
                         agent_name=agent_name or "unknown",
                         model=model,
-                        input_data=json.dumps(messages),
+                        input_data=orjson.dumps(messages).decode(),
                         output_data=f"ERROR: {str(e)}",
                         tokens_used=0,
                         cost=Decimal("0"),
@@ -330,6 +398,77 @@ class LLMClient:
                             f"LLM call failed after {max_retries} attempts: {str(e)}"
                         ) from last_exception
     
+    @staticmethod
+    def _parse_tool_calls(raw_tool_calls: List[Tuple[str, str, str]]) -> List[Dict[str, Any]]:
+        """
+        Decode tool call arguments, dropping calls whose arguments aren't valid JSON.
+        
+        With no valid calls left, ReAct agents fall back to parsing the text response.
+        
+        Args:
+            raw_tool_calls: (id, name, arguments JSON) tuples
+            
+        Returns:
+            List of {"id", "name", "arguments"} dicts
+        """
+        tool_calls = []
+        for call_id, name, arguments in raw_tool_calls:
+            try:
+                parsed_args = orjson.loads(arguments or "{}")
+            except orjson.JSONDecodeError as e:
+                print(f"Warning: Ignoring tool call {name} with malformed arguments: {e}")
+                continue
+            tool_calls.append({"id": call_id, "name": name, "arguments": parsed_args})
+        return tool_calls
+    
+    @staticmethod
+    async def _read_stream(
+        stream: Any,
+        on_token: Callable[[str], None]
+    ) -> Tuple[Optional[str], Optional[str], List[Tuple[str, str, str]], Any]:
+        """
+        Consume a streamed chat completion, forwarding text chunks as they arrive.
+        
+        Args:
+            stream: Async iterator of chat completion chunks
+            on_token: Callback receiving each text chunk
+            
+        Returns:
+            Tuple of (content, finish reason, tool calls as (id, name, arguments JSON)
+            tuples, usage or None)
+        """
+        content_parts = []
+        calls: Dict[int, List[str]] = {}
+        finish_reason = None
+        usage = None
+        
+        async for chunk in stream:
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            
+            choice = chunk.choices[0]
+            delta = choice.delta
+            if delta.content:
+                content_parts.append(delta.content)
+                on_token(delta.content)
+            # Tool calls arrive as fragments keyed by index: id and name once, arguments in pieces
+            for call in delta.tool_calls or []:
+                entry = calls.setdefault(call.index, ["", "", ""])
+                if call.id:
+                    entry[0] = call.id
+                if call.function and call.function.name:
+                    entry[1] = call.function.name
+                if call.function and call.function.arguments:
+                    entry[2] += call.function.arguments
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+        
+        content = "".join(content_parts) if content_parts else None
+        tool_calls = [tuple(calls[index]) for index in sorted(calls)]
+        return content, finish_reason, tool_calls, usage
+    
     async def acall(
         self,
         messages: List[Dict[str, str]],
@@ -339,6 +478,9 @@ class LLMClient:
         max_tokens: Optional[int] = None,
         response_format: Optional[Dict[str, str]] = None,
         max_retries: int = 5,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        tool_choice: Optional[str] = None,
+        on_token: Optional[Callable[[str], None]] = None,
     ) -> Dict[str, Any]:
         """
         Make an asynchronous LLM API call with retry logic.
@@ -351,9 +493,14 @@ class LLMClient:
             max_tokens: Max tokens to generate
             response_format: Optional response format (e.g., {"type": "json_object"})
             max_retries: Number of retry attempts
+            tools: Optional OpenAI function-calling tool schemas
+            tool_choice: Optional tool choice (e.g., "auto"), used with tools
+            on_token: Optional callback; if given, the completion is streamed and
+                each text chunk is passed to it as it arrives
             
         Returns:
-            Dict with response, tokens, cost, etc.
+            Dict with response, tokens, cost, etc. When tools are given,
+            also "tool_calls": a list of {"id", "name", "arguments"} dicts
             
         Raises:
             BudgetExceededError: If daily budget exceeded
@@ -361,6 +508,18 @@ class LLMClient:
         """
         model = model or settings.cheap_model
         
+        # Serve identical requests from the response cache when enabled
+        cache_key = self._cache_key(
+            model, messages,
+            temperature=temperature, max_tokens=max_tokens, response_format=response_format,
+            tools=tools, tool_choice=tool_choice
+        )
+        cached = self._load_cached_response(cache_key)
+        if cached is not None:
+            if on_token and cached["content"]:
+                on_token(cached["content"])
+            return cached
+        
         # Estimate input tokens
         input_text = "\n".join(msg["content"] for msg in messages)
         estimated_input_tokens = self.count_tokens(input_text)
@@ -393,16 +552,42 @@ class LLMClient:
                 if response_format:
                     kwargs["response_format"] = response_format
                 
-                response = await self.async_client.chat.completions.create(**kwargs)
+                if tools:
+                    kwargs["tools"] = tools
+                    if tool_choice:
+                        kwargs["tool_choice"] = tool_choice
                 
-                # Extract response
-                content = response.choices[0].message.content
-                finish_reason = response.choices[0].finish_reason
-                
-                # Get token usage
-                input_tokens = response.usage.prompt_tokens
-                output_tokens = response.usage.completion_tokens
-                total_tokens = response.usage.total_tokens
+                if on_token:
+                    stream = await self.async_client.chat.completions.create(
+                        **kwargs, stream=True, stream_options={"include_usage": True}
+                    )
+                    content, finish_reason, raw_tool_calls, usage = await self._read_stream(stream, on_token)
+                else:
+                    response = await self.async_client.chat.completions.create(**kwargs)
+                    
+                    # Extract response
+                    message = response.choices[0].message
+                    content = message.content
+                    finish_reason = response.choices[0].finish_reason
+                    raw_tool_calls = [
+                        (call.id, call.function.name, call.function.arguments)
+                        for call in (message.tool_calls or [])
+                    ] if tools else []
+                    usage = response.usage
+                
+                # With native tool calling the text may be empty and the action is in tool_calls
+                if tools:
+                    content = content or ""
+                
+                # Get token usage (estimated if a stream did not report it)
+                if usage is not None:
+                    input_tokens = usage.prompt_tokens
+                    output_tokens = usage.completion_tokens
+                    total_tokens = usage.total_tokens
+                else:
+                    input_tokens = estimated_input_tokens
+                    output_tokens = self.count_tokens(content or "")
+                    total_tokens = input_tokens + output_tokens
                 
                 # Calculate cost
                 cost = self.calculate_cost(model, input_tokens, output_tokens)
@@ -414,7 +599,7 @@ class LLMClient:
                 log_entry = AgentLog(
                     agent_name=agent_name or "unknown",
                     model=model,
-                    input_data=json.dumps(messages),
+                    input_data=orjson.dumps(messages).decode(),
                     output_data=content,
                     tokens_used=total_tokens,
                     input_tokens=input_tokens,
@@ -426,7 +611,7 @@ class LLMClient:
                 self.db.add(log_entry)
                 self.db.commit()
                 
-                return {
+                result = {
                     "content": content,
                     "finish_reason": finish_reason,
                     "model": model,
@@ -436,6 +621,11 @@ class LLMClient:
                     "cost": float(cost),
                     "latency": latency,
                 }
+                if tools:
+                    # Parsed after logging, so a bad tool call never discards a paid completion
+                    result["tool_calls"] = self._parse_tool_calls(raw_tool_calls)
+                self._store_cached_response(cache_key, result)
+                return result
                 
             except Exception as e:
                 last_exception = e
@@ -457,7 +647,7 @@ class LLMClient:
                     log_entry = AgentLog(
                         agent_name=agent_name or "unknown",
                         model=model,
-                        input_data=json.dumps(messages),
+                        input_data=orjson.dumps(messages).decode(),
                         output_data=f"ERROR: {str(e)}",
                         tokens_used=0,
                         cost=Decimal("0"),
@@ -557,7 +747,7 @@ class LLMClient:
                 log_entry = AgentLog(
                     agent_name=agent_name or "unknown",
                     model=model,
-                    input_data=json.dumps(messages),
+                    input_data=orjson.dumps(messages).decode(),
                     output_data=output_text,
                     tokens_used=total_tokens,
                     input_tokens=input_tokens,
@@ -591,7 +781,7 @@ class LLMClient:
                     log_entry = AgentLog(
                         agent_name=agent_name or "unknown",
                         model=model,
-                        input_data=json.dumps(messages),
+                        input_data=orjson.dumps(messages).decode(),
                         output_data=f"ERROR: {str(e)}",
                         tokens_used=0,
                         cost=Decimal("0"),
@@ -690,7 +880,7 @@ class LLMClient:
                 log_entry = AgentLog(
                     agent_name=agent_name or "unknown",
                     model=model,
-                    input_data=json.dumps(messages),
+                    input_data=orjson.dumps(messages).decode(),
                     output_data=output_text,
                     tokens_used=total_tokens,
                     input_tokens=input_tokens,
@@ -724,7 +914,7 @@ class LLMClient:
                     log_entry = AgentLog(
                         agent_name=agent_name or "unknown",
                         model=model,
-                        input_data=json.dumps(messages),
+                        input_data=orjson.dumps(messages).decode(),
                         output_data=f"ERROR: {str(e)}",
                         tokens_used=0,
                         cost=Decimal("0"),
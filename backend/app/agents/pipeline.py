@@ -3,6 +3,7 @@ Agent Pipeline Orchestrator
 
 Coordinates the full multi-agent decision-making flow.
 """
+import asyncio
 from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
 from datetime import datetime
@@ -230,7 +231,6 @@ class AgentPipeline:
             
             if self.use_react:
                 # ReAct agents are async only
-                import asyncio
                 research_result = asyncio.run(self.researcher.analyze(research_context))
             else:
                 research_result = self.researcher.analyze_structured(research_context)
@@ -278,7 +278,6 @@ class AgentPipeline:
             }
             
             if self.use_react:
-                import asyncio
                 trader_result = asyncio.run(self.trader.analyze(trader_context))
             else:
                 trader_result = self.trader.analyze_structured(trader_context)
@@ -324,7 +323,6 @@ class AgentPipeline:
             }
             
             if self.use_react:
-                import asyncio
                 risk_result = asyncio.run(self.risk_manager.analyze(risk_context))
             else:
                 risk_result = self.risk_manager.analyze_structured(risk_context)
@@ -443,7 +441,6 @@ class AgentPipeline:
             }
             
             # Run analysts in parallel
-            import asyncio
             technical_result, sentiment_result, tokenomics_result = await asyncio.gather(
                 self.technical_analyst.aanalyze(technical_context),
                 self.sentiment_analyst.aanalyze(sentiment_context),
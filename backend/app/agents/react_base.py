@@ -3,8 +3,10 @@ ReAct Agent Base Classes
 
 Base implementation for ReAct (Reasoning + Acting) agents.
 """
-from typing import Dict, Any, List, Optional, Callable
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Callable, get_origin
 from sqlalchemy.orm import Session
+import inspect
 import json
 import re
 
@@ -13,6 +15,57 @@ from app.agents.llm_client import LLMClient
 from app.core.config import settings
 
 
+# Python annotation -> JSON schema type for tool parameters
+_JSON_TYPES = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    dict: "object",
+}
+
+
+@lru_cache(maxsize=None)
+def _tool_schema(name: str, func: Callable) -> Dict[str, Any]:
+    """
+    Build the function-calling schema for one tool.
+    
+    Cached on the underlying function, so every agent instance shares one
+    schema per tool. Callers must not mutate the returned dict.
+    
+    Args:
+        name: Tool name exposed to the LLM
+        func: Tool function (unbound, so the cache key is stable across instances)
+        
+    Returns:
+        OpenAI tool schema
+    """
+    properties = {}
+    required = []
+    for param in inspect.signature(func).parameters.values():
+        if param.name == "self":
+            continue
+        annotation = get_origin(param.annotation) or param.annotation
+        properties[param.name] = {"type": _JSON_TYPES.get(annotation, "string")}
+        if param.default is inspect.Parameter.empty:
+            required.append(param.name)
+    
+    doc = (func.__doc__ or "No description available").strip().split('\n')[0]
+    return {
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": doc,
+            "parameters": {
+                "type": "object",
+                "properties": properties,
+                "required": required,
+            },
+        },
+    }
+
+
 class ReActAgent(DecisionAgent):
     """
     Base class for ReAct agents that can reason and take actions.
@@ -43,6 +96,7 @@ class ReActAgent(DecisionAgent):
         super().__init__(db, llm_client, model)
         self.max_iterations = max_iterations
         self.tools = self.initialize_tools()
+        self.tool_schemas = self.build_tool_schemas()
     
     def initialize_tools(self) -> Dict[str, Callable]:
         """
@@ -70,6 +124,18 @@ class ReActAgent(DecisionAgent):
         
         return "\n".join(descriptions)
     
+    def build_tool_schemas(self) -> List[Dict[str, Any]]:
+        """
+        Build OpenAI function-calling schemas from the tool signatures.
+        
+        Returns:
+            List of tool schemas for the chat completions "tools" parameter
+        """
+        return [
+            _tool_schema(name, getattr(func, "__func__", func))
+            for name, func in self.tools.items()
+        ]
+    
     def parse_react_response(self, response: str) -> Dict[str, Any]:
         """
         Parse LLM response to extract thought, action, or final answer.
@@ -203,9 +269,9 @@ You must alternate between Thought, Action, and Observation until you reach a Fi
 
 **FORMAT:**
 Thought: [Your reasoning about what to do next]
-Action: tool_name(arg1="value1", arg2="value2")
+Then call one tool in the same response using the function-calling interface.
 
-After seeing the Observation, continue with another Thought/Action cycle, or provide:
+After seeing the Observation, continue with another Thought and tool call, or provide:
 
 Final Answer: {{"key": "value", ...}}
 
@@ -255,7 +321,8 @@ Begin your analysis. Remember to follow the ReAct pattern: Thought → Action 
         self,
         task_description: str,
         context: Dict[str, Any],
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        on_token: Optional[Callable[[str], None]] = None
     ) -> Dict[str, Any]:
         """
         Execute the ReAct loop: Thought → Action → Observation → repeat.
@@ -264,6 +331,7 @@ Begin your analysis. Remember to follow the ReAct pattern: Thought → Action 
             task_description: Task to accomplish
             context: Context data
             temperature: LLM temperature
+            on_token: Optional callback receiving LLM text as it streams in
             
         Returns:
             Final analysis result
@@ -277,18 +345,31 @@ Begin your analysis. Remember to follow the ReAct pattern: Thought → Action 
             # Build prompt with history
             messages = self.build_react_prompt(task_description, context, history)
             
-            # Get LLM response
+            # Thought and action come back in one completion: text content + tool call
             llm_response = await self.llm_client.acall(
                 messages=messages,
                 model=self.model,
                 agent_name=self.name,
-                temperature=temperature
+                temperature=temperature,
+                tools=self.tool_schemas,
+                tool_choice="auto",
+                on_token=on_token
             )
             
             response_text = llm_response["content"]
+            tool_calls = llm_response.get("tool_calls")
             
-            # Parse response
-            parsed = self.parse_react_response(response_text)
+            # Parse response, falling back to the text format if no tool was called
+            if tool_calls:
+                thought = re.sub(r'^\s*Thought:\s*', '', response_text, flags=re.IGNORECASE).strip()
+                parsed = {
+                    "type": "action",
+                    "thought": thought or None,
+                    "action": tool_calls[0]["name"],
+                    "action_args": tool_calls[0]["arguments"]
+                }
+            else:
+                parsed = self.parse_react_response(response_text)
             
             if parsed["type"] == "final_answer":
                 # Done! Return the answer
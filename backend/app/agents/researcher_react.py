@@ -107,7 +107,8 @@ Tokenomics Analysis:
         result = await self.react_loop(
             task_description=task_description,
             context=context,
-            temperature=kwargs.get("temperature", 0.7)
+            temperature=kwargs.get("temperature", 0.7),
+            on_token=kwargs.get("on_token")
         )
         
         return result
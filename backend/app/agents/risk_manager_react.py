@@ -129,7 +129,8 @@ If rejecting, set final_trade.action to "hold" and explain in reasoning."""
         result = await self.react_loop(
             task_description=task_description,
             context=context,
-            temperature=kwargs.get("temperature", 0.7)
+            temperature=kwargs.get("temperature", 0.7),
+            on_token=kwargs.get("on_token")
         )
         
         return result
@@ -117,7 +117,8 @@ If conviction < 60%, recommend HOLD with action="hold"."""
         result = await self.react_loop(
             task_description=task_description,
             context=context,
-            temperature=kwargs.get("temperature", 0.7)
+            temperature=kwargs.get("temperature", 0.7),
+            on_token=kwargs.get("on_token")
         )
         
         return result
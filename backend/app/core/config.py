@@ -18,6 +18,8 @@ class Settings(BaseSettings):
     daily_token_budget: int = 100000
     cheap_model: str = "deepseek/deepseek-chat"  # For analysts
     strong_model: str = "deepseek/deepseek-chat"  # For researcher, trader, risk manager
+    llm_cache: bool = False  # Exact-match response cache (LLM_CACHE=1), for development reruns
+    llm_cache_ttl_seconds: int = 3600
     
     # Application
     environment: str = "development"
@@ -10,6 +10,7 @@ from app.core.config import settings
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,
+    query_cache_size=1200,
     echo=settings.environment == "development"
 )
 
@@ -9,9 +9,8 @@ Uses LangChain's agent framework with ReAct pattern for:
 from typing import Dict, Any, Optional, List
 from sqlalchemy.orm import Session
 
-from langchain_openai import ChatOpenAI
-from langchain.agents import AgentExecutor, create_react_agent
-from langchain_core.prompts import PromptTemplate
+from langchain.agents import AgentExecutor, create_react_agent, create_tool_calling_agent
+from langchain_core.prompts import BasePromptTemplate, ChatPromptTemplate, MessagesPlaceholder, PromptTemplate
 from langchain_core.tools import Tool
 
 from app.langchain.tools import (
@@ -20,51 +19,13 @@ from app.langchain.tools import (
     create_risk_manager_tools,
 )
 from app.langchain.callbacks import DatabaseCallbackHandler
+from app.langchain.llm_factory import create_chat_model
 from app.core.config import settings
 from app.agents.models import ResearchSynthesis, TradeProposal, RiskValidation
 
 
-class LangChainResearcher:
-    """
-    LangChain-based Researcher agent using ReAct pattern.
-    
-    Synthesizes analyst outputs with ability to fetch news, query analysts,
-    and gather additional data when faced with conflicts or uncertainty.
-    """
-    
-    def __init__(self, db: Session, max_iterations: int = 3):
-        """
-        Initialize LangChain Researcher.
-        
-        Args:
-            db: Database session
-            max_iterations: Maximum reasoning iterations
-        """
-        self.db = db
-        self.max_iterations = max_iterations
-        self.name = "researcher_langchain"
-        
-        # Create LLM with callbacks
-        callbacks = [DatabaseCallbackHandler(db, self.name)]
-        
-        if settings.llm_provider == "openrouter":
-            base_url = settings.openrouter_base_url
-        else:
-            base_url = None
-        
-        self.llm = ChatOpenAI(
-            model=settings.strong_model,
-            temperature=0.7,
-            openai_api_key=settings.llm_api_key,
-            openai_api_base=base_url,
-            callbacks=callbacks,
-        )
-        
-        # Create tools
-        self.tools = create_researcher_tools(db)
-        
-        # Create ReAct prompt (LangChain format)
-        self.prompt = PromptTemplate.from_template("""Answer the following questions as best you can. You have access to the following tools:
+# Prompt text is split into static instructions (cacheable) and per-call task
+RESEARCHER_INSTRUCTIONS = """Answer the following questions as best you can. You have access to the following tools:
 
 {tools}
 
@@ -81,11 +42,15 @@ Final Answer: the final answer to the original input question
 
 Begin!
 
-Question: You are a Research Synthesizer for an AGGRESSIVE crypto trading firm. Synthesize the following analyst outputs into a coherent investment thesis:
+"""
+
+RESEARCHER_QUESTION_HEAD = """Question: You are a Research Synthesizer for an AGGRESSIVE crypto trading firm. Synthesize the following analyst outputs into a coherent investment thesis:
 
 {analyst_outputs}
 
-Your task:
+"""
+
+RESEARCHER_GUIDELINES = """Your task:
 1. Analyze the three analyst recommendations (Technical, Sentiment, Tokenomics)
 2. If analysts conflict, use tools to gather additional data
 3. BIAS TOWARD ACTION: If 2 out of 3 analysts agree (even with moderate confidence 50-70%), favor taking a position. Sitting out has opportunity cost.
@@ -104,10 +69,188 @@ IMPORTANT: Use 'confidence' as a NUMBER (not 'conviction' as text). Be aggressiv
 
 Remember: Markets reward decisive action. Look for tradeable setups, not perfect alignment.
 
-Thought: {agent_scratchpad}""")
+"""
+
+RESEARCHER_QUESTION = RESEARCHER_QUESTION_HEAD + RESEARCHER_GUIDELINES
+
+RESEARCHER_TASK = RESEARCHER_QUESTION + "Thought: {agent_scratchpad}"
+
+TRADER_TASK = """You are an AGGRESSIVE Trading Decision Maker. Propose an optimal trade based on this research thesis:
+
+{research_thesis}
+
+Portfolio State:
+- Available Cash: ${available_cash}
+- Symbol: {symbol}
+- Current Price: ${current_price}
+
+"""
+
+TRADER_INSTRUCTIONS = """Your task: Propose a trade in JSON format with:
+- action: string (buy/sell/hold)
+- size: number (USD amount, 0 if hold)
+- entry_price: number (use current price)
+- stop_loss: number
+- take_profit: number
+- risk_reward_ratio: number
+- execution_strategy: string (e.g., "market order")
+- confidence: number (0-100, match research confidence)
+- market_conditions: string
+
+TRADING PHILOSOPHY:
+- If research confidence is >40 with clear bullish/bearish direction, YOU MUST PROPOSE A TRADE (not hold)
+- IGNORE cash balance - always propose the trade if research supports it
+- Use research confidence as your confidence
+- For bullish: action=buy, set stop loss 2% below entry, take profit 4% above entry
+- For bearish: action=sell, set stop loss 2% above entry, take profit 4% below entry
+- Size calculation: High confidence (>60) = $400-600, Medium (40-60) = $200-400
+- Risk-reward ratio should be around 2.0 (4% gain / 2% loss)
+- Only return action=hold if research confidence <40 OR direction is neutral
+
+CRITICAL: If research is bullish/bearish with >40 confidence, action MUST be buy/sell (NOT hold).
+
+Respond with ONLY valid JSON, no extra text.
+
+JSON:"""
+
+RISK_MANAGER_TASK = """You are an AGGRESSIVE Risk Manager for a trading firm. Review this trade proposal:
+
+{trade_proposal}
+
+Portfolio State:
+- Available Cash: ${available_cash}
+- Total Equity: ${total_equity}
+
+"""
+
+RISK_MANAGER_INSTRUCTIONS = """UPDATED AGGRESSIVE RISK RULES (LOWERED THRESHOLDS):
+- Max position size: 30% of equity (increased from 20%)
+- Max loss per trade: 3% of equity (increased from 2%)
+- Min risk-reward ratio: 1.2:1 (lowered from 1.5:1)
+- Min conviction: 40% (lowered from 60%)
+
+APPROVAL PHILOSOPHY:
+- If trade has >40% confidence with valid stop loss and R:R >1.2, APPROVE it
+- Only reject if clear violations of max position size or max loss rules
+- Default to "approved" unless there's a specific rule violation
+- For small trades (<$1000), approve automatically if confidence >40%
+
+Your task: Validate the trade and respond in JSON format with:
+- decision: string ("approved", "modified", or "rejected")
+- reasoning: string
+- risk_score: number (0-100, where <30 is low risk)
+- final_trade: object (the trade proposal, possibly modified)
+
+CRITICAL: Be aggressive - approve trades that meet minimum thresholds. Don't be overly cautious.
+
+Respond with ONLY valid JSON, no extra text.
+
+JSON:"""
+
+
+def _build_prompt(
+    static: str,
+    dynamic: str,
+    static_first: bool,
+    enable_prompt_cache: bool = False,
+) -> BasePromptTemplate:
+    """
+    Build an agent prompt from its static instructions and per-call inputs.
+    
+    Without prompt caching this is the plain single-string template. With
+    it, the static instructions become a system message tagged with
+    Anthropic-style cache_control (passed through by OpenRouter) so the
+    provider can reuse the prefix across calls, and the per-call inputs
+    go in the human message.
+    
+    Args:
+        static: Instructions that are identical on every call
+        dynamic: Template text holding the per-call inputs
+        static_first: Whether the static text leads the plain template
+        enable_prompt_cache: Split into cacheable system + human messages
+        
+    Returns:
+        Prompt template
+    """
+    if not enable_prompt_cache:
+        return PromptTemplate.from_template(static + dynamic if static_first else dynamic + static)
+    
+    return ChatPromptTemplate.from_messages([
+        ("system", [{"type": "text", "text": static, "cache_control": {"type": "ephemeral"}}]),
+        ("human", dynamic),
+    ])
+
+
+def _cache_read_tokens(response) -> int:
+    """Prompt tokens served from the provider cache for an LLM response."""
+    usage = getattr(response, "usage_metadata", None) or {}
+    return usage.get("input_token_details", {}).get("cache_read", 0)
+
+
+class LangChainResearcher:
+    """
+    LangChain-based Researcher agent using ReAct pattern.
+    
+    Synthesizes analyst outputs with ability to fetch news, query analysts,
+    and gather additional data when faced with conflicts or uncertainty.
+    """
+    
+    def __init__(
+        self,
+        db: Session,
+        max_iterations: int = 3,
+        enable_prompt_cache: bool = False,
+        enable_parallel_tools: bool = False,
+    ):
+        """
+        Initialize LangChain Researcher.
+        
+        Args:
+            db: Database session
+            max_iterations: Maximum reasoning iterations
+            enable_prompt_cache: Mark the static system prompt for provider caching
+            enable_parallel_tools: Use native tool calling so independent tool
+                calls from one step run concurrently
+        """
+        self.db = db
+        self.max_iterations = max_iterations
+        self.name = "researcher_langchain"
+        
+        # Create LLM with callbacks (shares the pooled HTTP client)
+        callbacks = [DatabaseCallbackHandler(db, self.name)]
+        self.llm = create_chat_model(settings.strong_model, temperature=0.7, callbacks=callbacks)
+        
+        # Create tools
+        self.tools = create_researcher_tools(db)
         
-        # Create agent
-        self.agent = create_react_agent(self.llm, self.tools, self.prompt)
+        if enable_parallel_tools:
+            # Native tool calling lets the model request several tools in one
+            # step; AgentExecutor's async path runs them with asyncio.gather
+            if enable_prompt_cache:
+                # The guidelines are static, so they go first as a cacheable
+                # system message (which also covers the bound tool schemas)
+                messages = [
+                    ("system", [{"type": "text", "text": RESEARCHER_GUIDELINES, "cache_control": {"type": "ephemeral"}}]),
+                    ("human", RESEARCHER_QUESTION_HEAD),
+                ]
+            else:
+                messages = [("human", RESEARCHER_QUESTION)]
+            self.prompt = ChatPromptTemplate.from_messages([
+                *messages,
+                MessagesPlaceholder("agent_scratchpad"),
+            ])
+            self.agent = create_tool_calling_agent(self.llm, self.tools, self.prompt)
+        else:
+            # Create ReAct prompt (LangChain format)
+            self.prompt = _build_prompt(
+                static=RESEARCHER_INSTRUCTIONS,
+                dynamic=RESEARCHER_TASK,
+                static_first=True,
+                enable_prompt_cache=enable_prompt_cache,
+            )
+            self.agent = create_react_agent(self.llm, self.tools, self.prompt)
+        
+        # Create agent executor
         self.agent_executor = AgentExecutor(
             agent=self.agent,
             tools=self.tools,
@@ -230,73 +373,33 @@ class LangChainTrader:
     and optimize entry points.
     """
     
-    def __init__(self, db: Session, max_iterations: int = 3):
+    def __init__(self, db: Session, max_iterations: int = 3, enable_prompt_cache: bool = False):
         """
         Initialize LangChain Trader.
         
         Args:
             db: Database session
             max_iterations: Maximum reasoning iterations
+            enable_prompt_cache: Mark the static system prompt for provider caching
         """
         self.db = db
         self.max_iterations = max_iterations
         self.name = "trader_langchain"
         
-        # Create LLM with callbacks
+        # Create LLM with callbacks (shares the pooled HTTP client)
         callbacks = [DatabaseCallbackHandler(db, self.name)]
-        
-        if settings.llm_provider == "openrouter":
-            base_url = settings.openrouter_base_url
-        else:
-            base_url = None
-        
-        self.llm = ChatOpenAI(
-            model=settings.strong_model,
-            temperature=0.7,
-            openai_api_key=settings.llm_api_key,
-            openai_api_base=base_url,
-            callbacks=callbacks,
-        )
+        self.llm = create_chat_model(settings.strong_model, temperature=0.7, callbacks=callbacks)
         
         # No tools needed - work directly from context
         self.tools = []
         
         # Create simple prompt (no ReAct, direct response)
-        self.prompt = PromptTemplate.from_template("""You are an AGGRESSIVE Trading Decision Maker. Propose an optimal trade based on this research thesis:
-
-{research_thesis}
-
-Portfolio State:
-- Available Cash: ${available_cash}
-- Symbol: {symbol}
-- Current Price: ${current_price}
-
-Your task: Propose a trade in JSON format with:
-- action: string (buy/sell/hold)
-- size: number (USD amount, 0 if hold)
-- entry_price: number (use current price)
-- stop_loss: number
-- take_profit: number
-- risk_reward_ratio: number
-- execution_strategy: string (e.g., "market order")
-- confidence: number (0-100, match research confidence)
-- market_conditions: string
-
-TRADING PHILOSOPHY:
-- If research confidence is >40 with clear bullish/bearish direction, YOU MUST PROPOSE A TRADE (not hold)
-- IGNORE cash balance - always propose the trade if research supports it
-- Use research confidence as your confidence
-- For bullish: action=buy, set stop loss 2% below entry, take profit 4% above entry
-- For bearish: action=sell, set stop loss 2% above entry, take profit 4% below entry
-- Size calculation: High confidence (>60) = $400-600, Medium (40-60) = $200-400
-- Risk-reward ratio should be around 2.0 (4% gain / 2% loss)
-- Only return action=hold if research confidence <40 OR direction is neutral
-
-CRITICAL: If research is bullish/bearish with >40 confidence, action MUST be buy/sell (NOT hold).
-
-Respond with ONLY valid JSON, no extra text.
-
-JSON:""")
+        self.prompt = _build_prompt(
+            static=TRADER_INSTRUCTIONS,
+            dynamic=TRADER_TASK,
+            static_first=False,
+            enable_prompt_cache=enable_prompt_cache,
+        )
         
         # Use LLM directly without ReAct agent
         self.agent = None
@@ -321,14 +424,14 @@ Time Horizon: {context['research_thesis']['time_horizon']}
         
         try:
             # Call LLM directly with formatted prompt
-            prompt_text = self.prompt.format(
-                research_thesis=research_thesis,
-                available_cash=context.get('available_cash', 10000),
-                symbol=context.get('symbol', 'BTCUSDT'),
-                current_price=context.get('current_price', 44500),
-            )
+            prompt_value = self.prompt.invoke({
+                "research_thesis": research_thesis,
+                "available_cash": context.get('available_cash', 10000),
+                "symbol": context.get('symbol', 'BTCUSDT'),
+                "current_price": context.get('current_price', 44500),
+            })
             
-            response = await self.llm.ainvoke(prompt_text)
+            response = await self.llm.ainvoke(prompt_value)
             output = response.content
             
             # Parse JSON
@@ -371,6 +474,7 @@ Time Horizon: {context['research_thesis']['time_horizon']}
                 "metadata": {
                     "iterations": 0,
                     "tools_used": [],
+                    "cache_read_tokens": _cache_read_tokens(response),
                 }
             }
             
@@ -411,69 +515,33 @@ class LangChainRiskManager:
     and simulate trade impact.
     """
     
-    def __init__(self, db: Session, max_iterations: int = 3):
+    def __init__(self, db: Session, max_iterations: int = 3, enable_prompt_cache: bool = False):
         """
         Initialize LangChain Risk Manager.
         
         Args:
             db: Database session
             max_iterations: Maximum reasoning iterations
+            enable_prompt_cache: Mark the static system prompt for provider caching
         """
         self.db = db
         self.max_iterations = max_iterations
         self.name = "risk_manager_langchain"
         
-        # Create LLM with callbacks
+        # Create LLM with callbacks (shares the pooled HTTP client)
         callbacks = [DatabaseCallbackHandler(db, self.name)]
-        
-        if settings.llm_provider == "openrouter":
-            base_url = settings.openrouter_base_url
-        else:
-            base_url = None
-        
-        self.llm = ChatOpenAI(
-            model=settings.strong_model,
-            temperature=0.7,
-            openai_api_key=settings.llm_api_key,
-            openai_api_base=base_url,
-            callbacks=callbacks,
-        )
+        self.llm = create_chat_model(settings.strong_model, temperature=0.7, callbacks=callbacks)
         
         # No tools needed - work directly from context
         self.tools = []
         
         # Create simple prompt (no ReAct, direct response)
-        self.prompt = PromptTemplate.from_template("""You are an AGGRESSIVE Risk Manager for a trading firm. Review this trade proposal:
-
-{trade_proposal}
-
-Portfolio State:
-- Available Cash: ${available_cash}
-- Total Equity: ${total_equity}
-
-UPDATED AGGRESSIVE RISK RULES (LOWERED THRESHOLDS):
-- Max position size: 30% of equity (increased from 20%)
-- Max loss per trade: 3% of equity (increased from 2%)
-- Min risk-reward ratio: 1.2:1 (lowered from 1.5:1)
-- Min conviction: 40% (lowered from 60%)
-
-APPROVAL PHILOSOPHY:
-- If trade has >40% confidence with valid stop loss and R:R >1.2, APPROVE it
-- Only reject if clear violations of max position size or max loss rules
-- Default to "approved" unless there's a specific rule violation
-- For small trades (<$1000), approve automatically if confidence >40%
-
-Your task: Validate the trade and respond in JSON format with:
-- decision: string ("approved", "modified", or "rejected")
-- reasoning: string
-- risk_score: number (0-100, where <30 is low risk)
-- final_trade: object (the trade proposal, possibly modified)
-
-CRITICAL: Be aggressive - approve trades that meet minimum thresholds. Don't be overly cautious.
-
-Respond with ONLY valid JSON, no extra text.
-
-JSON:""")
+        self.prompt = _build_prompt(
+            static=RISK_MANAGER_INSTRUCTIONS,
+            dynamic=RISK_MANAGER_TASK,
+            static_first=False,
+            enable_prompt_cache=enable_prompt_cache,
+        )
         
         # Use LLM directly without ReAct agent
         self.agent = None
@@ -499,13 +567,13 @@ Take Profit: ${context['trade_proposal']['take_profit']:,.2f}
         
         try:
             # Call LLM directly with formatted prompt
-            prompt_text = self.prompt.format(
-                trade_proposal=trade_proposal,
-                available_cash=context.get('available_cash', 10000),
-                total_equity=context.get('total_equity', 15000),
-            )
+            prompt_value = self.prompt.invoke({
+                "trade_proposal": trade_proposal,
+                "available_cash": context.get('available_cash', 10000),
+                "total_equity": context.get('total_equity', 15000),
+            })
             
-            response = await self.llm.ainvoke(prompt_text)
+            response = await self.llm.ainvoke(prompt_value)
             output = response.content
             
             # Parse JSON
@@ -538,6 +606,7 @@ Take Profit: ${context['trade_proposal']['take_profit']:,.2f}
                 "metadata": {
                     "iterations": 0,
                     "tools_used": [],
+                    "cache_read_tokens": _cache_read_tokens(response),
                 }
             }
             
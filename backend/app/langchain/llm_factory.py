@@ -0,0 +1,65 @@
+"""
+Chat model factory for the LangChain agents.
+
+All agents share one pooled async HTTP client, so concurrent agents reuse
+connections to the LLM provider instead of each opening their own.
+"""
+from typing import List, Optional
+
+import httpx
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_openai import ChatOpenAI
+
+from app.core.config import settings
+
+
+_SHARED_ASYNC_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Return the shared LLM HTTP client, creating it on first use."""
+    global _SHARED_ASYNC_CLIENT
+    if _SHARED_ASYNC_CLIENT is None or _SHARED_ASYNC_CLIENT.is_closed:
+        _SHARED_ASYNC_CLIENT = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+        )
+    return _SHARED_ASYNC_CLIENT
+
+
+async def close_llm_client():
+    """Close the shared LLM HTTP client (called on application shutdown)."""
+    global _SHARED_ASYNC_CLIENT
+    if _SHARED_ASYNC_CLIENT is not None:
+        await _SHARED_ASYNC_CLIENT.aclose()
+        _SHARED_ASYNC_CLIENT = None
+
+
+def create_chat_model(
+    model: str,
+    temperature: float = 0.7,
+    callbacks: Optional[List[BaseCallbackHandler]] = None,
+) -> ChatOpenAI:
+    """
+    Create a chat model for the configured provider on the shared HTTP client.
+    
+    Args:
+        model: Model name
+        temperature: Sampling temperature
+        callbacks: Callback handlers for this agent's calls
+    
+    Returns:
+        ChatOpenAI instance
+    """
+    if settings.llm_provider == "openrouter":
+        base_url = settings.openrouter_base_url
+    else:
+        base_url = None
+    
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        openai_api_key=settings.llm_api_key,
+        openai_api_base=base_url,
+        callbacks=callbacks,
+        http_async_client=_get_async_client(),
+    )
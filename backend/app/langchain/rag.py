@@ -28,6 +28,7 @@ class MarketKnowledgeBase:
         self,
         persist_directory: str = "./data/chromadb",
         collection_name: str = "market_insights",
+        chroma_client: Optional[chromadb.ClientAPI] = None,
     ):
         """
         Initialize knowledge base.
@@ -35,9 +36,12 @@ class MarketKnowledgeBase:
         Args:
             persist_directory: Directory to persist ChromaDB data
             collection_name: Name of the collection
+            chroma_client: Existing ChromaDB client (e.g. in-memory for tests);
+                persist_directory is ignored when given
         """
         self.persist_directory = persist_directory
         self.collection_name = collection_name
+        self.chroma_client = chroma_client
         
         # Initialize embeddings
         self.embeddings = OpenAIEmbeddings(
@@ -46,10 +50,21 @@ class MarketKnowledgeBase:
         )
         
         # Initialize ChromaDB
-        self.vectorstore = Chroma(
-            collection_name=collection_name,
+        self.vectorstore = self._create_vectorstore()
+    
+    def _create_vectorstore(self) -> Chroma:
+        """Create the Chroma vector store on the configured client or directory."""
+        if self.chroma_client is not None:
+            return Chroma(
+                collection_name=self.collection_name,
+                embedding_function=self.embeddings,
+                client=self.chroma_client,
+            )
+        
+        return Chroma(
+            collection_name=self.collection_name,
             embedding_function=self.embeddings,
-            persist_directory=persist_directory,
+            persist_directory=self.persist_directory,
         )
     
     def add_analysis(
@@ -71,6 +86,20 @@ class MarketKnowledgeBase:
         Returns:
             Document ID
         """
+        doc = self._build_analysis_document(symbol, agent_name, analysis, timestamp)
+        
+        # Add to vector store
+        ids = self.vectorstore.add_documents([doc])
+        return ids[0]
+    
+    def _build_analysis_document(
+        self,
+        symbol: str,
+        agent_name: str,
+        analysis: Dict[str, Any],
+        timestamp: Optional[datetime] = None,
+    ) -> Document:
+        """Build the document stored by add_analysis."""
         if timestamp is None:
             timestamp = datetime.utcnow()
         
@@ -83,11 +112,7 @@ class MarketKnowledgeBase:
             "type": "analysis",
         }
         
-        doc = Document(page_content=content, metadata=metadata)
-        
-        # Add to vector store
-        ids = self.vectorstore.add_documents([doc])
-        return ids[0]
+        return Document(page_content=content, metadata=metadata)
     
     def add_trade_outcome(
         self,
@@ -119,6 +144,28 @@ class MarketKnowledgeBase:
         Returns:
             Document ID
         """
+        doc = self._build_trade_document(
+            symbol, trade_data, outcome, action, entry_price,
+            exit_price, pnl, reasoning, timestamp,
+        )
+        
+        # Add to vector store
+        ids = self.vectorstore.add_documents([doc])
+        return ids[0]
+    
+    def _build_trade_document(
+        self,
+        symbol: str,
+        trade_data: Optional[Dict[str, Any]] = None,
+        outcome: str = "pending",
+        action: Optional[str] = None,
+        entry_price: Optional[float] = None,
+        exit_price: Optional[float] = None,
+        pnl: Optional[float] = None,
+        reasoning: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> Document:
+        """Build the document stored by add_trade_outcome."""
         if timestamp is None:
             timestamp = datetime.utcnow()
         
@@ -162,11 +209,37 @@ class MarketKnowledgeBase:
         # Filter out any remaining None values (ChromaDB doesn't accept them)
         metadata = {k: v for k, v in metadata.items() if v is not None}
         
-        doc = Document(page_content=content, metadata=metadata)
+        return Document(page_content=content, metadata=metadata)
+    
+    def add_many(self, items: List[Dict[str, Any]]) -> List[str]:
+        """
+        Store several analyses and trade outcomes in one write.
         
-        # Add to vector store
-        ids = self.vectorstore.add_documents([doc])
-        return ids[0]
+        All documents are embedded in a single embeddings request and
+        added to the collection together.
+        
+        Args:
+            items: Dicts with "type" ("analysis" or "trade_outcome") plus the
+                keyword arguments of add_analysis / add_trade_outcome
+            
+        Returns:
+            Document IDs, in input order
+        """
+        docs = []
+        for item in items:
+            kwargs = dict(item)
+            kind = kwargs.pop("type")
+            if kind == "analysis":
+                docs.append(self._build_analysis_document(**kwargs))
+            elif kind == "trade_outcome":
+                docs.append(self._build_trade_document(**kwargs))
+            else:
+                raise ValueError(f"Unknown knowledge base item type: {kind}")
+        
+        if not docs:
+            return []
+        
+        return self.vectorstore.add_documents(docs)
     
     def retrieve_similar_analyses(
         self,
@@ -286,8 +359,4 @@ class MarketKnowledgeBase:
         self.vectorstore.delete_collection()
         
         # Recreate
-        self.vectorstore = Chroma(
-            collection_name=self.collection_name,
-            embedding_function=self.embeddings,
-            persist_directory=self.persist_directory,
-        )
+        self.vectorstore = self._create_vectorstore()
@@ -5,6 +5,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.database import engine, Base
+from app.services.tokenomics import close_shared_client
+from app.langchain.llm_factory import close_llm_client
 from app.routes import market, portfolio, analysis, backtest, config, paper_trading, recommendations, langgraph
 
 # Initialize FastAPI app
@@ -24,6 +26,13 @@ async def startup_event():
     if settings.environment != "test":
         Base.metadata.create_all(bind=engine)
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close shared HTTP clients."""
+    await close_shared_client()
+    await close_llm_client()
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -7,7 +7,9 @@ from app.models.database import (
     Position,
     PortfolioSnapshot,
     AgentLog,
-    BacktestRun
+    BacktestRun,
+    TokenomicsCache,
+    LLMResponseCache
 )
 
 __all__ = [
@@ -16,5 +18,7 @@ __all__ = [
     "Position",
     "PortfolioSnapshot",
     "AgentLog",
-    "BacktestRun"
+    "BacktestRun",
+    "TokenomicsCache",
+    "LLMResponseCache"
 ]
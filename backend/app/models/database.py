@@ -1,7 +1,7 @@
 """
 Database models for the trading simulator.
 """
-from sqlalchemy import Column, Integer, Float, String, DateTime, Text, JSON, Index
+from sqlalchemy import Column, Integer, Float, String, DateTime, Text, JSON, Index, LargeBinary
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -166,3 +166,30 @@ class AgentRecommendation(Base):
         Index('idx_recommendations_status_symbol', 'status', 'symbol'),
         Index('idx_recommendations_run_created', 'run_id', 'created_at'),
     )
+
+
+class TokenomicsCache(Base):
+    """Cached CoinGecko tokenomics payloads, keyed by CoinGecko coin ID.
+    
+    Partial fetches (without community/developer data) use a suffixed key,
+    e.g. "bitcoin:10".
+    """
+    __tablename__ = "tokenomics_cache"
+    
+    coin_id = Column(String(50), primary_key=True)
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
+    payload = Column(LargeBinary, nullable=False)  # zlib-compressed JSON of the parsed tokenomics dict
+    etag = Column(String(255), nullable=True)  # CoinGecko ETag, sent back as If-None-Match
+    last_modified = Column(String(64), nullable=True)  # Sent back as If-Modified-Since
+
+
+class LLMResponseCache(Base):
+    """Cached LLM completions, keyed by a hash of the model, messages and sampling params.
+    
+    Only used when settings.llm_cache is enabled.
+    """
+    __tablename__ = "llm_response_cache"
+    
+    cache_key = Column(String(64), primary_key=True)  # SHA-256 hex digest
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    payload = Column(LargeBinary, nullable=False)  # zlib-compressed JSON of the LLMClient result dict
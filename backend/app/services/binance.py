@@ -2,6 +2,7 @@
 Binance API integration for fetching market data.
 """
 import httpx
+import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
@@ -88,7 +89,7 @@ class BinanceService:
             response.raise_for_status()
             return response.json()
         except httpx.HTTPError as e:
-            logger.error(f"Error fetching klines for {symbol}: {e}")
+            logger.error("Error fetching klines for %s: %s", symbol, e)
             raise
     
     def fetch_klines_sync(
@@ -129,9 +130,38 @@ class BinanceService:
             response.raise_for_status()
             return response.json()
         except httpx.HTTPError as e:
-            logger.error(f"Error fetching klines for {symbol}: {e}")
+            logger.error("Error fetching klines for %s: %s", symbol, e)
             raise
     
+    def fetch_klines_numpy(
+        self,
+        symbol: str,
+        interval: str = "1h",
+        limit: int = 100,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Fetch OHLCV candlestick data as a float64 array (synchronous).
+        
+        Parses the Binance response in one numpy conversion instead of
+        per-field float() calls.
+        
+        Args:
+            symbol: Trading pair symbol (e.g., 'BTCUSDT')
+            interval: Timeframe (1m, 5m, 15m, 1h, 4h, 1d, etc.)
+            limit: Number of candles to fetch (max 1000)
+            start_time: Start timestamp in milliseconds
+            end_time: End timestamp in milliseconds
+        
+        Returns:
+            Array of shape (N, 6): open time in ms, open, high, low, close, volume
+        """
+        klines = self.fetch_klines_sync(symbol, interval, limit, start_time, end_time)
+        if not klines:
+            return np.empty((0, 6), dtype=np.float64)
+        return np.array(klines, dtype=np.float64)[:, :6]
+    
     async def fetch_ticker_price(self, symbol: str) -> Dict[str, Any]:
         """
         Fetch current price for a symbol.
@@ -150,7 +180,7 @@ class BinanceService:
             response.raise_for_status()
             return response.json()
         except httpx.HTTPError as e:
-            logger.error(f"Error fetching ticker price for {symbol}: {e}")
+            logger.error("Error fetching ticker price for %s: %s", symbol, e)
             raise
     
     async def fetch_24h_ticker(self, symbol: str) -> Dict[str, Any]:
@@ -171,7 +201,7 @@ class BinanceService:
             response.raise_for_status()
             return response.json()
         except httpx.HTTPError as e:
-            logger.error(f"Error fetching 24h ticker for {symbol}: {e}")
+            logger.error("Error fetching 24h ticker for %s: %s", symbol, e)
             raise
     
     def get_historical_klines(
@@ -285,7 +315,7 @@ def save_candles_to_db(
             saved_count += 1
     
     db.commit()
-    logger.info(f"Saved {saved_count} new candles for {symbol} {timeframe}")
+    logger.info("Saved %s new candles for %s %s", saved_count, symbol, timeframe)
     return saved_count
 
 
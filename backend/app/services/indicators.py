@@ -147,7 +147,7 @@ class IndicatorService:
             Dictionary with all calculated indicators
         """
         if len(candles) < 50:
-            logger.warning(f"Only {len(candles)} candles available. Some indicators may be unreliable.")
+            logger.warning("Only %s candles available. Some indicators may be unreliable.", len(candles))
         
         df = self.candles_to_dataframe(candles)
         return self.calculate_all_indicators(df)
@@ -163,7 +163,7 @@ class IndicatorService:
             Dictionary with all calculated indicators
         """
         if len(df) < 50:
-            logger.warning(f"Only {len(df)} rows available. Some indicators may be unreliable.")
+            logger.warning("Only %s rows available. Some indicators may be unreliable.", len(df))
         
         # Calculate all indicators
         macd_data = calculate_macd(df)
@@ -255,7 +255,7 @@ class IndicatorService:
             else:
                 return "sideways"
         except Exception as e:
-            logger.error(f"Error assessing trend: {e}")
+            logger.error("Error assessing trend: %s", e)
             return "sideways"
     
     def _assess_momentum(self, df: pd.DataFrame) -> str:
@@ -279,7 +279,7 @@ class IndicatorService:
             else:
                 return "weak"
         except Exception as e:
-            logger.error(f"Error assessing momentum: {e}")
+            logger.error("Error assessing momentum: %s", e)
             return "weak"
 
 
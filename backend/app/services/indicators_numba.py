@@ -0,0 +1,112 @@
+"""
+Numba-compiled helpers for indicator post-processing.
+
+numba ships with vectorbt; when it is missing the helpers run as plain
+Python with the same results.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit."""
+        def decorator(func):
+            return func
+        return decorator
+
+
+@njit(cache=True, error_model="numpy")
+def timeframe_stats(macd, sig, rsi, close, bb_lo, bb_up, vol, vol_ma, thresh):
+    """
+    Count strategy signals over one timeframe in a single pass.
+    
+    NaN inputs (indicator warm-up) never satisfy a comparison, matching the
+    pandas mask logic. fastmath is deliberately off because it would let
+    the compiler assume there are no NaNs.
+    
+    Args:
+        macd: MACD line
+        sig: MACD signal line
+        rsi: RSI values
+        close: Close prices
+        bb_lo: Lower Bollinger band
+        bb_up: Upper Bollinger band
+        vol: Volume
+        vol_ma: Volume moving average
+        thresh: Volume surge threshold (volume / volume MA)
+    
+    Returns:
+        Tuple of (bullish crosses, bearish crosses, RSI/MACD entries,
+        RSI/MACD exits, BB entries, BB exits, RSI/MACD entry mask)
+    """
+    n = macd.shape[0]
+    entries = np.zeros(n, dtype=np.bool_)
+    n_bull = 0
+    n_bear = 0
+    n_entries = 0
+    n_exits = 0
+    n_bb_entries = 0
+    n_bb_exits = 0
+    prev_above = False
+    
+    for i in range(n):
+        above = macd[i] > sig[i]
+        rsi_valid = not np.isnan(rsi[i])
+        
+        if above and not prev_above:
+            n_bull += 1
+            if rsi_valid and rsi[i] < 50:
+                n_entries += 1
+                entries[i] = True
+        elif prev_above and not above:
+            n_bear += 1
+            if rsi_valid and rsi[i] > 50:
+                n_exits += 1
+        prev_above = above
+        
+        if np.isnan(bb_lo[i]) or np.isnan(bb_up[i]):
+            continue
+        if vol[i] / vol_ma[i] >= thresh:
+            if close[i] <= bb_lo[i]:
+                n_bb_entries += 1
+            if close[i] >= bb_up[i]:
+                n_bb_exits += 1
+    
+    return n_bull, n_bear, n_entries, n_exits, n_bb_entries, n_bb_exits, entries
+
+
+@njit(cache=True, error_model="numpy")
+def cross_signals(rsi, macd, sig, rsi_lo, rsi_hi):
+    """
+    Mark MACD crossovers confirmed by RSI in a single pass.
+    
+    A bullish cross needs MACD above the signal line after being at or
+    below it on the previous candle (bearish is the mirror image), so a
+    NaN candle is never the starting side of a cross, matching the
+    pandas shift(1) comparisons.
+    
+    Args:
+        rsi: RSI values
+        macd: MACD line
+        sig: MACD signal line
+        rsi_lo: Entries need RSI below this
+        rsi_hi: Exits need RSI above this
+    
+    Returns:
+        Tuple of (entry mask, exit mask)
+    """
+    n = rsi.shape[0]
+    entries = np.zeros(n, dtype=np.bool_)
+    exits = np.zeros(n, dtype=np.bool_)
+    
+    for i in range(1, n):
+        if macd[i] > sig[i] and macd[i - 1] <= sig[i - 1]:
+            entries[i] = rsi[i] < rsi_lo
+        elif macd[i] < sig[i] and macd[i - 1] >= sig[i - 1]:
+            exits[i] = rsi[i] > rsi_hi
+    
+    return entries, exits
@@ -223,7 +223,7 @@ class PaperTradingService:
                 self.testnet_client = BinanceTestnetClient()
                 logger.info("Paper trading using Binance Testnet API")
             except ValueError as e:
-                logger.error(f"Failed to initialize testnet client: {e}")
+                logger.error("Failed to initialize testnet client: %s", e)
                 raise
         else:
             logger.info("Paper trading using local simulation")
@@ -355,8 +355,8 @@ class PaperTradingService:
         self.db.refresh(order)
         
         logger.info(
-            f"Created Testnet {order_type.value} {side.value} order for {quantity} {symbol} "
-            f"(Binance Order ID: {testnet_order['orderId']})"
+            "Created Testnet %s %s order for %s %s (Binance Order ID: %s)",
+            order_type.value, side.value, quantity, symbol, testnet_order['orderId']
         )
         
         return order
@@ -397,7 +397,7 @@ class PaperTradingService:
         self.db.commit()
         self.db.refresh(order)
         
-        logger.info(f"Created simulated {order_type.value} {side.value} order for {quantity} {symbol}")
+        logger.info("Created simulated %s %s order for %s %s", order_type.value, side.value, quantity, symbol)
         
         # Try to fill market orders immediately
         if order_type == OrderType.MARKET:
@@ -433,7 +433,7 @@ class PaperTradingService:
         order.updated_at = datetime.utcnow()
         self.db.commit()
         
-        logger.info(f"Cancelled order {order_id}")
+        logger.info("Cancelled order %s", order_id)
         return order
     
     async def create_stop_loss_and_take_profit(
@@ -470,9 +470,9 @@ class PaperTradingService:
                     stop_price=stop_loss_price
                 )
                 created_orders['stop_loss'] = stop_order.id
-                logger.info(f"Created stop loss order for {symbol} at {stop_loss_price}")
+                logger.info("Created stop loss order for %s at %s", symbol, stop_loss_price)
             except Exception as e:
-                logger.error(f"Error creating stop loss order: {e}")
+                logger.error("Error creating stop loss order: %s", e)
         
         if take_profit_price:
             try:
@@ -484,9 +484,9 @@ class PaperTradingService:
                     stop_price=take_profit_price
                 )
                 created_orders['take_profit'] = tp_order.id
-                logger.info(f"Created take profit order for {symbol} at {take_profit_price}")
+                logger.info("Created take profit order for %s at %s", symbol, take_profit_price)
             except Exception as e:
-                logger.error(f"Error creating take profit order: {e}")
+                logger.error("Error creating take profit order: %s", e)
         
         return created_orders
     
@@ -515,7 +515,7 @@ class PaperTradingService:
                 current_price = await self._get_current_price(order.symbol)
                 await self._check_and_fill_order(order, current_price)
             except Exception as e:
-                logger.error(f"Error processing order {order.id}: {e}")
+                logger.error("Error processing order %s: %s", order.id, e)
     
     async def get_open_orders(self, symbol: Optional[str] = None) -> List[PaperOrder]:
         """
@@ -605,11 +605,11 @@ class PaperTradingService:
                 order.updated_at = datetime.utcnow()
                 
                 logger.info(
-                    f"Synced order {order.id}: status={order.status}, "
-                    f"filled={order.filled_quantity}/{order.quantity}"
+                    "Synced order %s: status=%s, filled=%s/%s",
+                    order.id, order.status, order.filled_quantity, order.quantity
                 )
             except Exception as e:
-                logger.error(f"Error syncing order {order.id}: {e}")
+                logger.error("Error syncing order %s: %s", order.id, e)
         
         self.db.commit()
     
@@ -937,13 +937,13 @@ class PaperTradingService:
                 # Add cash
                 self._update_cash_balance(fill_quantity * fill_price - fee)
             else:
-                logger.warning(f"No position found for {order.symbol} during SELL fill")
+                logger.warning("No position found for %s during SELL fill", order.symbol)
         
         self.db.commit()
         
         logger.info(
-            f"Filled {fill_quantity} {order.symbol} at ${fill_price:.2f} "
-            f"(Fee: ${fee:.2f}, Reason: {reason})"
+            "Filled %s %s at $%.2f (Fee: $%.2f, Reason: %s)",
+            fill_quantity, order.symbol, fill_price, fee, reason
         )
     
     def _get_position(self, symbol: str) -> Optional[Position]:
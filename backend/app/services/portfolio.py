@@ -1,6 +1,7 @@
 """
 Portfolio management and trade execution logic.
 """
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 from sqlalchemy.orm import Session
@@ -30,8 +31,11 @@ class PortfolioManager:
         self.use_paper_trading = use_paper_trading
         self.paper_trading_service = PaperTradingService(db) if use_paper_trading else None
         
+        # symbol -> Position primary key, so repeat lookups hit the identity map
+        self._position_ids: Dict[str, int] = {}
+        
         if use_paper_trading:
-            logger.info(f"[{run_id}] PortfolioManager initialized with Binance testnet paper trading")
+            logger.info("[%s] PortfolioManager initialized with Binance testnet paper trading", run_id)
     
     def get_cash_balance(self) -> float:
         """Get current cash balance."""
@@ -49,9 +53,20 @@ class PortfolioManager:
     
     def get_position(self, symbol: str) -> Optional[Position]:
         """Get current position for a symbol."""
-        return self.db.query(Position).filter(
+        position_id = self._position_ids.get(symbol)
+        if position_id is not None:
+            # Primary-key lookup is served from the session identity map
+            position = self.db.get(Position, position_id)
+            if position is not None and position not in self.db.deleted:
+                return position
+            del self._position_ids[symbol]
+        
+        position = self.db.query(Position).filter(
             Position.symbol == symbol
         ).first()
+        if position is not None and position.id is not None:
+            self._position_ids[symbol] = position.id
+        return position
     
     def get_all_positions(self) -> List[Position]:
         """Get all open positions."""
@@ -59,6 +74,18 @@ class PortfolioManager:
             Position.quantity > 0
         ).all()
     
+    @contextmanager
+    def transaction(self):
+        """
+        Run a block of work inside a SAVEPOINT.
+        
+        Changes made inside the block are rolled back to the savepoint if an
+        exception escapes; the outer transaction is left open for the caller
+        to commit.
+        """
+        with self.db.begin_nested():
+            yield
+    
     def execute_trade(
         self,
         symbol: str,
@@ -80,6 +107,48 @@ class PortfolioManager:
         Returns:
             Created Trade object
         """
+        trade = self._execute_trade_unchecked(symbol, side, quantity, price, timestamp)
+        self.db.commit()
+        return trade
+    
+    def batch_execute_trades(self, trades: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Execute many simulated trades in a single transaction.
+        
+        Each trade runs inside its own SAVEPOINT so a trade that fails
+        validation is rolled back on its own without aborting the batch.
+        The whole batch is committed once at the end.
+        
+        Args:
+            trades: List of dicts with execute_trade keyword arguments
+                (symbol, side, quantity, price, optional timestamp)
+        
+        Returns:
+            List of {'success', 'trade', 'error'} dicts in input order
+        """
+        results = []
+        
+        for params in trades:
+            try:
+                with self.transaction():
+                    trade = self._execute_trade_unchecked(**params)
+                results.append({'success': True, 'trade': trade, 'error': None})
+            except ValueError as e:
+                logger.warning("Batch trade rejected: %s", e)
+                results.append({'success': False, 'trade': None, 'error': str(e)})
+        
+        self.db.commit()
+        return results
+    
+    def _execute_trade_unchecked(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: float,
+        timestamp: Optional[datetime] = None
+    ) -> Trade:
+        """Execute a simulated trade without committing the session."""
         if timestamp is None:
             timestamp = datetime.utcnow()
         
@@ -118,9 +187,9 @@ class PortfolioManager:
                     order_type="MARKET",
                     quantity=quantity
                 )
-                logger.info(f"Paper trade executed: {paper_order['binance_order_id']}")
+                logger.info("Paper trade executed: %s", paper_order['binance_order_id'])
             except Exception as e:
-                logger.error(f"Paper trading failed: {e}")
+                logger.error("Paper trading failed: %s", e)
                 raise ValueError(f"Paper trading execution failed: {e}")
         
         # Create trade record
@@ -148,8 +217,7 @@ class PortfolioManager:
         # Create portfolio snapshot
         self._create_snapshot(new_cash, timestamp)
         
-        self.db.commit()
-        logger.info(f"Executed {side} {quantity} {symbol} @ {price} (PnL: {trade.pnl})")
+        logger.info("Executed %s %s %s @ %s (PnL: %s)", side, quantity, symbol, price, trade.pnl)
         
         return trade
     
@@ -259,7 +327,7 @@ class PortfolioManager:
             
             current_price = current_prices.get(position.symbol)
             if not current_price:
-                logger.warning(f"No current price for {position.symbol}, skipping stop loss check")
+                logger.warning("No current price for %s, skipping stop loss check", position.symbol)
                 continue
             
             # Get the most recent BUY recommendation with a stop loss for this symbol
@@ -276,8 +344,8 @@ class PortfolioManager:
             # Check if stop loss is breached (price dropped below stop loss)
             if current_price <= recent_rec.stop_loss:
                 logger.warning(
-                    f"STOP LOSS TRIGGERED for {position.symbol}: "
-                    f"Price {current_price:.2f} <= Stop Loss {recent_rec.stop_loss:.2f}"
+                    "STOP LOSS TRIGGERED for %s: Price %.2f <= Stop Loss %.2f",
+                    position.symbol, current_price, recent_rec.stop_loss
                 )
                 
                 # Execute stop loss trade
@@ -290,7 +358,7 @@ class PortfolioManager:
                             order_type="MARKET",
                             quantity=position.quantity,
                         )
-                        logger.info(f"Created paper trading SELL order for stop loss on {position.symbol}")
+                        logger.info("Created paper trading SELL order for stop loss on %s", position.symbol)
                     else:
                         # Execute simulated stop loss trade
                         self.execute_trade(
@@ -299,7 +367,7 @@ class PortfolioManager:
                             quantity=position.quantity,
                             price=current_price,
                         )
-                        logger.info(f"Executed simulated stop loss SELL for {position.symbol}")
+                        logger.info("Executed simulated stop loss SELL for %s", position.symbol)
                     
                     triggered_stops.append({
                         "symbol": position.symbol,
@@ -314,7 +382,7 @@ class PortfolioManager:
                     self.db.commit()
                     
                 except Exception as e:
-                    logger.error(f"Error executing stop loss for {position.symbol}: {e}")
+                    logger.error("Error executing stop loss for %s: %s", position.symbol, e)
         
         return triggered_stops
     
@@ -474,4 +542,4 @@ def initialize_portfolio(db: Session, run_id: str = "live"):
     db.add(snapshot)
     db.commit()
     
-    logger.info(f"Initialized portfolio {run_id} with ${settings.initial_cash}")
+    logger.info("Initialized portfolio %s with $%s", run_id, settings.initial_cash)
@@ -3,7 +3,9 @@ Sentiment Data Service
 
 Aggregates real market sentiment data from multiple sources.
 """
+import asyncio
 import httpx
+import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from sqlalchemy.orm import Session
@@ -11,6 +13,15 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Aggregate score buckets (-100 to 100), looked up with searchsorted(side="right")
+_SENTIMENT_THRESHOLDS = np.array([-60, -30, 30, 60])
+_SENTIMENT_LABELS = np.array(["Extreme Fear", "Fear", "Neutral", "Greed", "Extreme Greed"])
+
+# RSI buckets: <=20, <=30, <70, <80, >=80. The lower bounds are inclusive,
+# so they are nudged up by one ulp to work with searchsorted(side="right").
+_RSI_THRESHOLDS = np.array([np.nextafter(20, np.inf), np.nextafter(30, np.inf), 70, 80])
+_RSI_LABELS = np.array(["extreme_fear", "fear", "neutral", "greed", "extreme_greed"])
+
 
 class SentimentService:
     """
@@ -65,7 +76,7 @@ class SentimentService:
                     "timestamp": datetime.fromtimestamp(int(fng["timestamp"]))
                 }
         except Exception as e:
-            logger.warning(f"Failed to fetch Fear & Greed Index: {e}")
+            logger.warning("Failed to fetch Fear & Greed Index: %s", e)
             return None
     
     async def fetch_coingecko_sentiment(self, symbol: str) -> Optional[Dict[str, Any]]:
@@ -103,7 +114,7 @@ class SentimentService:
             
             coin_id = symbol_map.get(symbol.upper())
             if not coin_id:
-                logger.warning(f"No CoinGecko mapping for {symbol}")
+                logger.warning("No CoinGecko mapping for %s", symbol)
                 return None
             
             # Fetch coin data
@@ -140,7 +151,7 @@ class SentimentService:
             }
             
         except Exception as e:
-            logger.warning(f"Failed to fetch CoinGecko data for {symbol}: {e}")
+            logger.warning("Failed to fetch CoinGecko data for %s: %s", symbol, e)
             return None
     
     def analyze_volume_sentiment(
@@ -218,17 +229,12 @@ class SentimentService:
         macd = indicators.get("macd", 0)
         macd_signal = indicators.get("macd_signal", 0)
         
-        # RSI sentiment levels
-        if rsi >= 80:
-            rsi_sentiment = "extreme_greed"
-        elif rsi >= 70:
-            rsi_sentiment = "greed"
-        elif rsi <= 20:
-            rsi_sentiment = "extreme_fear"
-        elif rsi <= 30:
-            rsi_sentiment = "fear"
-        else:
+        # RSI sentiment levels (NaN during indicator warm-up reads as neutral;
+        # searchsorted would place it past every threshold)
+        if np.isnan(rsi):
             rsi_sentiment = "neutral"
+        else:
+            rsi_sentiment = str(_RSI_LABELS[np.searchsorted(_RSI_THRESHOLDS, rsi, side="right")])
         
         # MACD momentum
         if macd > macd_signal and macd > 0:
@@ -285,11 +291,10 @@ class SentimentService:
             Comprehensive sentiment data dict
         """
         # Fetch external sentiment data (parallel)
-        fear_greed_task = self.fetch_fear_greed_index()
-        coingecko_task = self.fetch_coingecko_sentiment(symbol)
-        
-        fear_greed = await fear_greed_task
-        coingecko = await coingecko_task
+        fear_greed, coingecko = await asyncio.gather(
+            self.fetch_fear_greed_index(),
+            self.fetch_coingecko_sentiment(symbol),
+        )
         
         # Analyze internal signals
         volume_sentiment = self.analyze_volume_sentiment(
@@ -405,13 +410,21 @@ class SentimentService:
         Returns:
             Classification string
         """
-        if score >= 60:
-            return "Extreme Greed"
-        elif score >= 30:
-            return "Greed"
-        elif score >= -30:
-            return "Neutral"
-        elif score >= -60:
-            return "Fear"
-        else:
-            return "Extreme Fear"
+        # NaN fails every bound, so it lands in the lowest bucket
+        if np.isnan(score):
+            return str(_SENTIMENT_LABELS[0])
+        return str(_SENTIMENT_LABELS[np.searchsorted(_SENTIMENT_THRESHOLDS, score, side="right")])
+    
+    @staticmethod
+    def classify_sentiment_batch(scores: np.ndarray) -> np.ndarray:
+        """
+        Classify an array of sentiment scores in one vectorized lookup.
+        
+        Args:
+            scores: Array of sentiment scores (-100 to 100)
+            
+        Returns:
+            Array of classification strings
+        """
+        buckets = np.searchsorted(_SENTIMENT_THRESHOLDS, scores, side="right")
+        return _SENTIMENT_LABELS[np.where(np.isnan(scores), 0, buckets)]
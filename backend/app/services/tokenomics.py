@@ -3,14 +3,176 @@ Tokenomics Data Service
 
 Fetches real token fundamentals, on-chain metrics, and supply data.
 """
+import asyncio
 import httpx
-from datetime import datetime
-from typing import Dict, Any, Optional
+import orjson
+import random
+import time
+import zlib
+import numpy as np
+from bisect import bisect_right
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Sequence, Tuple
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.util import identity_key
+from app.models.database import TokenomicsCache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Binance symbol -> CoinGecko coin ID
+_SYMBOL_MAP: Mapping[str, str] = MappingProxyType({
+    "BTCUSDT": "bitcoin",
+    "ETHUSDT": "ethereum",
+    "SOLUSDT": "solana",
+    "BNBUSDT": "binancecoin",
+    "ADAUSDT": "cardano",
+    "XRPUSDT": "ripple",
+    "DOGEUSDT": "dogecoin",
+    "MATICUSDT": "matic-network",
+    "DOTUSDT": "polkadot",
+    "LINKUSDT": "chainlink",
+    "AVAXUSDT": "avalanche-2",
+    "ATOMUSDT": "cosmos",
+    "UNIUSDT": "uniswap",
+    "LTCUSDT": "litecoin",
+    "NEARUSDT": "near",
+})
+_SUPPORTED_SYMBOLS = frozenset(_SYMBOL_MAP)
+
+# Classification buckets: value >= THRESHOLDS[i] maps to LABELS[i + 1]
+_MCAP_THRESHOLDS = (100_000_000, 1_000_000_000, 10_000_000_000, 100_000_000_000)
+_MCAP_LABELS = ("micro", "small", "mid", "large", "mega")
+
+_VOLUME_RATIO_THRESHOLDS = (0.03, 0.1)  # 3% / 10% daily turnover
+_VOLUME_LABELS = ("low", "moderate", "high")
+
+_SUPPLY_PCT_THRESHOLDS = (60, 95)
+_SUPPLY_STATUS_LABELS = ("early_stage", "partial", "fully_circulating")
+
+_INFLATION_PCT_THRESHOLDS = (60, 80, 95)
+_INFLATION_PRESSURE_LABELS = ("high", "moderate", "low", "none")
+
+_COMMIT_THRESHOLDS = (1, 10, 50, 100)
+_ACTIVITY_LABELS = ("dormant", "low", "moderate", "active", "very_active")
+
+_RESOLUTION_RATE_THRESHOLDS = (0.5, 0.8)
+_PROJECT_HEALTH_LABELS = ("declining", "stable", "healthy")
+
+# In-process cache: CoinGecko data changes on the order of minutes, not requests
+MEMORY_CACHE_TTL_SECONDS = 300
+MEMORY_CACHE_MAX_SIZE = 128
+
+# Longer-lived cache persisted in the tokenomics_cache table
+DB_CACHE_TTL_SECONDS = 3600
+
+# Cap on concurrent CoinGecko requests (free tier allows ~10 req/s)
+MAX_CONCURRENT_REQUESTS = 8
+
+# Retry rate-limited / unavailable responses with jittered exponential backoff
+RETRY_STATUS_CODES = frozenset({429, 503})
+MAX_RETRIES = 4
+RETRY_BASE_DELAY_SECONDS = 0.5
+RETRY_MAX_DELAY_SECONDS = 30.0
+
+# Process-wide HTTP client so connections (and TLS sessions) to CoinGecko are reused
+_SHARED_CLIENT: Optional[httpx.AsyncClient] = None
+_http_version_logged = False
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared CoinGecko HTTP client, creating it on first use."""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None or _SHARED_CLIENT.is_closed:
+        _SHARED_CLIENT = httpx.AsyncClient(
+            timeout=10.0,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+            headers={"accept-encoding": "gzip"},
+        )
+    return _SHARED_CLIENT
+
+
+def _retry_delay(response: httpx.Response, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a rate-limited CoinGecko request.
+    
+    Uses the server's Retry-After hint when present, otherwise full-jitter
+    exponential backoff, capped at RETRY_MAX_DELAY_SECONDS either way.
+    
+    Args:
+        response: The 429/503 response
+        attempt: Zero-based retry attempt
+        
+    Returns:
+        Delay in seconds
+    """
+    retry_after = response.headers.get("retry-after")
+    if retry_after is not None:
+        try:
+            return min(max(float(retry_after), 0.0), RETRY_MAX_DELAY_SECONDS)
+        except ValueError:
+            pass  # HTTP-date form; fall back to backoff
+    backoff = min(RETRY_BASE_DELAY_SECONDS * 2 ** attempt, RETRY_MAX_DELAY_SECONDS)
+    return random.uniform(0, backoff)
+
+
+def _log_http_version_once(response: httpx.Response):
+    """Log the negotiated HTTP version for the first CoinGecko response."""
+    global _http_version_logged
+    if not _http_version_logged:
+        logger.debug("CoinGecko responded over %s", response.http_version)
+        _http_version_logged = True
+
+
+async def close_shared_client():
+    """Close the shared CoinGecko HTTP client (called on application shutdown)."""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is not None:
+        await _SHARED_CLIENT.aclose()
+        _SHARED_CLIENT = None
+
+
+# (epoch second, ISO string) of the last generated response timestamp
+_TS_CACHE: Tuple[int, str] = (0, "")
+
+
+def _iso_now_s() -> str:
+    """Current UTC time as an ISO string, rebuilt at most once per second."""
+    global _TS_CACHE
+    now_s = int(time.time())
+    if now_s != _TS_CACHE[0]:
+        _TS_CACHE = (now_s, datetime.utcfromtimestamp(now_s).isoformat())
+    return _TS_CACHE[1]
+
+
+def _unpack(data: Dict[str, Any], keys: Sequence[str], defaults: Sequence[Any]) -> Tuple[Any, ...]:
+    """Read several keys from a dict in one pass, with a default per key."""
+    return tuple(data.get(key, default) for key, default in zip(keys, defaults))
+
+
+def classify_batch(
+    values: Sequence[float],
+    thresholds: Sequence[float],
+    labels: Sequence[str]
+) -> np.ndarray:
+    """
+    Classify many values against the same buckets in one vectorized lookup.
+    
+    Equivalent to labels[bisect_right(thresholds, v)] for each value.
+    
+    Args:
+        values: Values to classify
+        thresholds: Sorted bucket lower bounds
+        labels: Bucket labels (one more than thresholds)
+        
+    Returns:
+        Array of labels, one per value
+    """
+    return np.take(np.asarray(labels), np.searchsorted(thresholds, values, side="right"))
+
 
 class TokenomicsService:
     """
@@ -22,6 +184,13 @@ class TokenomicsService:
     3. Calculated metrics - Supply velocity, holder concentration estimates
     """
     
+    # coin_id -> (monotonic fetch time, parsed tokenomics), shared across instances
+    _mem_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+    
+    # (symbol, need_community, need_developer) -> lookup task in flight, shared
+    # across instances so concurrent requests coalesce too
+    _inflight: Dict[Tuple[str, bool, bool], asyncio.Task] = {}
+    
     def __init__(self, db: Session):
         """
         Initialize tokenomics service.
@@ -30,19 +199,146 @@ class TokenomicsService:
             db: Database session for caching
         """
         self.db = db
-        self.client = httpx.AsyncClient(timeout=10.0)
+        self.client = _get_client()
         self.coingecko_url = "https://api.coingecko.com/api/v3"
         
     async def close(self):
-        """Close HTTP client."""
-        await self.client.aclose()
+        """No-op: the HTTP client is shared and closed on application shutdown."""
+    
+    def _get_mem_cached(self, coin_id: str) -> Optional[Dict[str, Any]]:
+        """Return the in-process cached tokenomics for a coin if still fresh."""
+        entry = self._mem_cache.get(coin_id)
+        if entry is None:
+            return None
+        
+        cached_at, payload = entry
+        if time.monotonic() - cached_at > MEMORY_CACHE_TTL_SECONDS:
+            self._mem_cache.pop(coin_id, None)
+            return None
+        return payload
+    
+    def _set_mem_cached(self, coin_id: str, payload: Dict[str, Any]):
+        """Store tokenomics in the in-process cache, evicting the oldest entry when full."""
+        if coin_id not in self._mem_cache and len(self._mem_cache) >= MEMORY_CACHE_MAX_SIZE:
+            oldest = min(self._mem_cache, key=lambda k: self._mem_cache[k][0])
+            self._mem_cache.pop(oldest, None)
+        self._mem_cache[coin_id] = (time.monotonic(), payload)
+    
+    def _get_cache_row(self, coin_id: str) -> Optional[TokenomicsCache]:
+        """Return the database cache row for a coin, fresh or not."""
+        if self.db is None:
+            return None
+        
+        try:
+            return self.db.get(TokenomicsCache, coin_id)
+        except Exception as e:
+            logger.warning("Failed to read tokenomics cache for %s: %s", coin_id, e)
+            return None
+    
+    def _load_cached(self, coin_id: str, max_age_s: int = DB_CACHE_TTL_SECONDS) -> Optional[Dict[str, Any]]:
+        """
+        Load tokenomics for a coin from the database cache.
+        
+        Args:
+            coin_id: CoinGecko coin ID
+            max_age_s: Maximum age in seconds for the cached entry to be used
+            
+        Returns:
+            Cached tokenomics dict, or None if missing or stale
+        """
+        row = self._get_cache_row(coin_id)
+        if row is None:
+            return None
+        
+        fetched_at = row.fetched_at
+        if fetched_at.tzinfo is None:
+            fetched_at = fetched_at.replace(tzinfo=timezone.utc)
+        age = (datetime.now(timezone.utc) - fetched_at).total_seconds()
+        if age > max_age_s:
+            return None
+        
+        return self._decode_cached(row)
+    
+    def _decode_cached(self, row: TokenomicsCache) -> Optional[Dict[str, Any]]:
+        """Decode a cache row's payload, treating a corrupt row as a miss."""
+        try:
+            return orjson.loads(zlib.decompress(row.payload))
+        except Exception as e:
+            logger.warning("Discarding corrupt tokenomics cache for %s: %s", row.coin_id, e)
+            return None
+    
+    def _store_cached(
+        self,
+        coin_id: str,
+        payload: Dict[str, Any],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """
+        Upsert tokenomics for a coin into the database cache.
+        
+        The write goes through a short-lived session on the same engine, so
+        it never commits or rolls back the caller's pending work.
+        
+        Args:
+            coin_id: CoinGecko coin ID
+            payload: Parsed tokenomics dict
+            etag: ETag response header, for conditional revalidation
+            last_modified: Last-Modified response header, for conditional revalidation
+        """
+        if self.db is None:
+            return
+        
+        try:
+            with Session(bind=self.db.get_bind()) as cache_db, cache_db.begin():
+                cache_db.merge(TokenomicsCache(
+                    coin_id=coin_id,
+                    fetched_at=datetime.now(timezone.utc),
+                    payload=zlib.compress(orjson.dumps(payload), 3),
+                    etag=etag,
+                    last_modified=last_modified
+                ))
+        except Exception as e:
+            logger.warning("Failed to write tokenomics cache for %s: %s", coin_id, e)
+        self._expire_cache_row(coin_id)
+    
+    def _touch_cached(self, row: TokenomicsCache):
+        """Mark a revalidated (304 Not Modified) cache row as freshly fetched."""
+        try:
+            with Session(bind=self.db.get_bind()) as cache_db, cache_db.begin():
+                cache_db.execute(
+                    update(TokenomicsCache)
+                    .where(TokenomicsCache.coin_id == row.coin_id)
+                    .values(fetched_at=datetime.now(timezone.utc))
+                )
+        except Exception as e:
+            logger.warning("Failed to refresh tokenomics cache for %s: %s", row.coin_id, e)
+        self._expire_cache_row(row.coin_id)
+    
+    def _expire_cache_row(self, coin_id: str):
+        """Make the caller's session reload a cache row written through a separate session."""
+        row = self.db.identity_map.get(identity_key(TokenomicsCache, coin_id))
+        if row is not None:
+            self.db.expire(row)
     
-    async def fetch_coingecko_tokenomics(self, symbol: str) -> Optional[Dict[str, Any]]:
+    async def fetch_coingecko_tokenomics(
+        self,
+        symbol: str,
+        *,
+        need_community: bool = True,
+        need_developer: bool = True
+    ) -> Optional[Dict[str, Any]]:
         """
         Fetch comprehensive tokenomics data from CoinGecko.
         
+        Concurrent calls for the same symbol and options share one lookup, even
+        across service instances, so a cold cache is filled by a single request
+        rather than one per caller.
+        
         Args:
             symbol: Trading pair (e.g., "BTCUSDT")
+            need_community: Request community data (empty "community" dict if False)
+            need_developer: Request developer data (empty "developer" dict if False)
             
         Returns:
             {
@@ -52,30 +348,65 @@ class TokenomicsService:
                 "community_data": {...}
             }
         """
-        try:
-            # Map Binance symbols to CoinGecko IDs
-            symbol_map = {
-                "BTCUSDT": "bitcoin",
-                "ETHUSDT": "ethereum",
-                "SOLUSDT": "solana",
-                "BNBUSDT": "binancecoin",
-                "ADAUSDT": "cardano",
-                "XRPUSDT": "ripple",
-                "DOGEUSDT": "dogecoin",
-                "MATICUSDT": "matic-network",
-                "DOTUSDT": "polkadot",
-                "LINKUSDT": "chainlink",
-                "AVAXUSDT": "avalanche-2",
-                "ATOMUSDT": "cosmos",
-                "UNIUSDT": "uniswap",
-                "LTCUSDT": "litecoin",
-                "NEARUSDT": "near",
-            }
+        key = (symbol, need_community, need_developer)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_coingecko_tokenomics(
+                symbol, need_community=need_community, need_developer=need_developer
+            ))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        result = await asyncio.shield(task)
+        return dict(result) if result is not None else None
+    
+    async def _get_with_retry(self, url: str, **kwargs) -> httpx.Response:
+        """
+        GET from CoinGecko, retrying 429/503 responses with backoff.
+        
+        Args:
+            url: Request URL
+            **kwargs: Passed through to the HTTP client
             
-            coin_id = symbol_map.get(symbol.upper())
-            if not coin_id:
-                logger.warning(f"No CoinGecko mapping for {symbol}")
+        Returns:
+            The first non-retryable response, or the last one once retries run out
+        """
+        for attempt in range(MAX_RETRIES + 1):
+            response = await self.client.get(url, **kwargs)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                return response
+            delay = _retry_delay(response, attempt)
+            logger.info("CoinGecko returned %s, retrying in %.1fs", response.status_code, delay)
+            await asyncio.sleep(delay)
+    
+    async def _fetch_coingecko_tokenomics(
+        self,
+        symbol: str,
+        *,
+        need_community: bool = True,
+        need_developer: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch tokenomics from cache or CoinGecko (see fetch_coingecko_tokenomics)."""
+        try:
+            symbol_upper = symbol.upper()
+            if symbol_upper not in _SUPPORTED_SYMBOLS:
+                logger.warning("No CoinGecko mapping for %s", symbol)
                 return None
+            coin_id = _SYMBOL_MAP[symbol_upper]
+            
+            # Partial fetches are cached separately from the full payload
+            cache_key = coin_id
+            if not (need_community and need_developer):
+                cache_key = f"{coin_id}:{int(need_community)}{int(need_developer)}"
+            
+            # Serve from cache when fresh (in-process first, then database)
+            cached = self._get_mem_cached(cache_key)
+            if cached is None:
+                cached = self._load_cached(cache_key)
+                if cached is not None:
+                    self._set_mem_cached(cache_key, cached)
+            if cached is not None:
+                return {**cached, "symbol": symbol}
             
             # Fetch comprehensive coin data
             url = f"{self.coingecko_url}/coins/{coin_id}"
@@ -83,19 +414,49 @@ class TokenomicsService:
                 "localization": "false",
                 "tickers": "false",
                 "market_data": "true",
-                "community_data": "true",
-                "developer_data": "true",
+                "community_data": "true" if need_community else "false",
+                "developer_data": "true" if need_developer else "false",
                 "sparkline": "false"
             }
             
-            response = await self.client.get(url, params=params)
+            # Revalidate a stale database entry instead of re-downloading it
+            # (a corrupt entry is re-downloaded unconditionally)
+            stale = self._get_cache_row(cache_key)
+            stale_payload = self._decode_cached(stale) if stale is not None else None
+            if stale_payload is None:
+                stale = None
+            headers = {}
+            if stale is not None:
+                if stale.etag:
+                    headers["If-None-Match"] = stale.etag
+                if stale.last_modified:
+                    headers["If-Modified-Since"] = stale.last_modified
+            
+            response = await self._get_with_retry(url, params=params, headers=headers or None)
+            
+            if response.status_code == 304 and stale is not None:
+                self._touch_cached(stale)
+                self._set_mem_cached(cache_key, stale_payload)
+                return {**stale_payload, "symbol": symbol}
+            
             response.raise_for_status()
-            data = response.json()
+            _log_http_version_once(response)
+            data = orjson.loads(response.content)
             
             # Extract tokenomics data
-            market_data = data.get("market_data", {})
-            community_data = data.get("community_data", {})
-            developer_data = data.get("developer_data", {})
+            market_data = data.get("market_data") or {}
+            community_data = data.get("community_data") or {}
+            developer_data = data.get("developer_data") or {}
+            links_d = data.get("links") or {}
+            
+            # Nested per-currency dicts, bound once
+            market_cap_d = market_data.get("market_cap") or {}
+            fdv_d = market_data.get("fully_diluted_valuation") or {}
+            volume_d = market_data.get("total_volume") or {}
+            ath_d = market_data.get("ath") or {}
+            ath_chg_d = market_data.get("ath_change_percentage") or {}
+            atl_d = market_data.get("atl") or {}
+            atl_chg_d = market_data.get("atl_change_percentage") or {}
             
             # Supply metrics
             circulating_supply = market_data.get("circulating_supply", 0)
@@ -110,9 +471,9 @@ class TokenomicsService:
                 supply_percentage = (circulating_supply / total_supply) * 100
             
             # Market metrics
-            market_cap = market_data.get("market_cap", {}).get("usd", 0)
-            fully_diluted_valuation = market_data.get("fully_diluted_valuation", {}).get("usd", 0)
-            total_volume = market_data.get("total_volume", {}).get("usd", 0)
+            market_cap = market_cap_d.get("usd", 0)
+            fully_diluted_valuation = fdv_d.get("usd", 0)
+            total_volume = volume_d.get("usd", 0)
             
             # Calculate velocity (volume / market cap)
             velocity = (total_volume / market_cap) if market_cap > 0 else 0
@@ -120,7 +481,7 @@ class TokenomicsService:
             # Valuation metrics
             price_to_book = market_data.get("price_to_book_ratio", 0)
             
-            return {
+            result = {
                 "symbol": symbol,
                 "coin_id": coin_id,
                 "name": data.get("name", "Unknown"),
@@ -144,10 +505,10 @@ class TokenomicsService:
                     "fdv_to_mcap_ratio": round(fully_diluted_valuation / market_cap, 2) if market_cap > 0 else 0,
                     "volume_24h": total_volume,
                     "volume_to_mcap_ratio": round(velocity, 4),
-                    "ath_price": market_data.get("ath", {}).get("usd", 0),
-                    "ath_change_percentage": market_data.get("ath_change_percentage", {}).get("usd", 0),
-                    "atl_price": market_data.get("atl", {}).get("usd", 0),
-                    "atl_change_percentage": market_data.get("atl_change_percentage", {}).get("usd", 0),
+                    "ath_price": ath_d.get("usd", 0),
+                    "ath_change_percentage": ath_chg_d.get("usd", 0),
+                    "atl_price": atl_d.get("usd", 0),
+                    "atl_change_percentage": atl_chg_d.get("usd", 0),
                 },
                 
                 # Price changes
@@ -164,7 +525,7 @@ class TokenomicsService:
                     "reddit_subscribers": community_data.get("reddit_subscribers", 0),
                     "reddit_active_48h": community_data.get("reddit_accounts_active_48h", 0),
                     "telegram_users": community_data.get("telegram_channel_user_count", 0),
-                },
+                } if need_community else {},
                 
                 # Developer activity
                 "developer": {
@@ -175,20 +536,29 @@ class TokenomicsService:
                     "closed_issues": developer_data.get("closed_issues", 0),
                     "pull_requests_merged": developer_data.get("pull_requests_merged", 0),
                     "commit_count_4_weeks": developer_data.get("commit_count_4_weeks", 0),
-                },
+                } if need_developer else {},
                 
                 # Links
                 "links": {
-                    "homepage": data.get("links", {}).get("homepage", [""])[0],
-                    "blockchain_site": data.get("links", {}).get("blockchain_site", [""])[0],
-                    "official_forum_url": data.get("links", {}).get("official_forum_url", [""])[0],
+                    "homepage": links_d.get("homepage", [""])[0],
+                    "blockchain_site": links_d.get("blockchain_site", [""])[0],
+                    "official_forum_url": links_d.get("official_forum_url", [""])[0],
                 },
                 
                 "last_updated": data.get("last_updated", ""),
             }
             
+            self._set_mem_cached(cache_key, result)
+            self._store_cached(
+                cache_key,
+                result,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified")
+            )
+            return result
+            
         except Exception as e:
-            logger.warning(f"Failed to fetch CoinGecko tokenomics for {symbol}: {e}")
+            logger.warning("Failed to fetch CoinGecko tokenomics for %s: %s", symbol, e)
             return None
     
     def analyze_supply_structure(self, supply_data: Dict[str, Any]) -> Dict[str, str]:
@@ -205,10 +575,11 @@ class TokenomicsService:
                 "inflation_pressure": "high" | "moderate" | "low" | "none"
             }
         """
-        circulating = supply_data.get("circulating", 0)
-        total = supply_data.get("total", 0)
-        max_supply = supply_data.get("max")
-        percentage = supply_data.get("percentage_circulating", 0)
+        total, max_supply, percentage, is_inflationary = _unpack(
+            supply_data,
+            ("total", "max", "percentage_circulating", "is_inflationary"),
+            (0, None, 0, False)
+        )
         
         # Determine inflation type
         if max_supply and max_supply > 0:
@@ -216,28 +587,16 @@ class TokenomicsService:
                 inflation_type = "deflationary"
             else:
                 inflation_type = "fixed"
-        elif supply_data.get("is_inflationary"):
+        elif is_inflationary:
             inflation_type = "inflationary"
         else:
             inflation_type = "unknown"
         
         # Supply circulation status
-        if percentage >= 95:
-            supply_status = "fully_circulating"
-        elif percentage >= 60:
-            supply_status = "partial"
-        else:
-            supply_status = "early_stage"
+        supply_status = _SUPPLY_STATUS_LABELS[bisect_right(_SUPPLY_PCT_THRESHOLDS, percentage)]
         
         # Inflation pressure (based on how much supply is yet to be released)
-        if percentage >= 95:
-            inflation_pressure = "none"
-        elif percentage >= 80:
-            inflation_pressure = "low"
-        elif percentage >= 60:
-            inflation_pressure = "moderate"
-        else:
-            inflation_pressure = "high"
+        inflation_pressure = _INFLATION_PRESSURE_LABELS[bisect_right(_INFLATION_PCT_THRESHOLDS, percentage)]
         
         return {
             "inflation_type": inflation_type,
@@ -259,20 +618,12 @@ class TokenomicsService:
                 "volume_rating": "high" | "moderate" | "low"
             }
         """
-        market_cap = market_data.get("market_cap", 0)
-        volume_ratio = market_data.get("volume_to_mcap_ratio", 0)
-        
-        # Market cap tiers
-        if market_cap >= 100_000_000_000:  # $100B+
-            market_cap_tier = "mega"
-        elif market_cap >= 10_000_000_000:  # $10B+
-            market_cap_tier = "large"
-        elif market_cap >= 1_000_000_000:  # $1B+
-            market_cap_tier = "mid"
-        elif market_cap >= 100_000_000:  # $100M+
-            market_cap_tier = "small"
-        else:
-            market_cap_tier = "micro"
+        market_cap, volume_ratio = _unpack(
+            market_data, ("market_cap", "volume_to_mcap_ratio"), (0, 0)
+        )
+        
+        # Market cap tiers ($100M / $1B / $10B / $100B)
+        market_cap_tier = _MCAP_LABELS[bisect_right(_MCAP_THRESHOLDS, market_cap)]
         
         # Liquidity rating (based on market cap + volume)
         if market_cap >= 10_000_000_000 and volume_ratio >= 0.05:
@@ -285,12 +636,7 @@ class TokenomicsService:
             liquidity_rating = "poor"
         
         # Volume rating
-        if volume_ratio >= 0.1:  # 10%+ daily turnover
-            volume_rating = "high"
-        elif volume_ratio >= 0.03:  # 3%+ daily turnover
-            volume_rating = "moderate"
-        else:
-            volume_rating = "low"
+        volume_rating = _VOLUME_LABELS[bisect_right(_VOLUME_RATIO_THRESHOLDS, volume_ratio)]
         
         return {
             "market_cap_tier": market_cap_tier,
@@ -298,6 +644,45 @@ class TokenomicsService:
             "volume_rating": volume_rating
         }
     
+    def analyze_liquidity_batch(self, market_dicts: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """
+        Analyze liquidity for many symbols with vectorized classification.
+        
+        Args:
+            market_dicts: Market metrics, one dict per symbol
+            
+        Returns:
+            List of analyze_liquidity results, in input order
+        """
+        count = len(market_dicts)
+        market_caps = np.fromiter(
+            (d.get("market_cap") or 0 for d in market_dicts), dtype=np.float64, count=count
+        )
+        volume_ratios = np.fromiter(
+            (d.get("volume_to_mcap_ratio") or 0 for d in market_dicts), dtype=np.float64, count=count
+        )
+        
+        tiers = classify_batch(market_caps, _MCAP_THRESHOLDS, _MCAP_LABELS)
+        volume_ratings = classify_batch(volume_ratios, _VOLUME_RATIO_THRESHOLDS, _VOLUME_LABELS)
+        liquidity_ratings = np.select(
+            [
+                (market_caps >= 10_000_000_000) & (volume_ratios >= 0.05),
+                (market_caps >= 1_000_000_000) & (volume_ratios >= 0.03),
+                (market_caps >= 100_000_000) & (volume_ratios >= 0.01),
+            ],
+            ["excellent", "good", "fair"],
+            default="poor"
+        )
+        
+        return [
+            {
+                "market_cap_tier": str(tier),
+                "liquidity_rating": str(liquidity),
+                "volume_rating": str(volume)
+            }
+            for tier, liquidity, volume in zip(tiers, liquidity_ratings, volume_ratings)
+        ]
+    
     def assess_developer_activity(self, developer_data: Dict[str, Any]) -> Dict[str, str]:
         """
         Assess developer activity level.
@@ -311,31 +696,19 @@ class TokenomicsService:
                 "project_health": "healthy" | "stable" | "declining" | "unknown"
             }
         """
-        commits_4w = developer_data.get("commit_count_4_weeks", 0)
-        total_issues = developer_data.get("total_issues", 0)
-        closed_issues = developer_data.get("closed_issues", 0)
+        commits_4w, total_issues, closed_issues = _unpack(
+            developer_data,
+            ("commit_count_4_weeks", "total_issues", "closed_issues"),
+            (0, 0, 0)
+        )
         
         # Activity level based on commits
-        if commits_4w >= 100:
-            activity_level = "very_active"
-        elif commits_4w >= 50:
-            activity_level = "active"
-        elif commits_4w >= 10:
-            activity_level = "moderate"
-        elif commits_4w >= 1:
-            activity_level = "low"
-        else:
-            activity_level = "dormant"
+        activity_level = _ACTIVITY_LABELS[bisect_right(_COMMIT_THRESHOLDS, commits_4w)]
         
         # Project health based on issue resolution
         if total_issues > 0:
             resolution_rate = closed_issues / total_issues
-            if resolution_rate >= 0.8:
-                project_health = "healthy"
-            elif resolution_rate >= 0.5:
-                project_health = "stable"
-            else:
-                project_health = "declining"
+            project_health = _PROJECT_HEALTH_LABELS[bisect_right(_RESOLUTION_RATE_THRESHOLDS, resolution_rate)]
         else:
             project_health = "unknown"
         
@@ -349,7 +722,10 @@ class TokenomicsService:
         symbol: str,
         current_price: float,
         market_cap: float,
-        volume_24h: float
+        volume_24h: float,
+        *,
+        need_community: bool = True,
+        need_developer: bool = True
     ) -> Dict[str, Any]:
         """
         Aggregate comprehensive tokenomics data.
@@ -359,13 +735,79 @@ class TokenomicsService:
             current_price: Current price
             market_cap: Market capitalization
             volume_24h: 24h trading volume
+            need_community: Fetch community metrics from CoinGecko
+            need_developer: Fetch developer metrics from CoinGecko
             
         Returns:
             Comprehensive tokenomics data dict
         """
         # Fetch CoinGecko data
-        coingecko_data = await self.fetch_coingecko_tokenomics(symbol)
+        coingecko_data = await self.fetch_coingecko_tokenomics(
+            symbol, need_community=need_community, need_developer=need_developer
+        )
+        
+        return self._build_comprehensive_tokenomics(
+            symbol, current_price, market_cap, volume_24h, coingecko_data
+        )
+    
+    async def get_comprehensive_tokenomics_batch(
+        self,
+        requests: List[Tuple[str, float, float, float]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate comprehensive tokenomics data for many symbols at once.
+        
+        CoinGecko requests are issued concurrently (at most
+        MAX_CONCURRENT_REQUESTS at a time within this batch) instead of one
+        after another.
+        
+        Args:
+            requests: List of (symbol, current_price, market_cap, volume_24h) tuples
+            
+        Returns:
+            List of comprehensive tokenomics dicts, in input order
+        """
+        # Created per call: a semaphore is bound to the event loop it first waits on
+        sem = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        
+        async def fetch(symbol: str) -> Optional[Dict[str, Any]]:
+            async with sem:
+                return await self.fetch_coingecko_tokenomics(symbol)
+        
+        raw = await asyncio.gather(
+            *(fetch(symbol) for symbol, _, _, _ in requests),
+            return_exceptions=True
+        )
         
+        fetched = []
+        for (symbol, _, _, _), coingecko_data in zip(requests, raw):
+            if isinstance(coingecko_data, BaseException):
+                logger.warning("Failed to fetch CoinGecko tokenomics for %s: %s", symbol, coingecko_data)
+                coingecko_data = None
+            fetched.append(coingecko_data)
+        
+        # Classify liquidity for every fetched symbol in one vectorized pass
+        available = [data for data in fetched if data]
+        liquidity = iter(self.analyze_liquidity_batch([data["market"] for data in available]))
+        
+        return [
+            self._build_comprehensive_tokenomics(
+                symbol, current_price, market_cap, volume_24h, coingecko_data,
+                liquidity_analysis=next(liquidity) if coingecko_data else None
+            )
+            for (symbol, current_price, market_cap, volume_24h), coingecko_data in zip(requests, fetched)
+        ]
+    
+    def _build_comprehensive_tokenomics(
+        self,
+        symbol: str,
+        current_price: float,
+        market_cap: float,
+        volume_24h: float,
+        coingecko_data: Optional[Dict[str, Any]],
+        liquidity_analysis: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Combine fetched CoinGecko data with the supply/liquidity/developer analyses."""
         if not coingecko_data:
             # Fallback to basic metrics if CoinGecko unavailable
             return {
@@ -383,15 +825,19 @@ class TokenomicsService:
         # Analyze supply structure
         supply_analysis = self.analyze_supply_structure(coingecko_data["supply"])
         
-        # Analyze liquidity
-        liquidity_analysis = self.analyze_liquidity(coingecko_data["market"])
+        # Analyze liquidity (unless precomputed by the batch path)
+        if liquidity_analysis is None:
+            liquidity_analysis = self.analyze_liquidity(coingecko_data["market"])
         
-        # Assess developer activity
-        developer_assessment = self.assess_developer_activity(coingecko_data["developer"])
+        # Assess developer activity (an empty dict would read as "dormant")
+        if coingecko_data["developer"]:
+            developer_assessment = self.assess_developer_activity(coingecko_data["developer"])
+        else:
+            developer_assessment = {"activity_level": "not_fetched", "project_health": "not_fetched"}
         
         # Combine all data
         return {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _iso_now_s(),
             "symbol": symbol,
             "coin_name": coingecko_data["name"],
             "blockchain": coingecko_data["blockchain"],
@@ -417,7 +863,7 @@ class TokenomicsService:
                 "coingecko": True,
                 "supply_metrics": True,
                 "market_metrics": True,
-                "community_metrics": True,
-                "developer_metrics": True,
+                "community_metrics": bool(coingecko_data["community"]),
+                "developer_metrics": bool(coingecko_data["developer"]),
             }
         }
@@ -0,0 +1,28 @@
+"""
+Sweep RSI thresholds over the candidate signal strategies.
+
+Indicators are loaded once (and cached on disk by test_utils), then every
+threshold pair is evaluated against the same frame.
+"""
+import sys
+
+from test_signals_v2 import run, count_signals, STRATEGIES
+
+# (oversold, overbought) pairs to evaluate
+RSI_THRESHOLDS = [(20, 80), (25, 75), (30, 70), (35, 65), (40, 60)]
+
+
+def main(symbol="BTCUSDT"):
+    """Print entry/exit counts per strategy for each RSI threshold pair."""
+    df, _ = run(symbol)
+    
+    print(f"\n=== RSI THRESHOLD SWEEP ({symbol}) ===")
+    print(f"{'RSI':<8}" + "".join(f"{name:>14}" for name in STRATEGIES))
+    for oversold, overbought in RSI_THRESHOLDS:
+        counts = count_signals(df, oversold, overbought)
+        cells = "".join(f"{f'{n_entries}/{n_exits}':>14}" for n_entries, n_exits in counts)
+        print(f"{f'{oversold}/{overbought}':<8}{cells}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -4,11 +4,17 @@ This test ensures that all strategies generate trades across various timeframes.
 """
 import requests
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 BASE_URL = "http://localhost:8000"
 
-def run_backtest(symbol, start_date, end_date, timeframe, strategy):
+# Shared session so scenarios reuse keep-alive connections to the server
+session = requests.Session()
+print_lock = threading.Lock()
+
+def run_backtest(symbol, start_date, end_date, timeframe, strategy, log):
     """Run a backtest and return the results."""
     payload = {
         "symbol": symbol,
@@ -20,45 +26,52 @@ def run_backtest(symbol, start_date, end_date, timeframe, strategy):
         "strategy": strategy
     }
     
-    response = requests.post(f"{BASE_URL}/backtest", json=payload)
+    response = session.post(f"{BASE_URL}/backtest", json=payload)
     
     if response.status_code != 200:
-        print(f"❌ Error: {response.status_code}")
-        print(response.text)
+        log.append(f"❌ Error: {response.status_code}")
+        log.append(response.text)
         return None
     
     return response.json()["result"]
 
 def test_scenario(name, symbol, start_date, end_date, timeframe, strategy):
     """Test a specific backtest scenario."""
-    print(f"\n{'='*60}")
-    print(f"Testing: {name}")
-    print(f"{'='*60}")
-    print(f"Symbol: {symbol}")
-    print(f"Date Range: {start_date} to {end_date}")
-    print(f"Timeframe: {timeframe}")
-    print(f"Strategy: {strategy}")
-    
-    result = run_backtest(symbol, start_date, end_date, timeframe, strategy)
-    
-    if result is None:
-        print("❌ Backtest FAILED")
-        return False
-    
-    num_trades = result["metrics"]["num_trades"]
-    final_equity = result["final_equity"]
-    
-    print(f"\nResults:")
-    print(f"  Trades: {num_trades}")
-    print(f"  Final Equity: ${final_equity:.2f}")
-    print(f"  Return: {result['metrics']['total_return_pct']:.2f}%")
+    # Collect output and print it in one block so concurrent scenarios don't interleave
+    log = [
+        f"\n{'='*60}",
+        f"Testing: {name}",
+        f"{'='*60}",
+        f"Symbol: {symbol}",
+        f"Date Range: {start_date} to {end_date}",
+        f"Timeframe: {timeframe}",
+        f"Strategy: {strategy}",
+    ]
     
-    if num_trades > 0:
-        print(f"✅ SUCCESS - Generated {num_trades} trades")
-        return True
-    else:
-        print(f"⚠️  WARNING - No trades generated (might be normal for some periods)")
-        return True  # Not necessarily a failure - market might not have signals
+    try:
+        result = run_backtest(symbol, start_date, end_date, timeframe, strategy, log)
+        
+        if result is None:
+            log.append("❌ Backtest FAILED")
+            return False
+        
+        num_trades = result["metrics"]["num_trades"]
+        final_equity = result["final_equity"]
+        
+        log.append(f"\nResults:")
+        log.append(f"  Trades: {num_trades}")
+        log.append(f"  Final Equity: ${final_equity:.2f}")
+        log.append(f"  Return: {result['metrics']['total_return_pct']:.2f}%")
+        
+        if num_trades > 0:
+            log.append(f"✅ SUCCESS - Generated {num_trades} trades")
+            return True
+        else:
+            log.append(f"⚠️  WARNING - No trades generated (might be normal for some periods)")
+            return True  # Not necessarily a failure - market might not have signals
+    finally:
+        with print_lock:
+            print("\n".join(log))
 
 if __name__ == "__main__":
     print("="*60)
@@ -81,14 +94,12 @@ if __name__ == "__main__":
         ("ETH 1d, 2-year range, RSI+MACD", "ETHUSDT", "2023-01-01", "2025-12-06", "1d", "rsi_macd"),
     ]
     
-    passed = 0
-    failed = 0
+    # Scenarios are independent server-side runs, so submit them all at once
+    with ThreadPoolExecutor(max_workers=len(test_cases)) as executor:
+        results = list(executor.map(lambda tc: test_scenario(*tc), test_cases))
     
-    for test_case in test_cases:
-        if test_scenario(*test_case):
-            passed += 1
-        else:
-            failed += 1
+    passed = sum(results)
+    failed = len(results) - passed
     
     print(f"\n{'='*60}")
     print("TEST SUMMARY")
@@ -4,24 +4,32 @@ Debug script to test specific date ranges that fail.
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+from sqlalchemy.orm import Session
 from app.services.binance import BinanceService, get_candles_in_range
 from app.services.indicators import calculate_rsi, calculate_macd, calculate_ema, calculate_bollinger_bands
 from app.core.config import settings
 from app.core.database import SessionLocal
 
-def test_backtest_date_range(symbol: str, start_date: str, end_date: str, timeframe: str):
-    """Test a specific date range that fails in backtest."""
-    print(f"\n{'='*60}")
-    print(f"Testing {symbol} {timeframe} from {start_date} to {end_date}")
-    print(f"{'='*60}")
-    
-    db = SessionLocal()
-    
+# Session for _cached_indicators' DB reads, opened in __main__. It is kept out
+# of the cached function's arguments so it isn't part of the cache key.
+_db: Optional[Session] = None
+
+@lru_cache(maxsize=32)
+def _cached_indicators(symbol: str, timeframe: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """
+    Load candles and compute RSI/MACD once per (symbol, timeframe, start, end).
+    
+    Candles are read through the module-level _db session. Returns an empty
+    DataFrame if no data is available. The returned frame is shared between
+    calls, so callers must not modify it.
+    """
     start_dt = datetime.fromisoformat(start_date)
     end_dt = datetime.fromisoformat(end_date)
     
     # Fetch historical data (same way as VectorBT engine)
-    candles = get_candles_in_range(db, symbol, timeframe, start_dt, end_dt)
+    candles = get_candles_in_range(_db, symbol, timeframe, start_dt, end_dt)
     
     print(f"Candles from DB: {len(candles)}")
     
@@ -36,39 +44,34 @@ def test_backtest_date_range(symbol: str, start_date: str, end_date: str, timefr
             end_time=int(end_dt.timestamp() * 1000)
         )
         
-        df = pd.DataFrame([
-            {
-                "timestamp": datetime.fromtimestamp(k[0] / 1000),
-                "open": float(k[1]),
-                "high": float(k[2]),
-                "low": float(k[3]),
-                "close": float(k[4]),
-                "volume": float(k[5]),
-            }
-            for k in klines
-        ])
+        # Build columns directly instead of a list of per-row dicts
+        if klines:
+            ts, o, h, l, c, v = zip(*((k[0], k[1], k[2], k[3], k[4], k[5]) for k in klines))
+            df = pd.DataFrame({
+                "timestamp": pd.to_datetime(np.asarray(ts, dtype="int64"), unit="ms"),
+                "open": np.asarray(o, dtype=np.float64),
+                "high": np.asarray(h, dtype=np.float64),
+                "low": np.asarray(l, dtype=np.float64),
+                "close": np.asarray(c, dtype=np.float64),
+                "volume": np.asarray(v, dtype=np.float64),
+            })
+        else:
+            df = pd.DataFrame()
     else:
-        df = pd.DataFrame([
-            {
-                "timestamp": c.timestamp,
-                "open": float(c.open),
-                "high": float(c.high),
-                "low": float(c.low),
-                "close": float(c.close),
-                "volume": float(c.volume),
-            }
-            for c in candles
-        ])
+        df = pd.DataFrame({
+            "timestamp": [c.timestamp for c in candles],
+            "open": np.asarray([c.open for c in candles], dtype=np.float64),
+            "high": np.asarray([c.high for c in candles], dtype=np.float64),
+            "low": np.asarray([c.low for c in candles], dtype=np.float64),
+            "close": np.asarray([c.close for c in candles], dtype=np.float64),
+            "volume": np.asarray([c.volume for c in candles], dtype=np.float64),
+        })
     
     if df.empty:
-        print("ERROR: No data!")
-        return
+        return df
     
     df.set_index("timestamp", inplace=True)
     
-    print(f"Total candles: {len(df)}")
-    print(f"Actual date range: {df.index[0]} to {df.index[-1]}")
-    
     # Calculate indicators
     df["rsi"] = calculate_rsi(df, 14)
     macd_data = calculate_macd(df)
@@ -76,6 +79,23 @@ def test_backtest_date_range(symbol: str, start_date: str, end_date: str, timefr
     df["macd_signal"] = macd_data["macd_signal"]
     df["macd_hist"] = macd_data["macd_diff"]
     
+    return df
+
+def test_backtest_date_range(symbol: str, start_date: str, end_date: str, timeframe: str):
+    """Test a specific date range that fails in backtest."""
+    print(f"\n{'='*60}")
+    print(f"Testing {symbol} {timeframe} from {start_date} to {end_date}")
+    print(f"{'='*60}")
+    
+    df = _cached_indicators(symbol, timeframe, start_date, end_date)
+    
+    if df.empty:
+        print("ERROR: No data!")
+        return
+    
+    print(f"Total candles: {len(df)}")
+    print(f"Actual date range: {df.index[0]} to {df.index[-1]}")
+    
     # Check for NaN values
     print(f"\nNaN counts:")
     print(f"RSI: {df['rsi'].isna().sum()}")
@@ -100,11 +120,14 @@ def test_backtest_date_range(symbol: str, start_date: str, end_date: str, timefr
     print(f"RSI > 50: {(valid_df['rsi'] > 50).sum()} times")
     
     # Detect MACD crossovers
-    macd_above_signal = df["macd"] > df["macd_signal"]
-    macd_above_signal_prev = macd_above_signal.shift(1).fillna(False)
+    # Work on bool ndarrays: shift(1).fillna(False) would upcast to object dtype
+    macd_above_signal = (df["macd"] > df["macd_signal"]).to_numpy()
+    macd_above_signal_prev = np.empty_like(macd_above_signal)
+    macd_above_signal_prev[0] = False
+    macd_above_signal_prev[1:] = macd_above_signal[:-1]
     
-    macd_bullish_cross = (~macd_above_signal_prev) & macd_above_signal
-    macd_bearish_cross = macd_above_signal_prev & (~macd_above_signal)
+    macd_bullish_cross = pd.Series((~macd_above_signal_prev) & macd_above_signal, index=df.index)
+    macd_bearish_cross = pd.Series(macd_above_signal_prev & (~macd_above_signal), index=df.index)
     
     print(f"MACD bullish crossovers (total): {macd_bullish_cross.sum()}")
     print(f"MACD bearish crossovers (total): {macd_bearish_cross.sum()}")
@@ -117,32 +140,35 @@ def test_backtest_date_range(symbol: str, start_date: str, end_date: str, timefr
     print(f"BUY signals (MACD cross + RSI<50): {entries.sum()}")
     print(f"SELL signals (MACD cross + RSI>50): {exits.sum()}")
     
+    # Pull columns out once and index by position instead of df.loc per value
+    rsi_arr = df["rsi"].to_numpy()
+    macd_arr = df["macd"].to_numpy()
+    sig_arr = df["macd_signal"].to_numpy()
+    close_arr = df["close"].to_numpy()
+    
     if entries.sum() > 0:
         print(f"\nBUY signal dates:")
-        buy_dates = df.index[entries].tolist()
-        for date in buy_dates[:10]:  # Show first 10
-            rsi_val = df.loc[date, "rsi"]
-            macd_val = df.loc[date, "macd"]
-            signal_val = df.loc[date, "macd_signal"]
-            close_val = df.loc[date, "close"]
-            print(f"  {date}: RSI={rsi_val:.1f}, MACD={macd_val:.2f}, Signal={signal_val:.2f}, Close=${close_val:.2f}")
+        buy_positions = np.flatnonzero(entries.to_numpy())[:10]  # Show first 10
+        for pos in buy_positions:
+            print(f"  {df.index[pos]}: RSI={rsi_arr[pos]:.1f}, MACD={macd_arr[pos]:.2f}, Signal={sig_arr[pos]:.2f}, Close=${close_arr[pos]:.2f}")
     else:
         print("\n⚠️  NO BUY SIGNALS FOUND!")
         # Show some MACD crossovers without RSI filter
-        bullish_crosses = df.index[macd_bullish_cross].tolist()
-        if len(bullish_crosses) > 0:
+        cross_positions = np.flatnonzero(macd_bullish_cross.to_numpy())[:5]
+        if len(cross_positions) > 0:
             print(f"\nBullish MACD crossovers (without RSI filter):")
-            for date in bullish_crosses[:5]:
-                rsi_val = df.loc[date, "rsi"]
-                macd_val = df.loc[date, "macd"]
-                signal_val = df.loc[date, "macd_signal"]
-                print(f"  {date}: RSI={rsi_val:.1f} (filter requires <50), MACD={macd_val:.2f}, Signal={signal_val:.2f}")
-    
-    db.close()
+            for pos in cross_positions:
+                print(f"  {df.index[pos]}: RSI={rsi_arr[pos]:.1f} (filter requires <50), MACD={macd_arr[pos]:.2f}, Signal={sig_arr[pos]:.2f}")
 
 if __name__ == "__main__":
-    # Test the failing case
-    test_backtest_date_range("BTCUSDT", "2023-01-01", "2025-12-06", "1d")
+    # Share one session (and its pooled connection) across both runs
+    _db = SessionLocal()
     
-    # Also test the working case
-    test_backtest_date_range("BTCUSDT", "2022-01-01", "2025-12-06", "1d")
+    try:
+        # Test the failing case
+        test_backtest_date_range("BTCUSDT", "2023-01-01", "2025-12-06", "1d")
+        
+        # Also test the working case
+        test_backtest_date_range("BTCUSDT", "2022-01-01", "2025-12-06", "1d")
+    finally:
+        _db.close()
@@ -5,8 +5,10 @@ Tests the LangChain-based Researcher, Trader, and Risk Manager agents
 with LangChain's ReAct pattern and tool framework.
 """
 import asyncio
+import io
 import sys
 from pathlib import Path
+from types import MappingProxyType
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -15,189 +17,183 @@ from app.core.database import SessionLocal
 from app.langchain.agents import LangChainResearcher, LangChainTrader, LangChainRiskManager
 
 
-async def test_langchain_researcher():
-    """Test LangChain Researcher agent."""
-    print("\n" + "="*80)
-    print("TEST 1: LangChain Researcher Agent")
-    print("="*80)
-    
-    db = SessionLocal()
-    
-    try:
-        researcher = LangChainResearcher(db, max_iterations=3)
-        
-        print(f"\n📋 Agent: {researcher.name}")
-        print(f"   Tools: {len(researcher.tools)}")
-        tool_names = [t.name for t in researcher.tools]
-        print(f"   Tool Names: {tool_names}")
-        
-        # Create test context with conflicting analyst signals
-        context = {
-            "symbol": "BTCUSDT",
-            "current_price": 44500,
-            "technical_analysis": {
-                "recommendation": "strong_buy",
-                "confidence": 85,
-                "key_insight": "RSI oversold, MACD bullish crossover",
-                "top_signals": ["RSI: 28 (oversold)", "MACD: bullish crossover"]
-            },
-            "sentiment_analysis": {
-                "recommendation": "bearish",
-                "confidence": 70,
-                "key_insight": "Fear & Greed at 25 (extreme fear)",
-                "top_signals": ["Social sentiment: very bearish", "Fear & Greed: 25"]
-            },
-            "tokenomics_analysis": {
-                "recommendation": "hold",
-                "confidence": 60,
-                "key_insight": "Fairly valued fundamentals",
-                "top_signals": ["Supply: 95% circulating", "Market cap: mega"]
-            }
-        }
-        
-        print("\n🤖 Running LangChain Researcher with conflicting signals...")
-        print("   Technical: STRONG_BUY (85%)")
-        print("   Sentiment: BEARISH (70%)")
-        print("   Tokenomics: HOLD (60%)")
-        
-        result = await researcher.analyze(context)
-        
-        print(f"\n✅ Analysis Complete:")
-        print(f"   Iterations: {result['metadata'].get('iterations', 0)}")
-        print(f"   Tools Used: {result['metadata'].get('tools_used', [])}")
-        
-        analysis = result.get("analysis", {})
-        if isinstance(analysis, dict):
-            print(f"\n📊 INVESTMENT THESIS:")
-            print(f"   Direction: {analysis.get('direction', 'N/A')}")
-            print(f"   Conviction: {analysis.get('conviction', 0)}%")
-            print(f"   Thesis: {analysis.get('investment_thesis', 'N/A')}")
-            print(f"   Rationale: {analysis.get('primary_rationale', 'N/A')[:100]}...")
-        
-        print("\n✅ LangChain Researcher test passed!")
-        return True
-        
-    except Exception as e:
-        print(f"\n❌ LangChain Researcher test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-    finally:
-        db.close()
+# Test contexts, built once; each test takes a shallow copy
 
+# Conflicting analyst signals for the researcher
+RESEARCHER_CONTEXT = MappingProxyType({
+    "symbol": "BTCUSDT",
+    "current_price": 44500,
+    "technical_analysis": {
+        "recommendation": "strong_buy",
+        "confidence": 85,
+        "key_insight": "RSI oversold, MACD bullish crossover",
+        "top_signals": ["RSI: 28 (oversold)", "MACD: bullish crossover"]
+    },
+    "sentiment_analysis": {
+        "recommendation": "bearish",
+        "confidence": 70,
+        "key_insight": "Fear & Greed at 25 (extreme fear)",
+        "top_signals": ["Social sentiment: very bearish", "Fear & Greed: 25"]
+    },
+    "tokenomics_analysis": {
+        "recommendation": "hold",
+        "confidence": 60,
+        "key_insight": "Fairly valued fundamentals",
+        "top_signals": ["Supply: 95% circulating", "Market cap: mega"]
+    }
+})
 
-async def test_langchain_trader():
-    """Test LangChain Trader agent."""
-    print("\n" + "="*80)
-    print("TEST 2: LangChain Trader Agent")
-    print("="*80)
-    
-    db = SessionLocal()
+TRADER_CONTEXT = MappingProxyType({
+    "symbol": "BTCUSDT",
+    "current_price": 44500,
+    "research_thesis": {
+        "direction": "bullish",
+        "conviction": 78,
+        "investment_thesis": "Technical oversold conditions with contrarian sentiment signal",
+        "time_horizon": "short_term"
+    },
+    "available_cash": 10000
+})
+
+RISK_MANAGER_CONTEXT = MappingProxyType({
+    "symbol": "BTCUSDT",
+    "current_price": 44500,
+    "trade_proposal": {
+        "action": "buy",
+        "size": 2000,
+        "entry_price": 44500,
+        "stop_loss": 43600,
+        "take_profit": 46500
+    },
+    "available_cash": 10000,
+    "total_equity": 15000
+})
+
+
+def describe_researcher(agent, context, out):
+    """Print the researcher's tools and the conflicting analyst signals."""
+    tool_names = [t.name for t in agent.tools]
+    print(f"   Tool Names: {tool_names}", file=out)
     
-    try:
-        trader = LangChainTrader(db, max_iterations=3)
-        
-        print(f"\n📋 Agent: {trader.name}")
-        print(f"   Tools: {len(trader.tools)}")
-        
-        # Create test context
-        context = {
-            "symbol": "BTCUSDT",
-            "current_price": 44500,
-            "research_thesis": {
-                "direction": "bullish",
-                "conviction": 78,
-                "investment_thesis": "Technical oversold conditions with contrarian sentiment signal",
-                "time_horizon": "short_term"
-            },
-            "available_cash": 10000
-        }
-        
-        print("\n🤖 Running LangChain Trader with bullish thesis...")
-        print(f"   Conviction: 78%")
-        print(f"   Available Cash: ${context['available_cash']:,.2f}")
-        
-        result = await trader.analyze(context)
-        
-        print(f"\n✅ Analysis Complete:")
-        print(f"   Iterations: {result['metadata'].get('iterations', 0)}")
-        print(f"   Tools Used: {result['metadata'].get('tools_used', [])}")
-        
-        analysis = result.get("analysis", {})
-        if isinstance(analysis, dict):
-            print(f"\n📊 TRADE PROPOSAL:")
-            print(f"   Action: {analysis.get('action', 'N/A').upper()}")
-            print(f"   Size: ${analysis.get('size', 0):,.2f}")
-            print(f"   Entry: ${analysis.get('entry_price', 0):,.2f}")
-            print(f"   Stop Loss: ${analysis.get('stop_loss', 0):,.2f}")
-            print(f"   Take Profit: ${analysis.get('take_profit', 0):,.2f}")
-        
-        print("\n✅ LangChain Trader test passed!")
-        return True
-        
-    except Exception as e:
-        print(f"\n❌ LangChain Trader test failed: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-    finally:
-        db.close()
+    print("\n🤖 Running LangChain Researcher with conflicting signals...", file=out)
+    print("   Technical: STRONG_BUY (85%)", file=out)
+    print("   Sentiment: BEARISH (70%)", file=out)
+    print("   Tokenomics: HOLD (60%)", file=out)
 
 
-async def test_langchain_risk_manager():
-    """Test LangChain Risk Manager agent."""
-    print("\n" + "="*80)
-    print("TEST 3: LangChain Risk Manager Agent")
-    print("="*80)
+def describe_trader(agent, context, out):
+    """Print the trader's input thesis and cash."""
+    print("\n🤖 Running LangChain Trader with bullish thesis...", file=out)
+    print(f"   Conviction: 78%", file=out)
+    print(f"   Available Cash: ${context['available_cash']:,.2f}", file=out)
+
+
+def describe_risk_manager(agent, context, out):
+    """Print the trade under review."""
+    print("\n🤖 Running LangChain Risk Manager...", file=out)
+    print(f"   Proposed Trade: BUY ${context['trade_proposal']['size']:,.2f}", file=out)
+
+
+def render_thesis(analysis, out):
+    """Print a researcher investment thesis."""
+    print(f"\n📊 INVESTMENT THESIS:", file=out)
+    print(f"   Direction: {analysis.get('direction', 'N/A')}", file=out)
+    print(f"   Conviction: {analysis.get('conviction', 0)}%", file=out)
+    print(f"   Thesis: {analysis.get('investment_thesis', 'N/A')}", file=out)
+    print(f"   Rationale: {analysis.get('primary_rationale', 'N/A')[:100]}...", file=out)
+
+
+def render_trade_proposal(analysis, out):
+    """Print a trader proposal."""
+    print(f"\n📊 TRADE PROPOSAL:", file=out)
+    print(f"   Action: {analysis.get('action', 'N/A').upper()}", file=out)
+    print(f"   Size: ${analysis.get('size', 0):,.2f}", file=out)
+    print(f"   Entry: ${analysis.get('entry_price', 0):,.2f}", file=out)
+    print(f"   Stop Loss: ${analysis.get('stop_loss', 0):,.2f}", file=out)
+    print(f"   Take Profit: ${analysis.get('take_profit', 0):,.2f}", file=out)
+
+
+def render_risk_validation(analysis, out):
+    """Print a risk manager decision."""
+    print(f"\n📊 RISK VALIDATION:", file=out)
+    print(f"   Decision: {analysis.get('decision', 'N/A').upper()}", file=out)
+    print(f"   Reasoning: {analysis.get('reasoning', 'N/A')[:100]}...", file=out)
+
+
+# (name, agent factory, context, describe, render) for each agent under test
+AGENT_TESTS = [
+    (
+        "Researcher",
+        lambda db: LangChainResearcher(db, max_iterations=3, enable_prompt_cache=True, enable_parallel_tools=True),
+        RESEARCHER_CONTEXT,
+        describe_researcher,
+        render_thesis,
+    ),
+    (
+        "Trader",
+        lambda db: LangChainTrader(db, max_iterations=3, enable_prompt_cache=True),
+        TRADER_CONTEXT,
+        describe_trader,
+        render_trade_proposal,
+    ),
+    (
+        "Risk Manager",
+        lambda db: LangChainRiskManager(db, max_iterations=3, enable_prompt_cache=True),
+        RISK_MANAGER_CONTEXT,
+        describe_risk_manager,
+        render_risk_validation,
+    ),
+]
+
+
+async def run_agent_test(number, name, factory, context, describe, render):
+    """
+    Run one LangChain agent against its test context and print the result.
     
-    db = SessionLocal()
+    Output is buffered and written in one go so concurrently running tests
+    don't interleave their reports. Each test gets its own session: the
+    callback handler and sync tools touch it from executor threads.
+    """
+    out = io.StringIO()
+    print("\n" + "="*80, file=out)
+    print(f"TEST {number}: LangChain {name} Agent", file=out)
+    print("="*80, file=out)
     
+    db = SessionLocal()
     try:
-        risk_manager = LangChainRiskManager(db, max_iterations=3)
-        
-        print(f"\n📋 Agent: {risk_manager.name}")
-        print(f"   Tools: {len(risk_manager.tools)}")
+        agent = factory(db)
         
-        # Create test context
-        context = {
-            "symbol": "BTCUSDT",
-            "current_price": 44500,
-            "trade_proposal": {
-                "action": "buy",
-                "size": 2000,
-                "entry_price": 44500,
-                "stop_loss": 43600,
-                "take_profit": 46500
-            },
-            "available_cash": 10000,
-            "total_equity": 15000
-        }
+        print(f"\n📋 Agent: {agent.name}", file=out)
+        print(f"   Tools: {len(agent.tools)}", file=out)
         
-        print("\n🤖 Running LangChain Risk Manager...")
-        print(f"   Proposed Trade: BUY ${context['trade_proposal']['size']:,.2f}")
+        context = dict(context)
+        describe(agent, context, out)
         
-        result = await risk_manager.analyze(context)
+        result = await agent.analyze(context)
+        metadata = result["metadata"]
         
-        print(f"\n✅ Analysis Complete:")
-        print(f"   Iterations: {result['metadata'].get('iterations', 0)}")
-        print(f"   Tools Used: {result['metadata'].get('tools_used', [])}")
+        print(f"\n✅ Analysis Complete:", file=out)
+        print(f"   Iterations: {metadata.get('iterations', 0)}", file=out)
+        print(f"   Tools Used: {metadata.get('tools_used', [])}", file=out)
+        if "cache_read_tokens" in metadata:
+            print(f"   Cached Prompt Tokens: {metadata['cache_read_tokens']}", file=out)
         
         analysis = result.get("analysis", {})
         if isinstance(analysis, dict):
-            print(f"\n📊 RISK VALIDATION:")
-            print(f"   Decision: {analysis.get('decision', 'N/A').upper()}")
-            print(f"   Reasoning: {analysis.get('reasoning', 'N/A')[:100]}...")
+            render(analysis, out)
         
-        print("\n✅ LangChain Risk Manager test passed!")
+        print(f"\n✅ LangChain {name} test passed!", file=out)
         return True
         
     except Exception as e:
-        print(f"\n❌ LangChain Risk Manager test failed: {e}")
+        print(f"\n❌ LangChain {name} test failed: {e}", file=out)
         import traceback
-        traceback.print_exc()
+        traceback.print_exc(file=out)
         return False
     finally:
         db.close()
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
 
 
 async def main():
@@ -207,24 +203,21 @@ async def main():
     print("Testing LangChain's ReAct pattern with tool framework")
     print("="*80)
     
-    # Test 1: Researcher
-    test1_passed = await test_langchain_researcher()
-    
-    # Test 2: Trader
-    test2_passed = await test_langchain_trader()
-    
-    # Test 3: Risk Manager
-    test3_passed = await test_langchain_risk_manager()
+    # Agents are independent and I/O-bound, so run the LLM round-trips concurrently
+    results = await asyncio.gather(
+        *(run_agent_test(number, *test) for number, test in enumerate(AGENT_TESTS, 1)),
+        return_exceptions=True
+    )
+    passed = [r is True for r in results]
     
     # Summary
     print("\n" + "="*80)
     print("TEST SUMMARY")
     print("="*80)
-    print(f"LangChain Researcher: {'✅ PASSED' if test1_passed else '❌ FAILED'}")
-    print(f"LangChain Trader: {'✅ PASSED' if test2_passed else '❌ FAILED'}")
-    print(f"LangChain Risk Manager: {'✅ PASSED' if test3_passed else '❌ FAILED'}")
+    for (name, *_), ok in zip(AGENT_TESTS, passed):
+        print(f"LangChain {name}: {'✅ PASSED' if ok else '❌ FAILED'}")
     
-    all_passed = test1_passed and test2_passed and test3_passed
+    all_passed = all(passed)
     print(f"\nOverall: {'✅ ALL TESTS PASSED' if all_passed else '❌ SOME TESTS FAILED'}")
     
     print("\n💡 Key Features:")
@@ -232,6 +225,8 @@ async def main():
     print("  ✅ LangChain StructuredTool for type-safe tool calling")
     print("  ✅ DatabaseCallbackHandler for observability")
     print("  ✅ AgentExecutor with max_iterations control")
+    print("  ✅ Provider prompt caching on static system prompts")
+    print("  ✅ Parallel execution of independent tool calls")
     print("  ✅ Full integration with existing services (Binance, Portfolio)")
     print("  ✅ Maintains reasoning trace and tool usage")
 
@@ -7,6 +7,8 @@ Tests:
 3. Comparison with Instructor-only approach
 """
 import asyncio
+import chromadb
+from chromadb.config import Settings as ChromaSettings
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -79,10 +81,10 @@ def test_rag_knowledge_base():
     print("TEST 2: RAG Knowledge Base (ChromaDB)")
     print("=" * 60)
     
-    # Initialize knowledge base
+    # Initialize knowledge base in memory; nothing needs to survive the run
     kb = MarketKnowledgeBase(
-        persist_directory="./test_chromadb",
         collection_name="test_insights",
+        chroma_client=chromadb.Client(ChromaSettings(is_persistent=False)),
     )
     
     print("\n📚 Initializing ChromaDB knowledge base...")
@@ -90,43 +92,47 @@ def test_rag_knowledge_base():
     # Add some sample analyses
     print("\n➕ Adding sample analyses...")
     
-    kb.add_analysis(
-        symbol="BTCUSDT",
-        agent_name="technical",
-        analysis={
-            "trend": "bullish",
-            "recommendation": "buy",
-            "confidence": 80,
-            "reasoning": "Strong uptrend with RSI at 65, MACD golden cross",
-            "key_observations": [
-                "Price above all EMAs",
-                "Volume confirming uptrend",
-                "Resistance at $92k"
-            ],
-            "risk_factors": ["Overbought RSI", "Low volume"]
-        }
-    )
-    
-    kb.add_analysis(
-        symbol="ETHUSDT",
-        agent_name="sentiment",
-        analysis={
-            "overall_sentiment": "neutral",
-            "recommendation": "hold",
-            "confidence": 60,
-            "reasoning": "Mixed signals from social and news",
-            "key_observations": ["Fear & Greed at 50", "Moderate volume"]
-        }
-    )
-    
-    kb.add_trade_outcome(
-        symbol="BTCUSDT",
-        action="buy",
-        entry_price=90000,
-        exit_price=92000,
-        pnl=2000,
-        reasoning="Bought on technical breakout with strong volume confirmation"
-    )
+    # One embeddings request and one Chroma write for all three documents
+    kb.add_many([
+        {
+            "type": "analysis",
+            "symbol": "BTCUSDT",
+            "agent_name": "technical",
+            "analysis": {
+                "trend": "bullish",
+                "recommendation": "buy",
+                "confidence": 80,
+                "reasoning": "Strong uptrend with RSI at 65, MACD golden cross",
+                "key_observations": [
+                    "Price above all EMAs",
+                    "Volume confirming uptrend",
+                    "Resistance at $92k"
+                ],
+                "risk_factors": ["Overbought RSI", "Low volume"]
+            }
+        },
+        {
+            "type": "analysis",
+            "symbol": "ETHUSDT",
+            "agent_name": "sentiment",
+            "analysis": {
+                "overall_sentiment": "neutral",
+                "recommendation": "hold",
+                "confidence": 60,
+                "reasoning": "Mixed signals from social and news",
+                "key_observations": ["Fear & Greed at 50", "Moderate volume"]
+            }
+        },
+        {
+            "type": "trade_outcome",
+            "symbol": "BTCUSDT",
+            "action": "buy",
+            "entry_price": 90000,
+            "exit_price": 92000,
+            "pnl": 2000,
+            "reasoning": "Bought on technical breakout with strong volume confirmation"
+        },
+    ])
     
     print("✅ Added 3 documents to knowledge base")
     
@@ -1,67 +1,133 @@
 """
 Debug script to test signal generation for LONG timeframes (4h, 1d).
 """
+import hashlib
+import io
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import datetime, timedelta
+from pathlib import Path
 from app.services.binance import BinanceService
 from app.services.indicators import calculate_rsi, calculate_macd, calculate_ema, calculate_bollinger_bands
+from app.services.indicators_numba import timeframe_stats
 from app.core.config import settings
 
-def test_timeframe(interval: str, days_back: int = 365):
-    """Test signal generation for a specific timeframe."""
-    print(f"\n{'='*60}")
-    print(f"Testing {interval} timeframe")
-    print(f"{'='*60}")
+
+CACHE_DIR = Path(".cache")
+
+
+def load_klines(symbol: str, interval: str, start_time: int, end_time: int) -> pd.DataFrame:
+    """
+    Load OHLCV candles, using a local on-disk cache keyed by start day.
+    
+    Args:
+        symbol: Trading pair symbol
+        interval: Kline interval
+        start_time: Start timestamp in milliseconds
+        end_time: End timestamp in milliseconds
+    
+    Returns:
+        DataFrame indexed by timestamp
+    """
+    path = CACHE_DIR / f"{symbol}_{interval}_{start_time // 86400000}.pkl"
+    if path.exists():
+        return pd.read_pickle(path)
     
-    # Fetch data
     binance = BinanceService()
-    end_time = int(datetime.now().timestamp() * 1000)
-    start_time = end_time - (days_back * 24 * 60 * 60 * 1000)
-    
-    klines = binance.fetch_klines_sync(
-        symbol="BTCUSDT",
+    raw = binance.fetch_klines_numpy(
+        symbol=symbol,
         interval=interval,
         start_time=start_time,
         end_time=end_time,
         limit=1000
     )
     
-    df = pd.DataFrame([
-        {
-            "timestamp": datetime.fromtimestamp(k[0] / 1000),
-            "open": float(k[1]),
-            "high": float(k[2]),
-            "low": float(k[3]),
-            "close": float(k[4]),
-            "volume": float(k[5]),
-        }
-        for k in klines
-    ])
+    df = pd.DataFrame(
+        raw[:, 1:6],
+        index=pd.to_datetime(raw[:, 0].astype(np.int64), unit="ms").rename("timestamp"),
+        columns=["open", "high", "low", "close", "volume"]
+    )
     
-    df.set_index("timestamp", inplace=True)
+    CACHE_DIR.mkdir(exist_ok=True)
+    df.to_pickle(path)
+    return df
+
+
+def compute_all_indicators(df: pd.DataFrame) -> dict:
+    """
+    Compute every indicator used by the strategy checks.
     
-    print(f"Data points: {len(df)}")
-    print(f"Date range: {df.index[0]} to {df.index[-1]}")
+    Args:
+        df: OHLCV DataFrame
     
-    # Calculate indicators
-    df["rsi"] = calculate_rsi(df, 14)
+    Returns:
+        Dict of column name to ndarray, in DataFrame column order
+    """
     macd_data = calculate_macd(df)
-    df["macd"] = macd_data["macd"]
-    df["macd_signal"] = macd_data["macd_signal"]
-    df["macd_hist"] = macd_data["macd_diff"]
+    bb_data = calculate_bollinger_bands(df)
+    columns = {
+        "rsi": calculate_rsi(df, 14),
+        "macd": macd_data["macd"],
+        "macd_signal": macd_data["macd_signal"],
+        "macd_hist": macd_data["macd_diff"],
+        "ema_fast": calculate_ema(df, settings.ema_fast),
+        "ema_slow": calculate_ema(df, settings.ema_slow),
+        "ema_trend": calculate_ema(df, settings.ema_trend),
+        "bb_upper": bb_data["bb_high"],
+        "bb_middle": bb_data["bb_mid"],
+        "bb_lower": bb_data["bb_low"],
+        "volume_ma": df["volume"].rolling(window=settings.bb_period).mean(),
+    }
+    return {name: np.asarray(values, dtype=np.float64) for name, values in columns.items()}
+
+
+def load_indicators(df: pd.DataFrame) -> dict:
+    """
+    Load indicator columns from the on-disk cache, computing them on a miss.
+    
+    The cache key hashes the close/volume data together with the indicator
+    settings, so changing either invalidates the entry.
+    
+    Args:
+        df: OHLCV DataFrame
+    
+    Returns:
+        Dict of column name to ndarray
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(df["close"].to_numpy().tobytes())
+    digest.update(df["volume"].to_numpy().tobytes())
+    digest.update(repr((settings.ema_fast, settings.ema_slow, settings.ema_trend, settings.bb_period)).encode())
+    
+    path = CACHE_DIR / "indicators" / f"{digest.hexdigest()}.pkl"
+    if path.exists():
+        return pd.read_pickle(path)
+    
+    columns = compute_all_indicators(df)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pd.to_pickle(columns, path)
+    return columns
+
+
+def test_timeframe(interval: str, days_back: int = 365):
+    """Test signal generation for a specific timeframe."""
+    print(f"\n{'='*60}")
+    print(f"Testing {interval} timeframe")
+    print(f"{'='*60}")
+    
+    # Fetch data
+    end_time = int(datetime.now().timestamp() * 1000)
+    start_time = end_time - (days_back * 24 * 60 * 60 * 1000)
     
-    # EMAs
-    df["ema_fast"] = calculate_ema(df, settings.ema_fast)
-    df["ema_slow"] = calculate_ema(df, settings.ema_slow)
-    df["ema_trend"] = calculate_ema(df, settings.ema_trend)
+    df = load_klines("BTCUSDT", interval, start_time, end_time)
     
-    # Bollinger Bands
-    bb_data = calculate_bollinger_bands(df)
-    df["bb_upper"] = bb_data["bb_high"]
-    df["bb_middle"] = bb_data["bb_mid"]
-    df["bb_lower"] = bb_data["bb_low"]
-    df["volume_ma"] = df["volume"].rolling(window=settings.bb_period).mean()
+    print(f"Data points: {len(df)}")
+    print(f"Date range: {df.index[0]} to {df.index[-1]}")
+    
+    # Calculate indicators (cached on disk by input data and settings)
+    df = df.assign(**load_indicators(df))
     
     # Test RSI/MACD Strategy
     print(f"\n--- RSI/MACD Strategy ---")
@@ -71,41 +137,39 @@ def test_timeframe(interval: str, days_back: int = 365):
     print(f"RSI < 50: {(df['rsi'] < 50).sum()} times")
     print(f"RSI > 50: {(df['rsi'] > 50).sum()} times")
     
-    # Detect MACD crossovers
-    macd_above_signal = df["macd"] > df["macd_signal"]
-    macd_above_signal_prev = macd_above_signal.shift(1).fillna(False)
-    
-    macd_bullish_cross = (~macd_above_signal_prev) & macd_above_signal
-    macd_bearish_cross = macd_above_signal_prev & (~macd_above_signal)
-    
-    print(f"MACD bullish crossovers: {macd_bullish_cross.sum()}")
-    print(f"MACD bearish crossovers: {macd_bearish_cross.sum()}")
-    
-    # Current strategy signals
-    rsi_valid = df["rsi"].notna()
-    entries = macd_bullish_cross & (df["rsi"] < 50) & rsi_valid
-    exits = macd_bearish_cross & (df["rsi"] > 50) & rsi_valid
+    # Crossovers and signal counts for both strategies in one compiled pass
+    close = df["close"].to_numpy()
+    bb_lower = df["bb_lower"].to_numpy()
+    bb_upper = df["bb_upper"].to_numpy()
+    (
+        n_bull, n_bear, n_entries, n_exits, n_bb_entries, n_bb_exits, entries
+    ) = timeframe_stats(
+        df["macd"].to_numpy(), df["macd_signal"].to_numpy(), df["rsi"].to_numpy(),
+        close, bb_lower, bb_upper, df["volume"].to_numpy(), df["volume_ma"].to_numpy(),
+        settings.volume_surge_threshold
+    )
     
-    print(f"BUY signals (MACD cross + RSI<50): {entries.sum()}")
-    print(f"SELL signals (MACD cross + RSI>50): {exits.sum()}")
+    print(f"MACD bullish crossovers: {n_bull}")
+    print(f"MACD bearish crossovers: {n_bear}")
+    print(f"BUY signals (MACD cross + RSI<50): {n_entries}")
+    print(f"SELL signals (MACD cross + RSI>50): {n_exits}")
     
-    if entries.sum() > 0:
+    if n_entries > 0:
         print(f"Example BUY signals:")
-        buy_dates = df.index[entries].tolist()[:5]
-        for date in buy_dates:
-            rsi_val = df.loc[date, "rsi"]
-            macd_val = df.loc[date, "macd"]
-            signal_val = df.loc[date, "macd_signal"]
+        buy_rows = df.loc[entries, ["rsi", "macd", "macd_signal"]].head(5)
+        for date, rsi_val, macd_val, signal_val in buy_rows.itertuples(index=True, name=None):
             print(f"  {date}: RSI={rsi_val:.1f}, MACD={macd_val:.2f}, Signal={signal_val:.2f}")
     
     # Test EMA Crossover Strategy
     print(f"\n--- EMA Crossover Strategy ---")
-    fast_above_slow = df["ema_fast"] > df["ema_slow"]
-    fast_above_slow_prev = fast_above_slow.shift(1).fillna(False)
+    fast_above_slow = df["ema_fast"].to_numpy() > df["ema_slow"].to_numpy()
+    fast_above_slow_prev = np.empty_like(fast_above_slow)
+    fast_above_slow_prev[0] = False
+    fast_above_slow_prev[1:] = fast_above_slow[:-1]
     
     ema_entries = (
         (~fast_above_slow_prev) & fast_above_slow &
-        (df["close"] > df["ema_trend"])
+        (df["close"].to_numpy() > df["ema_trend"].to_numpy())
     )
     ema_exits = fast_above_slow_prev & (~fast_above_slow)
     
@@ -114,29 +178,27 @@ def test_timeframe(interval: str, days_back: int = 365):
     
     # Test BB + Volume Strategy
     print(f"\n--- Bollinger Bands + Volume Strategy ---")
-    volume_ratio = (df["volume"] / df["volume_ma"]).fillna(0)
-    bb_valid = df["bb_lower"].notna() & df["bb_upper"].notna()
-    
-    print(f"Volume > 1.5x MA: {(volume_ratio >= 1.5).sum()} times")
-    print(f"Price at lower BB: {(df['close'] <= df['bb_lower']).sum()} times")
-    print(f"Price at upper BB: {(df['close'] >= df['bb_upper']).sum()} times")
-    
-    bb_entries = (
-        (df["close"] <= df["bb_lower"]) &
-        (volume_ratio >= settings.volume_surge_threshold) &
-        bb_valid
-    )
-    bb_exits = (
-        (df["close"] >= df["bb_upper"]) &
-        (volume_ratio >= settings.volume_surge_threshold) &
-        bb_valid
-    )
-    
-    print(f"BUY signals (price≤lower BB + volume surge): {bb_entries.sum()}")
-    print(f"SELL signals (price≥upper BB + volume surge): {bb_exits.sum()}")
+    # NaN ratios (volume MA warm-up) compare False, same as filling with 0
+    volume_ratio = df["volume"].to_numpy() / df["volume_ma"].to_numpy()
+    
+    print(f"Volume > 1.5x MA: {np.count_nonzero(volume_ratio >= 1.5)} times")
+    print(f"Price at lower BB: {np.count_nonzero(close <= bb_lower)} times")
+    print(f"Price at upper BB: {np.count_nonzero(close >= bb_upper)} times")
+    print(f"BUY signals (price≤lower BB + volume surge): {n_bb_entries}")
+    print(f"SELL signals (price≥upper BB + volume surge): {n_bb_exits}")
+
+
+def _run(args) -> str:
+    """Run one timeframe test in a worker process and return its output."""
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        test_timeframe(*args)
+    return buf.getvalue()
+
 
 if __name__ == "__main__":
-    # Test different timeframes
-    test_timeframe("1h", days_back=90)
-    test_timeframe("4h", days_back=365)
-    test_timeframe("1d", days_back=1095)  # 3 years
+    # Test different timeframes in parallel; output is printed in order
+    timeframes = [("1h", 90), ("4h", 365), ("1d", 1095)]  # 1d covers 3 years
+    with ProcessPoolExecutor(max_workers=3) as executor:
+        for output in executor.map(_run, timeframes):
+            print(output, end="")
@@ -5,11 +5,16 @@ Tests the new Researcher, Trader, and Risk Manager ReAct agents
 with tool-calling capabilities.
 """
 import asyncio
+import io
+import logging
+import os
 import sys
-from pathlib import Path
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent))
+# Reuse cached LLM responses across reruns of this script (set LLM_CACHE=0 to disable)
+os.environ.setdefault("LLM_CACHE", "1")
 
 from app.core.database import SessionLocal
 from app.agents.researcher_react import ResearcherReAct
@@ -18,21 +23,103 @@ from app.agents.risk_manager_react import RiskManagerReAct
 from app.agents.llm_client import LLMClient
 
 
-async def test_researcher_react():
-    """Test Researcher ReAct agent."""
-    print("\n" + "="*80)
-    print("TEST 1: Researcher ReAct Agent")
-    print("="*80)
+# Output goes through a logger so that REACT_LOG_LEVEL=ERROR skips formatting entirely
+logging.basicConfig(stream=sys.stdout, format="%(message)s")
+log = logging.getLogger("react_tests")
+log.setLevel(os.getenv("REACT_LOG_LEVEL", "INFO"))
+
+
+@contextmanager
+def buffered_log(name):
+    """Collect one test's log output and write it to stdout in a single call."""
+    buffer = io.StringIO()
+    handler = logging.StreamHandler(buffer)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    test_log = log.getChild(name)
+    test_log.addHandler(handler)
+    test_log.propagate = False
+    try:
+        yield test_log
+    finally:
+        test_log.removeHandler(handler)
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
+
+
+class usd:
+    """Dollar amount formatted with thousands separators only when a log record is emitted."""
+    __slots__ = ("value",)
     
-    db = SessionLocal()
+    def __init__(self, value):
+        self.value = value
+    
+    def __str__(self):
+        return f"${self.value:,.2f}"
+
+
+def stream_token(chunk: str):
+    """Echo LLM output to the console as it streams in."""
+    sys.stdout.write(chunk)
+    sys.stdout.flush()
+
+
+# Pass --stream to watch each agent's LLM output live (agents then run one at a time)
+ON_TOKEN = stream_token if "--stream" in sys.argv else None
+
+
+@dataclass(slots=True)
+class ResearchThesis:
+    """Researcher fields shown in the test output."""
+    direction: str = 'N/A'
+    conviction: float = 0
+    investment_thesis: str = 'N/A'
+    primary_rationale: str = 'N/A'
+    time_horizon: str = 'N/A'
+    key_conflicts_resolved: str = ''
+    additional_research_conducted: str = ''
+
+
+@dataclass(slots=True)
+class TradeProposal:
+    """Trader fields shown in the test output."""
+    action: str = 'N/A'
+    size: float = 0
+    entry_price: float = 0
+    stop_loss: float = 0
+    take_profit: float = 0
+    risk_reward_ratio: float = 0
+    execution_strategy: str = 'N/A'
+    conviction: float = 0
+    market_conditions: str = ''
+    tools_used: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class RiskValidation:
+    """Risk Manager fields shown in the test output."""
+    decision: str = 'N/A'
+    reasoning: str = 'N/A'
+    risk_checks_performed: List[str] = field(default_factory=list)
+    violations_found: List[str] = field(default_factory=list)
+    final_trade: Dict[str, Any] = field(default_factory=dict)
+    risk_metrics: Dict[str, Any] = field(default_factory=dict)
+
+
+def parse_analysis(cls, analysis: Dict[str, Any]):
+    """Read the fields of cls from an agent's analysis dict once, ignoring extra keys."""
+    return cls(**{k: analysis[k] for k in cls.__dataclass_fields__ if k in analysis})
+
+
+async def test_researcher_react(researcher, log=log):
+    """Test Researcher ReAct agent."""
+    log.info("\n" + "="*80)
+    log.info("TEST 1: Researcher ReAct Agent")
+    log.info("="*80)
     
     try:
-        llm_client = LLMClient(db)
-        researcher = ResearcherReAct(db, llm_client, max_iterations=3)
-        
-        print(f"\n📋 Agent: {researcher.name}")
-        print(f"   Role: {researcher.role}")
-        print(f"   Available Tools: {list(researcher.tools.keys())}")
+        log.info("\n📋 Agent: %s", researcher.name)
+        log.info("   Role: %s", researcher.role)
+        log.info("   Available Tools: %s", list(researcher.tools.keys()))
         
         # Create test context with conflicting analyst signals
         context = {
@@ -58,74 +145,66 @@ async def test_researcher_react():
             }
         }
         
-        print("\n🤖 Running Researcher with conflicting signals...")
-        print("   Technical: STRONG_BUY (85%)")
-        print("   Sentiment: BEARISH (70%)")
-        print("   Tokenomics: HOLD (60%)")
+        log.info("\n🤖 Running Researcher with conflicting signals...")
+        log.info("   Technical: STRONG_BUY (85%)")
+        log.info("   Sentiment: BEARISH (70%)")
+        log.info("   Tokenomics: HOLD (60%)")
         
-        result = await researcher.analyze(context)
+        result = await researcher.analyze(context, on_token=ON_TOKEN)
         
-        print(f"\n✅ Analysis Complete:")
-        print(f"   Iterations: {result['metadata'].get('iterations', 0)}")
+        log.info("\n✅ Analysis Complete:")
+        log.info("   Iterations: %s", result['metadata'].get('iterations', 0))
         
         analysis = result.get("analysis", {})
         if isinstance(analysis, dict):
-            print(f"\n📊 INVESTMENT THESIS:")
-            print(f"   Direction: {analysis.get('direction', 'N/A')}")
-            print(f"   Conviction: {analysis.get('conviction', 0)}%")
-            print(f"   Thesis: {analysis.get('investment_thesis', 'N/A')}")
-            print(f"   Primary Rationale: {analysis.get('primary_rationale', 'N/A')}")
-            print(f"   Time Horizon: {analysis.get('time_horizon', 'N/A')}")
+            thesis = parse_analysis(ResearchThesis, analysis)
+            log.info("\n📊 INVESTMENT THESIS:")
+            log.info("   Direction: %s", thesis.direction)
+            log.info("   Conviction: %s%%", thesis.conviction)
+            log.info("   Thesis: %s", thesis.investment_thesis)
+            log.info("   Primary Rationale: %s", thesis.primary_rationale)
+            log.info("   Time Horizon: %s", thesis.time_horizon)
             
-            if analysis.get('key_conflicts_resolved'):
-                print(f"\n🔍 Conflicts Resolved:")
-                print(f"   {analysis['key_conflicts_resolved']}")
+            if thesis.key_conflicts_resolved:
+                log.info("\n🔍 Conflicts Resolved:")
+                log.info("   %s", thesis.key_conflicts_resolved)
             
-            if analysis.get('additional_research_conducted'):
-                print(f"\n🔧 Additional Research:")
-                print(f"   {analysis['additional_research_conducted']}")
+            if thesis.additional_research_conducted:
+                log.info("\n🔧 Additional Research:")
+                log.info("   %s", thesis.additional_research_conducted)
         
         # Show ReAct history
         history = result['metadata'].get('history', [])
         if history:
-            print(f"\n📝 ReAct Trace ({len(history)} steps):")
+            log.info("\n📝 ReAct Trace (%s steps):", len(history))
             for i, step in enumerate(history[:6], 1):  # Show first 6 steps
                 step_type = step.get('type', 'unknown')
                 content = step.get('content', '')
                 if step_type == "thought":
-                    print(f"   {i}. Thought: {content[:80]}...")
+                    log.info("   %s. Thought: %.80s...", i, content)
                 elif step_type == "action":
-                    print(f"   {i}. Action: {content}")
+                    log.info("   %s. Action: %s", i, content)
                 elif step_type == "observation":
-                    print(f"   {i}. Observation: {content[:60]}...")
+                    log.info("   %s. Observation: %.60s...", i, content)
         
-        print("\n✅ Researcher ReAct test passed!")
+        log.info("\n✅ Researcher ReAct test passed!")
         return True
         
     except Exception as e:
-        print(f"\n❌ Researcher ReAct test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("\n❌ Researcher ReAct test failed: %s", e)
         return False
-    finally:
-        db.close()
 
 
-async def test_trader_react():
+async def test_trader_react(trader, log=log):
     """Test Trader ReAct agent."""
-    print("\n" + "="*80)
-    print("TEST 2: Trader ReAct Agent")
-    print("="*80)
-    
-    db = SessionLocal()
+    log.info("\n" + "="*80)
+    log.info("TEST 2: Trader ReAct Agent")
+    log.info("="*80)
     
     try:
-        llm_client = LLMClient(db)
-        trader = TraderReAct(db, llm_client, max_iterations=3)
-        
-        print(f"\n📋 Agent: {trader.name}")
-        print(f"   Role: {trader.role}")
-        print(f"   Available Tools: {list(trader.tools.keys())}")
+        log.info("\n📋 Agent: %s", trader.name)
+        log.info("   Role: %s", trader.role)
+        log.info("   Available Tools: %s", list(trader.tools.keys()))
         
         # Create test context
         context = {
@@ -140,61 +219,53 @@ async def test_trader_react():
             "available_cash": 10000
         }
         
-        print("\n🤖 Running Trader with bullish thesis...")
-        print(f"   Conviction: 78%")
-        print(f"   Available Cash: ${context['available_cash']:,.2f}")
+        log.info("\n🤖 Running Trader with bullish thesis...")
+        log.info("   Conviction: 78%")
+        log.info("   Available Cash: %s", usd(context['available_cash']))
         
-        result = await trader.analyze(context)
+        result = await trader.analyze(context, on_token=ON_TOKEN)
         
-        print(f"\n✅ Analysis Complete:")
-        print(f"   Iterations: {result['metadata'].get('iterations', 0)}")
+        log.info("\n✅ Analysis Complete:")
+        log.info("   Iterations: %s", result['metadata'].get('iterations', 0))
         
         analysis = result.get("analysis", {})
         if isinstance(analysis, dict):
-            print(f"\n📊 TRADE PROPOSAL:")
-            print(f"   Action: {analysis.get('action', 'N/A').upper()}")
-            print(f"   Size: ${analysis.get('size', 0):,.2f}")
-            print(f"   Entry Price: ${analysis.get('entry_price', 0):,.2f}")
-            print(f"   Stop Loss: ${analysis.get('stop_loss', 0):,.2f}")
-            print(f"   Take Profit: ${analysis.get('take_profit', 0):,.2f}")
-            print(f"   Risk-Reward: {analysis.get('risk_reward_ratio', 0):.2f}")
-            print(f"   Execution: {analysis.get('execution_strategy', 'N/A')}")
-            print(f"   Conviction: {analysis.get('conviction', 0)}%")
+            proposal = parse_analysis(TradeProposal, analysis)
+            log.info("\n📊 TRADE PROPOSAL:")
+            log.info("   Action: %s", proposal.action.upper())
+            log.info("   Size: %s", usd(proposal.size))
+            log.info("   Entry Price: %s", usd(proposal.entry_price))
+            log.info("   Stop Loss: %s", usd(proposal.stop_loss))
+            log.info("   Take Profit: %s", usd(proposal.take_profit))
+            log.info("   Risk-Reward: %.2f", proposal.risk_reward_ratio)
+            log.info("   Execution: %s", proposal.execution_strategy)
+            log.info("   Conviction: %s%%", proposal.conviction)
             
-            if analysis.get('market_conditions'):
-                print(f"\n💹 Market Conditions:")
-                print(f"   {analysis['market_conditions'][:150]}...")
+            if proposal.market_conditions:
+                log.info("\n💹 Market Conditions:")
+                log.info("   %.150s...", proposal.market_conditions)
             
-            if analysis.get('tools_used'):
-                print(f"\n🔧 Tools Used: {', '.join(analysis['tools_used'])}")
+            if proposal.tools_used:
+                log.info("\n🔧 Tools Used: %s", ', '.join(proposal.tools_used))
         
-        print("\n✅ Trader ReAct test passed!")
+        log.info("\n✅ Trader ReAct test passed!")
         return True
         
     except Exception as e:
-        print(f"\n❌ Trader ReAct test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("\n❌ Trader ReAct test failed: %s", e)
         return False
-    finally:
-        db.close()
 
 
-async def test_risk_manager_react():
+async def test_risk_manager_react(risk_manager, log=log):
     """Test Risk Manager ReAct agent."""
-    print("\n" + "="*80)
-    print("TEST 3: Risk Manager ReAct Agent")
-    print("="*80)
-    
-    db = SessionLocal()
+    log.info("\n" + "="*80)
+    log.info("TEST 3: Risk Manager ReAct Agent")
+    log.info("="*80)
     
     try:
-        llm_client = LLMClient(db)
-        risk_manager = RiskManagerReAct(db, llm_client, max_iterations=3)
-        
-        print(f"\n📋 Agent: {risk_manager.name}")
-        print(f"   Role: {risk_manager.role}")
-        print(f"   Available Tools: {list(risk_manager.tools.keys())}")
+        log.info("\n📋 Agent: %s", risk_manager.name)
+        log.info("   Role: %s", risk_manager.role)
+        log.info("   Available Tools: %s", list(risk_manager.tools.keys()))
         
         # Create test context
         context = {
@@ -212,93 +283,135 @@ async def test_risk_manager_react():
             "current_positions": []
         }
         
-        print("\n🤖 Running Risk Manager...")
-        print(f"   Proposed Trade: BUY ${context['trade_proposal']['size']:,.2f}")
-        print(f"   Entry: ${context['trade_proposal']['entry_price']:,.2f}")
-        print(f"   Stop Loss: ${context['trade_proposal']['stop_loss']:,.2f}")
-        print(f"   Take Profit: ${context['trade_proposal']['take_profit']:,.2f}")
+        log.info("\n🤖 Running Risk Manager...")
+        log.info("   Proposed Trade: BUY %s", usd(context['trade_proposal']['size']))
+        log.info("   Entry: %s", usd(context['trade_proposal']['entry_price']))
+        log.info("   Stop Loss: %s", usd(context['trade_proposal']['stop_loss']))
+        log.info("   Take Profit: %s", usd(context['trade_proposal']['take_profit']))
         
-        result = await risk_manager.analyze(context)
+        result = await risk_manager.analyze(context, on_token=ON_TOKEN)
         
-        print(f"\n✅ Analysis Complete:")
-        print(f"   Iterations: {result['metadata'].get('iterations', 0)}")
+        log.info("\n✅ Analysis Complete:")
+        log.info("   Iterations: %s", result['metadata'].get('iterations', 0))
         
         analysis = result.get("analysis", {})
         if isinstance(analysis, dict):
-            print(f"\n📊 RISK VALIDATION:")
-            print(f"   Decision: {analysis.get('decision', 'N/A').upper()}")
-            print(f"   Reasoning: {analysis.get('reasoning', 'N/A')[:150]}...")
+            validation = parse_analysis(RiskValidation, analysis)
+            log.info("\n📊 RISK VALIDATION:")
+            log.info("   Decision: %s", validation.decision.upper())
+            log.info("   Reasoning: %.150s...", validation.reasoning)
             
-            checks = analysis.get('risk_checks_performed', [])
-            if checks:
-                print(f"\n✓ Risk Checks: {', '.join(checks)}")
+            if validation.risk_checks_performed:
+                log.info("\n✓ Risk Checks: %s", ', '.join(validation.risk_checks_performed))
             
-            violations = analysis.get('violations_found', [])
-            if violations:
-                print(f"\n⚠️  Violations: {', '.join(violations)}")
+            if validation.violations_found:
+                log.info("\n⚠️  Violations: %s", ', '.join(validation.violations_found))
             
-            final_trade = analysis.get('final_trade', {})
+            final_trade = validation.final_trade
             if final_trade:
-                print(f"\n💼 Final Trade:")
-                print(f"   Action: {final_trade.get('action', 'N/A').upper()}")
-                print(f"   Size: ${final_trade.get('size', 0):,.2f}")
+                log.info("\n💼 Final Trade:")
+                log.info("   Action: %s", final_trade.get('action', 'N/A').upper())
+                log.info("   Size: %s", usd(final_trade.get('size', 0)))
                 if final_trade.get('modifications_made'):
-                    print(f"   Modifications: {final_trade['modifications_made']}")
+                    log.info("   Modifications: %s", final_trade['modifications_made'])
             
-            risk_metrics = analysis.get('risk_metrics', {})
+            risk_metrics = validation.risk_metrics
             if risk_metrics:
-                print(f"\n📈 Risk Metrics:")
-                print(f"   Max Loss: ${risk_metrics.get('max_loss_dollars', 0):,.2f} ({risk_metrics.get('max_loss_portfolio_pct', 0):.1f}% of portfolio)")
-                print(f"   Risk-Reward: {risk_metrics.get('risk_reward_ratio', 0):.2f}")
-                print(f"   Position Size: {risk_metrics.get('position_size_pct', 0):.1f}%")
+                log.info("\n📈 Risk Metrics:")
+                log.info("   Max Loss: %s (%.1f%% of portfolio)", usd(risk_metrics.get('max_loss_dollars', 0)), risk_metrics.get('max_loss_portfolio_pct', 0))
+                log.info("   Risk-Reward: %.2f", risk_metrics.get('risk_reward_ratio', 0))
+                log.info("   Position Size: %.1f%%", risk_metrics.get('position_size_pct', 0))
         
-        print("\n✅ Risk Manager ReAct test passed!")
+        log.info("\n✅ Risk Manager ReAct test passed!")
         return True
         
     except Exception as e:
-        print(f"\n❌ Risk Manager ReAct test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("\n❌ Risk Manager ReAct test failed: %s", e)
         return False
-    finally:
-        db.close()
+
+
+class TestFailed(Exception):
+    """Raised when a test reports failure, so the TaskGroup cancels the rest."""
+
+
+async def run_or_fail(test, agent):
+    """Run one test with buffered output, turning a False result into TestFailed."""
+    with buffered_log(test.__name__) as test_log:
+        passed = await test(agent, test_log)
+    if not passed:
+        raise TestFailed(test.__name__)
+    return True
+
+
+def task_status(task):
+    """Map a finished test task to True (passed), False (failed) or None (cancelled)."""
+    if task.cancelled():
+        return None
+    return task.exception() is None
+
+
+STATUS_LABELS = {True: '✅ PASSED', False: '❌ FAILED', None: '⏭️  CANCELLED'}
 
 
 async def main():
     """Run all tests."""
-    print("\n🚀 ReAct Agents Test Suite")
-    print("="*80)
-    print("Testing Researcher, Trader, and Risk Manager with tool-calling capabilities")
-    print("="*80)
+    log.info("\n🚀 ReAct Agents Test Suite")
+    log.info("="*80)
+    log.info("Testing Researcher, Trader, and Risk Manager with tool-calling capabilities")
+    log.info("="*80)
     
-    # Test 1: Researcher
-    test1_passed = await test_researcher_react()
-    
-    # Test 2: Trader
-    test2_passed = await test_trader_react()
+    # One session and LLM client for the whole suite instead of one per test
+    db = SessionLocal()
+    llm_client = LLMClient(db)
     
-    # Test 3: Risk Manager
-    test3_passed = await test_risk_manager_react()
+    # The agents share the LLM client and DB, so the first failure most likely
+    # breaks the others too: stop early instead of paying for their LLM calls
+    try:
+        tests = (
+            (test_researcher_react, ResearcherReAct(db, llm_client, max_iterations=3)),
+            (test_trader_react, TraderReAct(db, llm_client, max_iterations=3)),
+            (test_risk_manager_react, RiskManagerReAct(db, llm_client, max_iterations=3)),
+        )
+        
+        if ON_TOKEN:
+            # Streamed output from concurrent agents would interleave, so run them in turn
+            results = [None] * len(tests)
+            for i, (test, agent) in enumerate(tests):
+                results[i] = await test(agent)
+                if not results[i]:
+                    break
+        else:
+            # Agents are independent and I/O-bound, so run the LLM round-trips concurrently
+            tasks = []
+            try:
+                async with asyncio.TaskGroup() as tg:
+                    tasks = [tg.create_task(run_or_fail(test, agent)) for test, agent in tests]
+            except* TestFailed:
+                log.info("\n⛔ A test failed, remaining tests were cancelled")
+            results = [task_status(task) for task in tasks]
+    finally:
+        db.close()
+    test1_passed, test2_passed, test3_passed = results
     
     # Summary
-    print("\n" + "="*80)
-    print("TEST SUMMARY")
-    print("="*80)
-    print(f"Researcher ReAct: {'✅ PASSED' if test1_passed else '❌ FAILED'}")
-    print(f"Trader ReAct: {'✅ PASSED' if test2_passed else '❌ FAILED'}")
-    print(f"Risk Manager ReAct: {'✅ PASSED' if test3_passed else '❌ FAILED'}")
+    log.info("\n" + "="*80)
+    log.info("TEST SUMMARY")
+    log.info("="*80)
+    log.info("Researcher ReAct: %s", STATUS_LABELS[test1_passed])
+    log.info("Trader ReAct: %s", STATUS_LABELS[test2_passed])
+    log.info("Risk Manager ReAct: %s", STATUS_LABELS[test3_passed])
     
     all_passed = test1_passed and test2_passed and test3_passed
-    print(f"\nOverall: {'✅ ALL TESTS PASSED' if all_passed else '❌ SOME TESTS FAILED'}")
+    log.info("\nOverall: %s", '✅ ALL TESTS PASSED' if all_passed else '❌ SOME TESTS FAILED')
     
-    print("\n💡 Key Features:")
-    print("  ✅ ReAct pattern: Thought → Action → Observation → Repeat")
-    print("  ✅ Dynamic tool calling based on reasoning")
-    print("  ✅ Researcher can fetch news, query analysts, get order book")
-    print("  ✅ Trader can analyze order book, check fills, optimize entry")
-    print("  ✅ Risk Manager can query portfolio, calculate VaR, simulate impact")
-    print("  ✅ Max 3 iterations per agent to control costs")
-    print("  ✅ Maintains full trace of reasoning and tool usage")
+    log.info("\n💡 Key Features:")
+    log.info("  ✅ ReAct pattern: Thought → Action → Observation → Repeat")
+    log.info("  ✅ Dynamic tool calling based on reasoning")
+    log.info("  ✅ Researcher can fetch news, query analysts, get order book")
+    log.info("  ✅ Trader can analyze order book, check fills, optimize entry")
+    log.info("  ✅ Risk Manager can query portfolio, calculate VaR, simulate impact")
+    log.info("  ✅ Max 3 iterations per agent to control costs")
+    log.info("  ✅ Maintains full trace of reasoning and tool usage")
 
 
 if __name__ == "__main__":
@@ -4,70 +4,106 @@ Comparison test: Classic Instructor agents vs ReAct agents.
 Runs the same analysis request through both pipelines and compares results.
 """
 import asyncio
+import logging
+import os
 import sys
-from pathlib import Path
-from datetime import datetime
+import time
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent))
+# Reuse cached LLM responses across reruns of this script (set LLM_CACHE=0 to disable)
+os.environ.setdefault("LLM_CACHE", "1")
 
+from sqlalchemy import text
+
+from app.core.config import settings
 from app.core.database import SessionLocal
 from app.agents.pipeline import AgentPipeline
 from app.agents.llm_client import LLMClient
 
 
-async def run_classic_analysis(symbol="BTCUSDT"):
-    """Run analysis with classic Instructor agents."""
-    print("\n" + "="*80)
-    print("🎯 CLASSIC ANALYSIS (Instructor-based agents)")
-    print("="*80)
+# Output goes through a logger so that REACT_LOG_LEVEL=ERROR skips formatting entirely
+logging.basicConfig(stream=sys.stdout, format="%(message)s")
+log = logging.getLogger("react_tests")
+log.setLevel(os.getenv("REACT_LOG_LEVEL", "INFO"))
+
+
+# Same inputs for both pipelines (read-only: the pipeline never mutates them)
+MARKET_DATA = {
+    "current_price": 44500,
+    "timeframe": "1h",
+    "candles": [],
+    "indicators": {},
+    "sentiment_data": {},
+    "token_data": {}
+}
+
+PORTFOLIO_DATA = {
+    "cash": 10000,
+    "equity": 10000,
+    "positions": []
+}
+
+
+class usd:
+    """Dollar amount formatted with thousands separators only when a log record is emitted."""
+    __slots__ = ("value",)
     
-    db = SessionLocal()
+    def __init__(self, value):
+        self.value = value
+    
+    def __str__(self):
+        return f"${self.value:,.2f}"
+
+
+async def warm_up(db, llm_client):
+    """
+    Open the DB connection and the LLM HTTP connection before anything is timed.
     
+    The LLM ping goes straight to the provider client so the response cache
+    can't short-circuit it.
+    """
+    db.execute(text("SELECT 1"))
     try:
-        llm_client = LLMClient(db)
-        pipeline = AgentPipeline(db, llm_client, use_react=False)
-        
-        market_data = {
-            "current_price": 44500,
-            "timeframe": "1h",
-            "candles": [],
-            "indicators": {},
-            "sentiment_data": {},
-            "token_data": {}
-        }
-        
-        portfolio_data = {
-            "cash": 10000,
-            "equity": 10000,
-            "positions": []
-        }
-        
-        print(f"\n📊 Market: {symbol} @ ${market_data['current_price']:,.2f}")
-        print(f"🤖 Mode: Classic (Instructor + Pydantic)")
+        await llm_client.async_client.chat.completions.create(
+            model=settings.cheap_model,
+            messages=[{"role": "user", "content": "ok"}],
+            max_tokens=1
+        )
+    except Exception as e:
+        log.warning("LLM warm-up failed (timings will include connection setup): %s", e)
+
+
+async def run_classic_analysis(pipeline, symbol="BTCUSDT"):
+    """Run analysis with classic Instructor agents."""
+    log.info("\n" + "="*80)
+    log.info("🎯 CLASSIC ANALYSIS (Instructor-based agents)")
+    log.info("="*80)
+    
+    try:
+        log.info("\n📊 Market: %s @ %s", symbol, usd(MARKET_DATA['current_price']))
+        log.info("🤖 Mode: Classic (Instructor + Pydantic)")
         
-        start_time = datetime.now()
-        result = await pipeline.arun(symbol, market_data, portfolio_data)
-        duration = (datetime.now() - start_time).total_seconds()
+        start = time.perf_counter()
+        result = await pipeline.arun(symbol, MARKET_DATA, PORTFOLIO_DATA)
+        duration = time.perf_counter() - start
         
-        print(f"\n⏱️  Execution Time: {duration:.2f}s")
+        log.info("\n⏱️  Execution Time: %.2fs", duration)
         
         # Show results
-        print(f"\n📈 Technical: {result['technical']['recommendation'].upper()} ({result['technical']['confidence']}%)")
-        print(f"💬 Sentiment: {result['sentiment']['recommendation'].upper()} ({result['sentiment']['confidence']}%)")
-        print(f"💎 Tokenomics: {result['tokenomics']['recommendation'].upper()} ({result['tokenomics']['confidence']}%)")
+        log.info("\n📈 Technical: %s (%s%%)", result['technical']['recommendation'].upper(), result['technical']['confidence'])
+        log.info("💬 Sentiment: %s (%s%%)", result['sentiment']['recommendation'].upper(), result['sentiment']['confidence'])
+        log.info("💎 Tokenomics: %s (%s%%)", result['tokenomics']['recommendation'].upper(), result['tokenomics']['confidence'])
         
         research = result.get('research', {})
-        print(f"\n🔍 Research: {research.get('direction', 'N/A').upper()} ({research.get('conviction', 0)}%)")
-        print(f"   Thesis: {research.get('investment_thesis', 'N/A')[:80]}...")
+        log.info("\n🔍 Research: %s (%s%%)", research.get('direction', 'N/A').upper(), research.get('conviction', 0))
+        log.info("   Thesis: %.80s...", research.get('investment_thesis', 'N/A'))
         
         trade = result.get('trade', {})
-        print(f"\n💰 Trade: {trade.get('action', 'N/A').upper()} ${trade.get('size', 0):,.2f}")
-        print(f"   Entry: ${trade.get('entry_price', 0):,.2f} | Stop: ${trade.get('stop_loss', 0):,.2f} | Target: ${trade.get('take_profit', 0):,.2f}")
+        log.info("\n💰 Trade: %s %s", trade.get('action', 'N/A').upper(), usd(trade.get('size', 0)))
+        log.info("   Entry: %s | Stop: %s | Target: %s", usd(trade.get('entry_price', 0)), usd(trade.get('stop_loss', 0)), usd(trade.get('take_profit', 0)))
         
         risk = result.get('risk', {})
-        print(f"\n🛡️  Risk: {risk.get('decision', 'N/A').upper()}")
-        print(f"   Reasoning: {risk.get('reasoning', 'N/A')[:80]}...")
+        log.info("\n🛡️  Risk: %s", risk.get('decision', 'N/A').upper())
+        log.info("   Reasoning: %.80s...", risk.get('reasoning', 'N/A'))
         
         return {
             "duration": duration,
@@ -75,87 +111,63 @@ async def run_classic_analysis(symbol="BTCUSDT"):
         }
         
     except Exception as e:
-        print(f"\n❌ Classic analysis failed: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("\n❌ Classic analysis failed: %s", e)
         return None
-    finally:
-        db.close()
 
 
-async def run_react_analysis(symbol="BTCUSDT"):
+async def run_react_analysis(pipeline, symbol="BTCUSDT"):
     """Run analysis with ReAct agents."""
-    print("\n" + "="*80)
-    print("🚀 REACT ANALYSIS (Reasoning + Acting agents)")
-    print("="*80)
-    
-    db = SessionLocal()
+    log.info("\n" + "="*80)
+    log.info("🚀 REACT ANALYSIS (Reasoning + Acting agents)")
+    log.info("="*80)
     
     try:
-        llm_client = LLMClient(db)
-        pipeline = AgentPipeline(db, llm_client, use_react=True)
-        
-        market_data = {
-            "current_price": 44500,
-            "timeframe": "1h",
-            "candles": [],
-            "indicators": {},
-            "sentiment_data": {},
-            "token_data": {}
-        }
+        log.info("\n📊 Market: %s @ %s", symbol, usd(MARKET_DATA['current_price']))
+        log.info("🤖 Mode: ReAct (Thought → Action → Observation)")
         
-        portfolio_data = {
-            "cash": 10000,
-            "equity": 10000,
-            "positions": []
-        }
+        start = time.perf_counter()
+        result = await pipeline.arun(symbol, MARKET_DATA, PORTFOLIO_DATA)
+        duration = time.perf_counter() - start
         
-        print(f"\n📊 Market: {symbol} @ ${market_data['current_price']:,.2f}")
-        print(f"🤖 Mode: ReAct (Thought → Action → Observation)")
-        
-        start_time = datetime.now()
-        result = await pipeline.arun(symbol, market_data, portfolio_data)
-        duration = (datetime.now() - start_time).total_seconds()
-        
-        print(f"\n⏱️  Execution Time: {duration:.2f}s")
+        log.info("\n⏱️  Execution Time: %.2fs", duration)
         
         # Show results
-        print(f"\n📈 Technical: {result['technical']['recommendation'].upper()} ({result['technical']['confidence']}%)")
-        print(f"💬 Sentiment: {result['sentiment']['recommendation'].upper()} ({result['sentiment']['confidence']}%)")
-        print(f"💎 Tokenomics: {result['tokenomics']['recommendation'].upper()} ({result['tokenomics']['confidence']}%)")
+        log.info("\n📈 Technical: %s (%s%%)", result['technical']['recommendation'].upper(), result['technical']['confidence'])
+        log.info("💬 Sentiment: %s (%s%%)", result['sentiment']['recommendation'].upper(), result['sentiment']['confidence'])
+        log.info("💎 Tokenomics: %s (%s%%)", result['tokenomics']['recommendation'].upper(), result['tokenomics']['confidence'])
         
         research = result.get('research', {})
         research_analysis = research.get('analysis', {}) if isinstance(research.get('analysis'), dict) else {}
         research_meta = research.get('metadata', {})
         
-        print(f"\n🔍 Research (ReAct): {research_analysis.get('direction', 'N/A').upper()} ({research_analysis.get('conviction', 0)}%)")
-        print(f"   Iterations: {research_meta.get('iterations', 0)}")
-        print(f"   Thesis: {research_analysis.get('investment_thesis', 'N/A')[:80]}...")
+        log.info("\n🔍 Research (ReAct): %s (%s%%)", research_analysis.get('direction', 'N/A').upper(), research_analysis.get('conviction', 0))
+        log.info("   Iterations: %s", research_meta.get('iterations', 0))
+        log.info("   Thesis: %.80s...", research_analysis.get('investment_thesis', 'N/A'))
         
         if research_analysis.get('additional_research_conducted'):
-            print(f"   🔧 Research Tools Used: {research_analysis['additional_research_conducted'][:60]}...")
+            log.info("   🔧 Research Tools Used: %.60s...", research_analysis['additional_research_conducted'])
         
         trade = result.get('trade', {})
         trade_analysis = trade.get('analysis', {}) if isinstance(trade.get('analysis'), dict) else {}
         trade_meta = trade.get('metadata', {})
         
-        print(f"\n💰 Trade (ReAct): {trade_analysis.get('action', 'N/A').upper()} ${trade_analysis.get('size', 0):,.2f}")
-        print(f"   Iterations: {trade_meta.get('iterations', 0)}")
-        print(f"   Entry: ${trade_analysis.get('entry_price', 0):,.2f} | Stop: ${trade_analysis.get('stop_loss', 0):,.2f} | Target: ${trade_analysis.get('take_profit', 0):,.2f}")
+        log.info("\n💰 Trade (ReAct): %s %s", trade_analysis.get('action', 'N/A').upper(), usd(trade_analysis.get('size', 0)))
+        log.info("   Iterations: %s", trade_meta.get('iterations', 0))
+        log.info("   Entry: %s | Stop: %s | Target: %s", usd(trade_analysis.get('entry_price', 0)), usd(trade_analysis.get('stop_loss', 0)), usd(trade_analysis.get('take_profit', 0)))
         
         if trade_analysis.get('tools_used'):
-            print(f"   🔧 Trading Tools Used: {', '.join(trade_analysis['tools_used'])}")
+            log.info("   🔧 Trading Tools Used: %s", ', '.join(trade_analysis['tools_used']))
         
         risk = result.get('risk', {})
         risk_analysis = risk.get('analysis', {}) if isinstance(risk.get('analysis'), dict) else {}
         risk_meta = risk.get('metadata', {})
         
-        print(f"\n🛡️  Risk (ReAct): {risk_analysis.get('decision', 'N/A').upper()}")
-        print(f"   Iterations: {risk_meta.get('iterations', 0)}")
-        print(f"   Reasoning: {risk_analysis.get('reasoning', 'N/A')[:80]}...")
+        log.info("\n🛡️  Risk (ReAct): %s", risk_analysis.get('decision', 'N/A').upper())
+        log.info("   Iterations: %s", risk_meta.get('iterations', 0))
+        log.info("   Reasoning: %.80s...", risk_analysis.get('reasoning', 'N/A'))
         
         if risk_analysis.get('risk_checks_performed'):
-            print(f"   ✓ Checks: {', '.join(risk_analysis['risk_checks_performed'])}")
+            log.info("   ✓ Checks: %s", ', '.join(risk_analysis['risk_checks_performed']))
         
         return {
             "duration": duration,
@@ -163,57 +175,66 @@ async def run_react_analysis(symbol="BTCUSDT"):
         }
         
     except Exception as e:
-        print(f"\n❌ ReAct analysis failed: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("\n❌ ReAct analysis failed: %s", e)
         return None
-    finally:
-        db.close()
 
 
 async def main():
     """Run comparison test."""
-    print("\n" + "="*80)
-    print("🔬 CLASSIC vs REACT COMPARISON TEST")
-    print("="*80)
-    print("Comparing decision quality, execution time, and tool usage")
-    print("="*80)
+    log.info("\n" + "="*80)
+    log.info("🔬 CLASSIC vs REACT COMPARISON TEST")
+    log.info("="*80)
+    log.info("Comparing decision quality, execution time, and tool usage")
+    log.info("="*80)
     
-    # Run classic analysis
-    classic_result = await run_classic_analysis()
+    # Build both pipelines up front on one session and LLM client
+    db = SessionLocal()
+    llm_client = LLMClient(db)
+    classic_pipeline = AgentPipeline(db, llm_client, use_react=False)
+    react_pipeline = AgentPipeline(db, llm_client, use_react=True)
     
-    # Run ReAct analysis
-    react_result = await run_react_analysis()
+    try:
+        # Pay connection setup once here so neither pipeline's timing includes it
+        await warm_up(db, llm_client)
+        
+        # The pipelines are independent, so run them side by side. Each prints its
+        # result block in one go after its run, so the output stays attributable.
+        classic_result, react_result = await asyncio.gather(
+            run_classic_analysis(classic_pipeline),
+            run_react_analysis(react_pipeline)
+        )
+    finally:
+        db.close()
     
     # Comparison summary
-    print("\n" + "="*80)
-    print("📊 COMPARISON SUMMARY")
-    print("="*80)
+    log.info("\n" + "="*80)
+    log.info("📊 COMPARISON SUMMARY")
+    log.info("="*80)
     
     if classic_result and react_result:
-        print(f"\n⏱️  Execution Time:")
-        print(f"   Classic: {classic_result['duration']:.2f}s")
-        print(f"   ReAct: {react_result['duration']:.2f}s")
-        print(f"   Difference: {react_result['duration'] - classic_result['duration']:+.2f}s ({((react_result['duration'] / classic_result['duration'] - 1) * 100):+.1f}%)")
-        
-        print(f"\n🤖 Agent Behavior:")
-        print(f"   Classic: Static prompts, single LLM call per agent")
-        print(f"   ReAct: Dynamic tool usage, iterative reasoning (max 3 iterations)")
-        
-        print(f"\n💡 Key Differences:")
-        print(f"   ✅ ReAct agents can fetch live order book data")
-        print(f"   ✅ ReAct agents can query portfolio exposure dynamically")
-        print(f"   ✅ ReAct agents can resolve analyst conflicts with news/indicators")
-        print(f"   ✅ ReAct agents maintain reasoning trace for explainability")
-        print(f"   ⚠️  ReAct agents use more tokens (multiple LLM calls per iteration)")
-        
-        print(f"\n🎯 Use Cases:")
-        print(f"   Classic: Fast, cost-effective for straightforward analysis")
-        print(f"   ReAct: Better for complex scenarios requiring dynamic data access")
-        
-        print("\n✅ Both pipelines completed successfully!")
+        log.info("\n⏱️  Execution Time:")
+        log.info("   Classic: %.2fs", classic_result['duration'])
+        log.info("   ReAct: %.2fs", react_result['duration'])
+        log.info("   Difference: %+.2fs (%+.1f%%)", react_result['duration'] - classic_result['duration'], ((react_result['duration'] / classic_result['duration'] - 1) * 100))
+        
+        log.info("\n🤖 Agent Behavior:")
+        log.info("   Classic: Static prompts, single LLM call per agent")
+        log.info("   ReAct: Dynamic tool usage, iterative reasoning (max 3 iterations)")
+        
+        log.info("\n💡 Key Differences:")
+        log.info("   ✅ ReAct agents can fetch live order book data")
+        log.info("   ✅ ReAct agents can query portfolio exposure dynamically")
+        log.info("   ✅ ReAct agents can resolve analyst conflicts with news/indicators")
+        log.info("   ✅ ReAct agents maintain reasoning trace for explainability")
+        log.info("   ⚠️  ReAct agents use more tokens (multiple LLM calls per iteration)")
+        
+        log.info("\n🎯 Use Cases:")
+        log.info("   Classic: Fast, cost-effective for straightforward analysis")
+        log.info("   ReAct: Better for complex scenarios requiring dynamic data access")
+        
+        log.info("\n✅ Both pipelines completed successfully!")
     else:
-        print("\n❌ One or both pipelines failed")
+        log.info("\n❌ One or both pipelines failed")
 
 
 if __name__ == "__main__":
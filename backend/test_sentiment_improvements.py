@@ -10,80 +10,222 @@ Tests:
 6. Sentiment Analyst with real data
 """
 import asyncio
+import hashlib
+import io
+import os
 import sys
+import tempfile
+import time
 from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+import orjson
+from sqlalchemy import text
+
 from app.core.database import SessionLocal
 from app.services.sentiment import SentimentService
 from app.agents.sentiment import SentimentAnalyst
 from app.agents.llm_client import LLMClient
 
 
+def _dumps(obj: Any) -> bytes:
+    """Serialize to JSON with sorted keys, for cache keys and cached results."""
+    return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS, default=str)
+
+
+# One service (and HTTP connection pool) shared by all tests, closed in main()
+_service: Optional[SentimentService] = None
+
+
+def get_service(db) -> SentimentService:
+    """Return the shared SentimentService, creating it on first use."""
+    global _service
+    if _service is None:
+        _service = SentimentService(db)
+    return _service
+
+
+# Comprehensive-sentiment results keyed on the call arguments. The task is
+# stored rather than its result so concurrently running tests share one fetch.
+_SENT_CACHE: Dict[bytes, Tuple[asyncio.Task, float]] = {}
+SENT_CACHE_TTL = 60.0
+
+# On-disk analyst results (see _analyze_cached); set ANALYST_CACHE=0 to always call the LLM
+ANALYST_CACHE_TTL = 6 * 60 * 60.0
+ANALYST_CACHE_ENABLED = os.getenv("ANALYST_CACHE", "1") != "0"
+
+# Market inputs shared by the analyst and comparison tests, so the second
+# one to run hits the cache
+REAL_SENTIMENT_INPUTS = {
+    "symbol": "BTCUSDT",
+    "current_price": 45000,
+    "price_change_24h": 2.3,
+    "volume_24h": 25000000000,
+    "avg_volume": 20000000000,
+    "indicators": {
+        "rsi": 68.5,
+        "macd": 250.3,
+        "macd_signal": 220.1,
+        "ema_12": 44800,
+        "ema_26": 44600
+    }
+}
+
+
+async def _cached_comprehensive(service: SentimentService, **kwargs) -> Dict[str, Any]:
+    """
+    Fetch comprehensive sentiment, reusing a result younger than SENT_CACHE_TTL.
+    
+    Args:
+        service: Sentiment service to fetch with on a cache miss
+        **kwargs: Arguments for get_comprehensive_sentiment
+    
+    Returns:
+        Comprehensive sentiment data dict
+    """
+    key = _dumps(kwargs)
+    cached = _SENT_CACHE.get(key)
+    if cached is None or time.monotonic() - cached[1] > SENT_CACHE_TTL:
+        task = asyncio.ensure_future(service.get_comprehensive_sentiment(**kwargs))
+        cached = _SENT_CACHE[key] = (task, time.monotonic())
+    
+    try:
+        return await asyncio.shield(cached[0])
+    except Exception:
+        # Don't keep failed fetches around
+        if _SENT_CACHE.get(key) is cached:
+            del _SENT_CACHE[key]
+        raise
+
+
+async def _analyze_cached(analyst: SentimentAnalyst, context: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run aanalyze_structured, reusing a result cached on disk for the same context.
+    
+    The key also covers the rendered prompt and response schema, so editing
+    the analyst invalidates it; the sentiment payload's fetch timestamp is left
+    out, so reruns against unchanged market data hit the cache. Entries
+    expire after ANALYST_CACHE_TTL, and ANALYST_CACHE=0 bypasses the cache.
+    
+    Args:
+        analyst: Sentiment analyst to run on a cache miss
+        context: Analysis context
+    
+    Returns:
+        Structured analysis result
+    """
+    if not ANALYST_CACHE_ENABLED:
+        return await analyst.aanalyze_structured(context)
+    
+    keyed = dict(context)
+    if keyed.get("sentiment_data"):
+        keyed["sentiment_data"] = {k: v for k, v in keyed["sentiment_data"].items() if k != "timestamp"}
+    key = hashlib.sha1(_dumps([
+        analyst.name,
+        analyst.model,
+        keyed,
+        analyst.build_prompt(keyed),
+        analyst.get_response_model().model_json_schema(),
+    ])).hexdigest()
+    path = Path(tempfile.gettempdir()) / f"analyst_{key}.json"
+    if path.exists() and time.time() - path.stat().st_mtime <= ANALYST_CACHE_TTL:
+        return orjson.loads(path.read_bytes())
+    
+    result = await analyst.aanalyze_structured(context)
+    path.write_bytes(_dumps(result))
+    return result
+
+
+async def _warmup():
+    """
+    Pay connection and client setup costs before the tests run concurrently.
+    
+    Opens a DB connection, builds an LLM client and warms the shared
+    sentiment service's HTTP pool with one Fear & Greed request. Failures
+    are ignored; the tests will just pay the setup cost themselves.
+    """
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+        LLMClient(db)
+        await asyncio.wait_for(get_service(db).fetch_fear_greed_index(), timeout=5.0)
+    except Exception as e:
+        print(f"⚠️  Warm-up failed: {e}")
+    finally:
+        db.close()
+
+
 async def test_sentiment_service():
     """Test SentimentService data fetching."""
-    print("\n" + "="*80)
-    print("TEST 1: Sentiment Service - Real Data Sources")
-    print("="*80)
+    out = io.StringIO()
+    print("\n" + "="*80, file=out)
+    print("TEST 1: Sentiment Service - Real Data Sources", file=out)
+    print("="*80, file=out)
     
     db = SessionLocal()
     
     try:
-        service = SentimentService(db)
+        service = get_service(db)
+        
+        # Tests 1 and 2 hit different hosts, so fetch them together
+        fear_greed, coingecko = await asyncio.gather(
+            service.fetch_fear_greed_index(),
+            service.fetch_coingecko_sentiment("BTCUSDT"),
+        )
         
         # Test 1: Fear & Greed Index
-        print("\n📊 Testing Fear & Greed Index...")
-        fear_greed = await service.fetch_fear_greed_index()
+        print("\n📊 Testing Fear & Greed Index...", file=out)
         if fear_greed:
-            print(f"✅ Fear & Greed Index: {fear_greed['value']}/100 ({fear_greed['classification']})")
-            print(f"   Timestamp: {fear_greed['timestamp']}")
+            print(f"✅ Fear & Greed Index: {fear_greed['value']}/100 ({fear_greed['classification']})", file=out)
+            print(f"   Timestamp: {fear_greed['timestamp']}", file=out)
         else:
-            print("❌ Failed to fetch Fear & Greed Index")
+            print("❌ Failed to fetch Fear & Greed Index", file=out)
         
         # Test 2: CoinGecko
-        print("\n🦎 Testing CoinGecko data for BTCUSDT...")
-        coingecko = await service.fetch_coingecko_sentiment("BTCUSDT")
+        print("\n🦎 Testing CoinGecko data for BTCUSDT...", file=out)
         if coingecko:
-            print(f"✅ CoinGecko Data:")
-            print(f"   Market Cap Rank: #{coingecko['market_cap_rank']}")
-            print(f"   Sentiment Votes Up: {coingecko['sentiment_votes_up']:.1f}%")
-            print(f"   24h Price Change: {coingecko['price_change_24h']:+.2f}%")
-            print(f"   7d Price Change: {coingecko['price_change_7d']:+.2f}%")
-            print(f"   Twitter Followers: {coingecko['twitter_followers']:,}")
+            print(f"✅ CoinGecko Data:", file=out)
+            print(f"   Market Cap Rank: #{coingecko['market_cap_rank']}", file=out)
+            print(f"   Sentiment Votes Up: {coingecko['sentiment_votes_up']:.1f}%", file=out)
+            print(f"   24h Price Change: {coingecko['price_change_24h']:+.2f}%", file=out)
+            print(f"   7d Price Change: {coingecko['price_change_7d']:+.2f}%", file=out)
+            print(f"   Twitter Followers: {coingecko['twitter_followers']:,}", file=out)
         else:
-            print("❌ Failed to fetch CoinGecko data")
+            print("❌ Failed to fetch CoinGecko data", file=out)
         
         # Test 3: Volume Analysis
-        print("\n📈 Testing Volume Sentiment Analysis...")
+        print("\n📈 Testing Volume Sentiment Analysis...", file=out)
         volume_sentiment = service.analyze_volume_sentiment(
             current_volume=1000000,
             avg_volume=600000,
             price_change=3.5
         )
-        print(f"✅ Volume Sentiment:")
-        print(f"   Trend: {volume_sentiment['volume_trend']}")
-        print(f"   Ratio: {volume_sentiment['volume_ratio']}x average")
-        print(f"   Signal: {volume_sentiment['sentiment_signal']}")
-        print(f"   Conviction: {volume_sentiment['conviction']}")
+        print(f"✅ Volume Sentiment:", file=out)
+        print(f"   Trend: {volume_sentiment['volume_trend']}", file=out)
+        print(f"   Ratio: {volume_sentiment['volume_ratio']}x average", file=out)
+        print(f"   Signal: {volume_sentiment['sentiment_signal']}", file=out)
+        print(f"   Conviction: {volume_sentiment['conviction']}", file=out)
         
         # Test 4: Technical Sentiment
-        print("\n🔧 Testing Technical Sentiment Analysis...")
+        print("\n🔧 Testing Technical Sentiment Analysis...", file=out)
         tech_sentiment = service.analyze_technical_sentiment({
             "rsi": 72.5,
             "macd": 150.3,
             "macd_signal": 120.1
         })
-        print(f"✅ Technical Sentiment:")
-        print(f"   RSI Sentiment: {tech_sentiment['rsi_sentiment']} (RSI: {tech_sentiment['rsi_value']})")
-        print(f"   Momentum: {tech_sentiment['momentum_sentiment']}")
-        print(f"   Overall: {tech_sentiment['overall_technical_sentiment']}")
-        print(f"   Extremes: {tech_sentiment['extremes_detected']}")
+        print(f"✅ Technical Sentiment:", file=out)
+        print(f"   RSI Sentiment: {tech_sentiment['rsi_sentiment']} (RSI: {tech_sentiment['rsi_value']})", file=out)
+        print(f"   Momentum: {tech_sentiment['momentum_sentiment']}", file=out)
+        print(f"   Overall: {tech_sentiment['overall_technical_sentiment']}", file=out)
+        print(f"   Extremes: {tech_sentiment['extremes_detected']}", file=out)
         
         # Test 5: Comprehensive Sentiment
-        print("\n🎯 Testing Comprehensive Sentiment Aggregation...")
-        comprehensive = await service.get_comprehensive_sentiment(
+        print("\n🎯 Testing Comprehensive Sentiment Aggregation...", file=out)
+        comprehensive = await _cached_comprehensive(
+            service,
             symbol="BTCUSDT",
             current_price=45000,
             price_change_24h=2.5,
@@ -92,63 +234,49 @@ async def test_sentiment_service():
             indicators={"rsi": 65.0, "macd": 100.0, "macd_signal": 95.0}
         )
         
-        print(f"✅ Comprehensive Sentiment:")
-        print(f"   Overall Score: {comprehensive['overall_sentiment_score']}/100")
-        print(f"   Classification: {comprehensive['sentiment_classification']}")
-        print(f"   Data Sources Available:")
+        print(f"✅ Comprehensive Sentiment:", file=out)
+        print(f"   Overall Score: {comprehensive['overall_sentiment_score']}/100", file=out)
+        print(f"   Classification: {comprehensive['sentiment_classification']}", file=out)
+        print(f"   Data Sources Available:", file=out)
         for source, available in comprehensive['data_sources_available'].items():
-            print(f"      {source}: {'✓' if available else '✗'}")
+            print(f"      {source}: {'✓' if available else '✗'}", file=out)
         
-        await service.close()
-        
-        print("\n✅ All Sentiment Service tests passed!")
+        print("\n✅ All Sentiment Service tests passed!", file=out)
         return True
-        
+    
     except Exception as e:
-        print(f"\n❌ Sentiment Service test failed: {e}")
+        print(f"\n❌ Sentiment Service test failed: {e}", file=out)
         import traceback
-        traceback.print_exc()
+        traceback.print_exc(file=out)
         return False
     finally:
         db.close()
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
 
 
 async def test_sentiment_analyst_with_real_data():
     """Test Sentiment Analyst using real data."""
-    print("\n" + "="*80)
-    print("TEST 2: Sentiment Analyst with Real Data")
-    print("="*80)
+    out = io.StringIO()
+    print("\n" + "="*80, file=out)
+    print("TEST 2: Sentiment Analyst with Real Data", file=out)
+    print("="*80, file=out)
     
     db = SessionLocal()
     
     try:
         # First, fetch comprehensive sentiment data
-        print("\n📡 Fetching real sentiment data...")
-        sentiment_service = SentimentService(db)
-        
-        sentiment_data = await sentiment_service.get_comprehensive_sentiment(
-            symbol="BTCUSDT",
-            current_price=45000,
-            price_change_24h=2.3,
-            volume_24h=25000000000,
-            avg_volume=20000000000,
-            indicators={
-                "rsi": 68.5,
-                "macd": 250.3,
-                "macd_signal": 220.1,
-                "ema_12": 44800,
-                "ema_26": 44600
-            }
-        )
+        print("\n📡 Fetching real sentiment data...", file=out)
+        sentiment_service = get_service(db)
         
-        await sentiment_service.close()
+        sentiment_data = await _cached_comprehensive(sentiment_service, **REAL_SENTIMENT_INPUTS)
         
-        print(f"✅ Fetched sentiment data:")
-        print(f"   Overall Score: {sentiment_data['overall_sentiment_score']}")
-        print(f"   Classification: {sentiment_data['sentiment_classification']}")
+        print(f"✅ Fetched sentiment data:", file=out)
+        print(f"   Overall Score: {sentiment_data['overall_sentiment_score']}", file=out)
+        print(f"   Classification: {sentiment_data['sentiment_classification']}", file=out)
         
         # Now run Sentiment Analyst
-        print("\n🤖 Running Sentiment Analyst with real data...")
+        print("\n🤖 Running Sentiment Analyst with real data...", file=out)
         
         llm_client = LLMClient(db)
         analyst = SentimentAnalyst(db, llm_client)
@@ -160,56 +288,59 @@ async def test_sentiment_analyst_with_real_data():
             "sentiment_data": sentiment_data
         }
         
-        result = analyst.analyze_structured(context)
+        result = await analyst.aanalyze_structured(context)
         
-        print(f"\n✅ Sentiment Analysis Complete:")
+        print(f"\n✅ Sentiment Analysis Complete:", file=out)
         analysis = result["analysis"]
         
-        print(f"\n📊 SENTIMENT ANALYSIS RESULTS:")
-        print(f"   Overall Sentiment: {analysis['overall_sentiment']}")
-        print(f"   Sentiment Score: {analysis['sentiment_score']}/100")
-        print(f"   Sentiment Strength: {analysis['sentiment_strength']}")
-        print(f"   Crowd Psychology: {analysis['crowd_psychology']}")
-        print(f"   Sentiment Trend: {analysis['sentiment_trend']}")
-        print(f"   Confidence: {analysis['confidence']}%")
+        print(f"\n📊 SENTIMENT ANALYSIS RESULTS:", file=out)
+        print(f"   Overall Sentiment: {analysis['overall_sentiment']}", file=out)
+        print(f"   Sentiment Score: {analysis['sentiment_score']}/100", file=out)
+        print(f"   Sentiment Strength: {analysis['sentiment_strength']}", file=out)
+        print(f"   Crowd Psychology: {analysis['crowd_psychology']}", file=out)
+        print(f"   Sentiment Trend: {analysis['sentiment_trend']}", file=out)
+        print(f"   Confidence: {analysis['confidence']}%", file=out)
         
-        print(f"\n🔑 Key Factors:")
+        print(f"\n🔑 Key Factors:", file=out)
         key_factors = analysis.get('key_factors', {})
         if isinstance(key_factors, dict):
             for factor, value in key_factors.items():
-                print(f"   {factor}: {value}")
+                print(f"   {factor}: {value}", file=out)
         
-        print(f"\n⚠️  Contrarian Signals ({len(analysis.get('contrarian_signals', []))}):")
+        print(f"\n⚠️  Contrarian Signals ({len(analysis.get('contrarian_signals', []))}):", file=out)
         for signal in analysis.get('contrarian_signals', [])[:3]:
-            print(f"   • {signal}")
+            print(f"   • {signal}", file=out)
         
-        print(f"\n💡 Key Observations ({len(analysis.get('key_observations', []))}):")
+        print(f"\n💡 Key Observations ({len(analysis.get('key_observations', []))}):", file=out)
         for obs in analysis.get('key_observations', [])[:3]:
-            print(f"   • {obs}")
+            print(f"   • {obs}", file=out)
         
-        print(f"\n📈 Trading Implication:")
-        print(f"   {analysis.get('trading_implication', 'N/A')}")
+        print(f"\n📈 Trading Implication:", file=out)
+        print(f"   {analysis.get('trading_implication', 'N/A')}", file=out)
         
-        print(f"\n💭 Reasoning:")
-        print(f"   {analysis.get('reasoning', 'N/A')[:200]}...")
+        print(f"\n💭 Reasoning:", file=out)
+        print(f"   {analysis.get('reasoning', 'N/A')[:200]}...", file=out)
         
-        print("\n✅ Sentiment Analyst test passed!")
+        print("\n✅ Sentiment Analyst test passed!", file=out)
         return True
-        
+    
     except Exception as e:
-        print(f"\n❌ Sentiment Analyst test failed: {e}")
+        print(f"\n❌ Sentiment Analyst test failed: {e}", file=out)
         import traceback
-        traceback.print_exc()
+        traceback.print_exc(file=out)
         return False
     finally:
         db.close()
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
 
 
 async def test_comparison_mock_vs_real():
     """Compare sentiment analysis with mock vs real data."""
-    print("\n" + "="*80)
-    print("TEST 3: Comparison - Mock Data vs Real Data")
-    print("="*80)
+    out = io.StringIO()
+    print("\n" + "="*80, file=out)
+    print("TEST 3: Comparison - Mock Data vs Real Data", file=out)
+    print("="*80, file=out)
     
     db = SessionLocal()
     
@@ -218,7 +349,7 @@ async def test_comparison_mock_vs_real():
         analyst = SentimentAnalyst(db, llm_client)
         
         # Test with mock data
-        print("\n❌ Running with MOCK data (old approach)...")
+        print("\n❌ Running with MOCK data (old approach)...", file=out)
         mock_context = {
             "symbol": "BTCUSDT",
             "current_price": 45000,
@@ -226,22 +357,14 @@ async def test_comparison_mock_vs_real():
             "sentiment_data": {}  # Empty = mock data
         }
         
-        mock_result = analyst.analyze_structured(mock_context)
+        mock_result = await _analyze_cached(analyst, mock_context)
         mock_confidence = mock_result["analysis"]["confidence"]
-        print(f"   Confidence with mock data: {mock_confidence}%")
+        print(f"   Confidence with mock data: {mock_confidence}%", file=out)
         
         # Test with real data
-        print("\n✅ Running with REAL data (new approach)...")
-        sentiment_service = SentimentService(db)
-        real_sentiment = await sentiment_service.get_comprehensive_sentiment(
-            symbol="BTCUSDT",
-            current_price=45000,
-            price_change_24h=2.3,
-            volume_24h=25000000000,
-            avg_volume=20000000000,
-            indicators={"rsi": 68.5, "macd": 250.3, "macd_signal": 220.1}
-        )
-        await sentiment_service.close()
+        print("\n✅ Running with REAL data (new approach)...", file=out)
+        sentiment_service = get_service(db)
+        real_sentiment = await _cached_comprehensive(sentiment_service, **REAL_SENTIMENT_INPUTS)
         
         real_context = {
             "symbol": "BTCUSDT",
@@ -250,26 +373,29 @@ async def test_comparison_mock_vs_real():
             "sentiment_data": real_sentiment
         }
         
-        real_result = analyst.analyze_structured(real_context)
+        real_result = await _analyze_cached(analyst, real_context)
         real_confidence = real_result["analysis"]["confidence"]
-        print(f"   Confidence with real data: {real_confidence}%")
+        print(f"   Confidence with real data: {real_confidence}%", file=out)
         
         # Compare
-        print(f"\n📊 COMPARISON:")
-        print(f"   Confidence Delta: {real_confidence - mock_confidence:+d}%")
-        print(f"   Data Quality: Real data provides {len(str(real_sentiment))} chars vs {len(str({}))} chars")
-        print(f"   Improvement: {'✅ Significant' if abs(real_confidence - mock_confidence) > 10 else '⚠️  Minimal'}")
+        print(f"\n📊 COMPARISON:", file=out)
+        print(f"   Confidence Delta: {real_confidence - mock_confidence:+d}%", file=out)
+        sources = sum(real_sentiment.get('data_sources_available', {}).values())
+        print(f"   Data Quality: Real data provides keys={len(real_sentiment)}, sources={sources} vs none", file=out)
+        print(f"   Improvement: {'✅ Significant' if abs(real_confidence - mock_confidence) > 10 else '⚠️  Minimal'}", file=out)
         
-        print("\n✅ Comparison test passed!")
+        print("\n✅ Comparison test passed!", file=out)
         return True
-        
+    
     except Exception as e:
-        print(f"\n❌ Comparison test failed: {e}")
+        print(f"\n❌ Comparison test failed: {e}", file=out)
         import traceback
-        traceback.print_exc()
+        traceback.print_exc(file=out)
         return False
     finally:
         db.close()
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
 
 
 async def main():
@@ -284,14 +410,21 @@ async def main():
     print("  5. LLM analysis with real data")
     print("="*80)
     
-    # Test 1: Sentiment Service
-    test1_passed = await test_sentiment_service()
-    
-    # Test 2: Sentiment Analyst with real data
-    test2_passed = await test_sentiment_analyst_with_real_data()
-    
-    # Test 3: Comparison
-    test3_passed = await test_comparison_mock_vs_real()
+    try:
+        await _warmup()
+        
+        # Each test buffers its own output, so running them concurrently
+        # keeps every report in one piece
+        results = await asyncio.gather(
+            test_sentiment_service(),
+            test_sentiment_analyst_with_real_data(),
+            test_comparison_mock_vs_real(),
+            return_exceptions=True
+        )
+    finally:
+        if _service is not None:
+            await _service.close()
+    test1_passed, test2_passed, test3_passed = (r is True for r in results)
     
     # Summary
     print("\n" + "="*80)
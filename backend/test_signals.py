@@ -1,85 +1,99 @@
 """
 Debug script to test signal generation in backtesting.
 """
-import pandas as pd
+import asyncio
 import numpy as np
-from datetime import datetime, timedelta
-from app.services.binance import BinanceService
-from app.services.indicators import calculate_rsi, calculate_macd, calculate_ema, calculate_bollinger_bands
 from app.core.config import settings
+from test_utils import load_recent_indicators
 
-# Fetch some real data
-binance = BinanceService()
-end_time = int(datetime.now().timestamp() * 1000)
-start_time = end_time - (30 * 24 * 60 * 60 * 1000)  # 30 days ago
+# Symbols to fetch concurrently and report on
+SYMBOLS = ["BTCUSDT"]
 
-klines = binance.fetch_klines_sync(
-    symbol="BTCUSDT",
-    interval="1h",
-    start_time=start_time,
-    end_time=end_time
-)
+DAYS = 30
 
-df = pd.DataFrame([
-    {
-        "timestamp": datetime.fromtimestamp(k[0] / 1000),
-        "open": float(k[1]),
-        "high": float(k[2]),
-        "low": float(k[3]),
-        "close": float(k[4]),
-        "volume": float(k[5]),
-    }
-    for k in klines
-])
 
-df.set_index("timestamp", inplace=True)
+def report(symbol, df):
+    """
+    Print signal stats for one symbol's indicator frame.
+    
+    Returns:
+        Dict with the RSI + MACD strategy's entry and exit counts
+    """
+    print(f"\n=== {symbol} ===")
+    print(f"Data shape: {df.shape}")
+    print(f"Date range: {df.index[0]} to {df.index[-1]}")
+    
+    # Split RSI into its valid values once; the NaN count and the stats
+    # below all come from this instead of separate passes over the column
+    rsi = df["rsi"].to_numpy()
+    rsi_valid = ~np.isnan(rsi)
+    rv = rsi[rsi_valid]
+    
+    # Count NaN values
+    print(f"\nNaN counts:")
+    print(f"RSI: {rsi.size - np.count_nonzero(rsi_valid)}")
+    print(f"MACD: {np.count_nonzero(np.isnan(df['macd'].to_numpy()))}")
+    print(f"MACD Signal: {np.count_nonzero(np.isnan(df['macd_signal'].to_numpy()))}")
+    
+    # Check signal conditions for RSI + MACD strategy
+    print(f"\nSettings:")
+    print(f"RSI Oversold: {settings.rsi_oversold}")
+    print(f"RSI Overbought: {settings.rsi_overbought}")
+    
+    # Generate signals. The MACD position masks are computed once and
+    # reused by the signals and the low-RSI sample below.
+    macd = df["macd"].to_numpy()
+    sig = df["macd_signal"].to_numpy()
+    above = macd > sig
+    below = macd < sig
+    
+    entries = (rsi < settings.rsi_oversold) & above
+    exits = (rsi > settings.rsi_overbought) & below
+    
+    print(f"\nSignal counts:")
+    print(f"Entry signals: {entries.sum()}")
+    print(f"Exit signals: {exits.sum()}")
+    
+    # Show RSI statistics
+    print(f"\nRSI statistics (excluding NaN):")
+    print(f"Min: {rv.min():.2f}")
+    print(f"Max: {rv.max():.2f}")
+    print(f"Mean: {rv.mean():.2f}")
+    print(f"< 30: {np.count_nonzero(rv < 30)}")
+    print(f"> 70: {np.count_nonzero(rv > 70)}")
+    
+    # Show some samples where RSI is low
+    low = rsi < 35
+    low_rsi = df[low].copy()
+    if len(low_rsi) > 0:
+        print(f"\nSample rows with RSI < 35:")
+        low_rsi['macd_above_signal'] = above[low]
+        print(low_rsi[['close', 'rsi', 'macd', 'macd_signal', 'macd_above_signal']].head(10))
+    
+    return {"entries": int(entries.sum()), "exits": int(exits.sum())}
 
-print(f"Data shape: {df.shape}")
-print(f"Date range: {df.index[0]} to {df.index[-1]}")
 
-# Calculate indicators
-df["rsi"] = calculate_rsi(df, 14)
-macd_data = calculate_macd(df)
-df["macd"] = macd_data["macd"]
-df["macd_signal"] = macd_data["macd_signal"]
+def run(symbol="BTCUSDT", days=DAYS):
+    """
+    Load one symbol's indicators and report on them.
+    
+    Args:
+        symbol: Trading pair symbol
+        days: Days of hourly history to load
+    
+    Returns:
+        Tuple of (indicator frame, signal counts)
+    """
+    df, = asyncio.run(load_recent_indicators([symbol], days))
+    return df, report(symbol, df)
 
-# Count NaN values
-print(f"\nNaN counts:")
-print(f"RSI: {df['rsi'].isna().sum()}")
-print(f"MACD: {df['macd'].isna().sum()}")
-print(f"MACD Signal: {df['macd_signal'].isna().sum()}")
 
-# Check signal conditions for RSI + MACD strategy
-print(f"\nSettings:")
-print(f"RSI Oversold: {settings.rsi_oversold}")
-print(f"RSI Overbought: {settings.rsi_overbought}")
+async def main():
+    """Load every symbol's indicators concurrently, then report on each."""
+    frames = await load_recent_indicators(SYMBOLS, DAYS)
+    for symbol, df in zip(SYMBOLS, frames):
+        report(symbol, df)
 
-# Generate signals
-entries = (
-    (df["rsi"] < settings.rsi_oversold) &
-    (df["macd"] > df["macd_signal"])
-)
 
-exits = (
-    (df["rsi"] > settings.rsi_overbought) &
-    (df["macd"] < df["macd_signal"])
-)
-
-print(f"\nSignal counts:")
-print(f"Entry signals: {entries.sum()}")
-print(f"Exit signals: {exits.sum()}")
-
-# Show RSI statistics
-print(f"\nRSI statistics (excluding NaN):")
-print(f"Min: {df['rsi'].min():.2f}")
-print(f"Max: {df['rsi'].max():.2f}")
-print(f"Mean: {df['rsi'].mean():.2f}")
-print(f"< 30: {(df['rsi'] < 30).sum()}")
-print(f"> 70: {(df['rsi'] > 70).sum()}")
-
-# Show some samples where RSI is low
-low_rsi = df[df['rsi'] < 35].copy()
-if len(low_rsi) > 0:
-    print(f"\nSample rows with RSI < 35:")
-    low_rsi['macd_above_signal'] = low_rsi['macd'] > low_rsi['macd_signal']
-    print(low_rsi[['close', 'rsi', 'macd', 'macd_signal', 'macd_above_signal']].head(10))
+if __name__ == "__main__":
+    asyncio.run(main())
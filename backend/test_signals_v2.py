@@ -1,110 +1,152 @@
 """
 Debug script to test more relaxed signal generation.
 """
-import pandas as pd
+import asyncio
 import numpy as np
-from datetime import datetime, timedelta
-from app.services.binance import BinanceService
-from app.services.indicators import calculate_rsi, calculate_macd, calculate_ema, calculate_bollinger_bands
+from app.services.indicators_numba import cross_signals
 from app.core.config import settings
-
-# Fetch some real data
-binance = BinanceService()
-end_time = int(datetime.now().timestamp() * 1000)
-start_time = end_time - (60 * 24 * 60 * 60 * 1000)  # 60 days ago for better sample
-
-klines = binance.fetch_klines_sync(
-    symbol="BTCUSDT",
-    interval="1h",
-    start_time=start_time,
-    end_time=end_time,
-    limit=1000  # More data
-)
-
-df = pd.DataFrame([
-    {
-        "timestamp": datetime.fromtimestamp(k[0] / 1000),
-        "open": float(k[1]),
-        "high": float(k[2]),
-        "low": float(k[3]),
-        "close": float(k[4]),
-        "volume": float(k[5]),
-    }
-    for k in klines
-])
-
-df.set_index("timestamp", inplace=True)
-
-print(f"Data shape: {df.shape}")
-print(f"Date range: {df.index[0]} to {df.index[-1]}")
-
-# Calculate indicators
-df["rsi"] = calculate_rsi(df, 14)
-macd_data = calculate_macd(df)
-df["macd"] = macd_data["macd"]
-df["macd_signal"] = macd_data["macd_signal"]
-df["macd_hist"] = macd_data["macd_diff"]
-
-print(f"\nRSI statistics:")
-print(f"Min: {df['rsi'].min():.2f}")
-print(f"Max: {df['rsi'].max():.2f}")
-print(f"Mean: {df['rsi'].mean():.2f}")
-print(f"< 30: {(df['rsi'] < 30).sum()}")
-print(f"> 70: {(df['rsi'] > 70).sum()}")
-
-# Test original strict strategy
-strict_entries = (
-    (df["rsi"] < 30) &
-    (df["macd"] > df["macd_signal"])
-)
-strict_exits = (
-    (df["rsi"] > 70) &
-    (df["macd"] < df["macd_signal"])
-)
-
-print(f"\n=== STRICT STRATEGY (current) ===")
-print(f"Entry signals (RSI<30 AND MACD>Signal): {strict_entries.sum()}")
-print(f"Exit signals (RSI>70 AND MACD<Signal): {strict_exits.sum()}")
-
-# Test more realistic strategies
-print(f"\n=== RELAXED STRATEGY OPTIONS ===")
-
-# Option 1: OR instead of AND
-or_entries = (
-    (df["rsi"] < 30) |
-    ((df["macd"] > df["macd_signal"]) & (df["rsi"] < 40))
-)
-or_exits = (
-    (df["rsi"] > 70) |
-    ((df["macd"] < df["macd_signal"]) & (df["rsi"] > 60))
-)
-print(f"Option 1 (OR logic): Entries={or_entries.sum()}, Exits={or_exits.sum()}")
-
-# Option 2: Relaxed thresholds
-relaxed_entries = (
-    (df["rsi"] < 35) &
-    (df["macd"] > df["macd_signal"])
-)
-relaxed_exits = (
-    (df["rsi"] > 65) &
-    (df["macd"] < df["macd_signal"])
-)
-print(f"Option 2 (RSI 35/65): Entries={relaxed_entries.sum()}, Exits={relaxed_exits.sum()}")
-
-# Option 3: MACD crossover with RSI confirmation
-macd_bullish_cross = (df["macd"] > df["macd_signal"]) & (df["macd"].shift(1) <= df["macd_signal"].shift(1))
-macd_bearish_cross = (df["macd"] < df["macd_signal"]) & (df["macd"].shift(1) >= df["macd_signal"].shift(1))
-
-cross_entries = macd_bullish_cross & (df["rsi"] < 50)
-cross_exits = macd_bearish_cross & (df["rsi"] > 50)
-print(f"Option 3 (MACD cross + RSI): Entries={cross_entries.sum()}, Exits={cross_exits.sum()}")
-
-# Option 4: Just RSI
-rsi_only_entries = df["rsi"] < 30
-rsi_only_exits = df["rsi"] > 70
-print(f"Option 4 (RSI only): Entries={rsi_only_entries.sum()}, Exits={rsi_only_exits.sum()}")
-
-# Option 5: Just MACD crossover
-macd_only_entries = macd_bullish_cross
-macd_only_exits = macd_bearish_cross
-print(f"Option 5 (MACD crossover only): Entries={macd_only_entries.sum()}, Exits={macd_only_exits.sum()}")
+from test_utils import load_recent_indicators
+
+# Symbols to fetch concurrently and report on
+SYMBOLS = ["BTCUSDT"]
+
+DAYS = 60  # 60 days for better sample
+LIMIT = 1000  # More data
+
+# Strategy names, in the row order count_signals returns them
+STRATEGIES = ["strict", "or", "relaxed", "cross", "rsi_only", "macd_only"]
+
+
+def count_signals(df, oversold=30, overbought=70):
+    """
+    Count entry and exit signals for every candidate strategy.
+    
+    The OR and relaxed strategies loosen the RSI thresholds by 10 and 5
+    points respectively, so the defaults give the original 40/60 and 35/65.
+    
+    Args:
+        df: Indicator frame with rsi, macd and macd_signal columns
+        oversold: RSI entry threshold
+        overbought: RSI exit threshold
+    
+    Returns:
+        Int array of shape (len(STRATEGIES), 2): entries and exits per strategy
+    """
+    # Pull the indicator columns out once and derive every comparison the
+    # strategies need up front; each strategy below is a boolean op on these.
+    # NaN (indicator warm-up) compares False, exactly as in the pandas masks.
+    rsi = df["rsi"].to_numpy()
+    macd = df["macd"].to_numpy()
+    sig = df["macd_signal"].to_numpy()
+    
+    above = macd > sig
+    below = macd < sig
+    rsi_lo, rsi_hi = rsi < oversold, rsi > overbought
+    
+    # Previous candle's MACD position (first candle has none)
+    prev_at_or_below = np.concatenate(([False], (macd <= sig)[:-1]))
+    prev_at_or_above = np.concatenate(([False], (macd >= sig)[:-1]))
+    macd_bullish_cross = above & prev_at_or_below
+    macd_bearish_cross = below & prev_at_or_above
+    
+    # Original strict strategy
+    strict_entries = rsi_lo & above
+    strict_exits = rsi_hi & below
+    
+    # Option 1: OR instead of AND
+    or_entries = rsi_lo | (above & (rsi < oversold + 10))
+    or_exits = rsi_hi | (below & (rsi > overbought - 10))
+    
+    # Option 2: Relaxed thresholds
+    relaxed_entries = (rsi < oversold + 5) & above
+    relaxed_exits = (rsi > overbought - 5) & below
+    
+    # Option 3: MACD crossover with RSI confirmation
+    cross_entries, cross_exits = cross_signals(rsi, macd, sig, 50.0, 50.0)
+    
+    # Option 4: Just RSI
+    rsi_only_entries = rsi_lo
+    rsi_only_exits = rsi_hi
+    
+    # Option 5: Just MACD crossover
+    macd_only_entries = macd_bullish_cross
+    macd_only_exits = macd_bearish_cross
+    
+    # Count every mask in one reduction: row 2k is a strategy's entries,
+    # row 2k + 1 its exits
+    return np.stack([
+        strict_entries, strict_exits,
+        or_entries, or_exits,
+        relaxed_entries, relaxed_exits,
+        cross_entries, cross_exits,
+        rsi_only_entries, rsi_only_exits,
+        macd_only_entries, macd_only_exits,
+    ]).sum(axis=1).reshape(-1, 2)
+
+
+def report(symbol, df):
+    """
+    Print signal stats for one symbol's indicator frame.
+    
+    Returns:
+        Dict of strategy name to (entries, exits)
+    """
+    print(f"\n=== {symbol} ===")
+    print(f"Data shape: {df.shape}")
+    print(f"Date range: {df.index[0]} to {df.index[-1]}")
+    
+    rsi = df["rsi"].to_numpy()
+    rv = rsi[~np.isnan(rsi)]
+    
+    print(f"\nRSI statistics:")
+    print(f"Min: {rv.min():.2f}")
+    print(f"Max: {rv.max():.2f}")
+    print(f"Mean: {rv.mean():.2f}")
+    print(f"< 30: {np.count_nonzero(rv < 30)}")
+    print(f"> 70: {np.count_nonzero(rv > 70)}")
+    
+    counts = count_signals(df)
+    
+    print(f"\n=== STRICT STRATEGY (current) ===")
+    print(f"Entry signals (RSI<30 AND MACD>Signal): {counts[0, 0]}")
+    print(f"Exit signals (RSI>70 AND MACD<Signal): {counts[0, 1]}")
+    
+    # Test more realistic strategies
+    print(f"\n=== RELAXED STRATEGY OPTIONS ===")
+    options = [
+        "Option 1 (OR logic)",
+        "Option 2 (RSI 35/65)",
+        "Option 3 (MACD cross + RSI)",
+        "Option 4 (RSI only)",
+        "Option 5 (MACD crossover only)",
+    ]
+    for label, (n_entries, n_exits) in zip(options, counts[1:]):
+        print(f"{label}: Entries={n_entries}, Exits={n_exits}")
+    
+    return {name: (int(n_entries), int(n_exits)) for name, (n_entries, n_exits) in zip(STRATEGIES, counts)}
+
+
+def run(symbol="BTCUSDT", days=DAYS):
+    """
+    Load one symbol's indicators and report on them.
+    
+    Args:
+        symbol: Trading pair symbol
+        days: Days of hourly history to load
+    
+    Returns:
+        Tuple of (indicator frame, strategy name to (entries, exits))
+    """
+    df, = asyncio.run(load_recent_indicators([symbol], days, limit=LIMIT))
+    return df, report(symbol, df)
+
+
+async def main():
+    """Load every symbol's indicators concurrently, then report on each."""
+    frames = await load_recent_indicators(SYMBOLS, DAYS, limit=LIMIT)
+    for symbol, df in zip(SYMBOLS, frames):
+        report(symbol, df)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
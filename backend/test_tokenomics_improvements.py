@@ -10,7 +10,9 @@ Tests:
 6. Tokenomics Analyst with real data
 """
 import asyncio
+import io
 import sys
+import traceback
 from pathlib import Path
 
 # Add parent directory to path
@@ -22,140 +24,142 @@ from app.agents.tokenomics import TokenomicsAnalyst
 from app.agents.llm_client import LLMClient
 
 
-async def test_tokenomics_service():
+SEP = "=" * 80
+
+# (symbol, current price, market cap, 24h volume) fetched up front by main()
+SYMBOLS = [
+    ("BTCUSDT", 45000, 880000000000, 30000000000),
+    ("ETHUSDT", 3500, 420000000000, 15000000000),
+    ("SOLUSDT", 150, 70000000000, 3000000000),
+]
+
+
+def print_summary(data):
+    """Print a one-line overview of a comprehensive tokenomics result."""
+    supply = data.get('supply_analysis', {})
+    liquidity = data.get('liquidity_analysis', {})
+    print(
+        f"   {data['symbol']}: {data.get('coin_name', 'N/A')} | "
+        f"quality={data.get('data_quality', 'N/A')} | "
+        f"supply={supply.get('inflation_type', 'N/A')} | "
+        f"tier={liquidity.get('market_cap_tier', 'N/A')}"
+    )
+
+
+async def test_tokenomics_service(service):
     """Test TokenomicsService data fetching."""
-    print("\n" + "="*80)
-    print("TEST 1: Tokenomics Service - Real Data Sources")
-    print("="*80)
-    
-    db = SessionLocal()
+    out = io.StringIO()
+    print("\n" + SEP, file=out)
+    print("TEST 1: Tokenomics Service - Real Data Sources", file=out)
+    print(SEP, file=out)
     
     try:
-        service = TokenomicsService(db)
-        
         # Test 1: CoinGecko Tokenomics
-        print("\n🦎 Testing CoinGecko tokenomics for BTCUSDT...")
-        coingecko_data = await service.fetch_coingecko_tokenomics("BTCUSDT")
+        print("\n🦎 Testing CoinGecko tokenomics for BTCUSDT...", file=out)
+        # The BTC lookup and the ETH aggregation (Test 5) are independent
+        coingecko_data, comprehensive = await asyncio.gather(
+            service.fetch_coingecko_tokenomics("BTCUSDT"),
+            service.get_comprehensive_tokenomics(
+                symbol="ETHUSDT",
+                current_price=3500,
+                market_cap=420000000000,
+                volume_24h=15000000000
+            )
+        )
         if coingecko_data:
-            print(f"✅ CoinGecko Tokenomics Data:")
-            print(f"   Name: {coingecko_data['name']}")
-            print(f"   Blockchain: {coingecko_data['blockchain']}")
-            print(f"   Categories: {', '.join(coingecko_data['categories'][:3])}")
-            print(f"   Supply:")
-            print(f"      Circulating: {coingecko_data['supply']['circulating']:,.0f}")
+            print(f"✅ CoinGecko Tokenomics Data:", file=out)
+            print(f"   Name: {coingecko_data['name']}", file=out)
+            print(f"   Blockchain: {coingecko_data['blockchain']}", file=out)
+            print(f"   Categories: {', '.join(coingecko_data['categories'][:3])}", file=out)
+            print(f"   Supply:", file=out)
+            print(f"      Circulating: {coingecko_data['supply']['circulating']:,.0f}", file=out)
             max_supply = coingecko_data['supply']['max']
             max_supply_str = f"{max_supply:,.0f}" if max_supply else "Unlimited"
-            print(f"      Max: {max_supply_str}")
-            print(f"      % Circulating: {coingecko_data['supply']['percentage_circulating']:.1f}%")
-            print(f"      Inflationary: {coingecko_data['supply']['is_inflationary']}")
-            print(f"\n   Market:")
-            print(f"      Market Cap: ${coingecko_data['market']['market_cap']:,.0f}")
-            print(f"      Rank: #{coingecko_data['market']['market_cap_rank']}")
-            print(f"      Volume/MCap: {coingecko_data['market']['volume_to_mcap_ratio']:.4f}")
-            print(f"\n   Developer:")
-            print(f"      Commits (4w): {coingecko_data['developer']['commit_count_4_weeks']}")
-            print(f"      Stars: {coingecko_data['developer']['stars']}")
-            print(f"      Forks: {coingecko_data['developer']['forks']}")
+            print(f"      Max: {max_supply_str}", file=out)
+            print(f"      % Circulating: {coingecko_data['supply']['percentage_circulating']:.1f}%", file=out)
+            print(f"      Inflationary: {coingecko_data['supply']['is_inflationary']}", file=out)
+            print(f"\n   Market:", file=out)
+            print(f"      Market Cap: ${coingecko_data['market']['market_cap']:,.0f}", file=out)
+            print(f"      Rank: #{coingecko_data['market']['market_cap_rank']}", file=out)
+            print(f"      Volume/MCap: {coingecko_data['market']['volume_to_mcap_ratio']:.4f}", file=out)
+            print(f"\n   Developer:", file=out)
+            print(f"      Commits (4w): {coingecko_data['developer']['commit_count_4_weeks']}", file=out)
+            print(f"      Stars: {coingecko_data['developer']['stars']}", file=out)
+            print(f"      Forks: {coingecko_data['developer']['forks']}", file=out)
         else:
-            print("❌ Failed to fetch CoinGecko tokenomics")
+            print("❌ Failed to fetch CoinGecko tokenomics", file=out)
         
         # Test 2: Supply Analysis
-        print("\n📊 Testing Supply Structure Analysis...")
+        print("\n📊 Testing Supply Structure Analysis...", file=out)
         if coingecko_data:
             supply_analysis = service.analyze_supply_structure(coingecko_data['supply'])
-            print(f"✅ Supply Analysis:")
-            print(f"   Inflation Type: {supply_analysis['inflation_type']}")
-            print(f"   Supply Status: {supply_analysis['supply_status']}")
-            print(f"   Inflation Pressure: {supply_analysis['inflation_pressure']}")
+            print(f"✅ Supply Analysis:", file=out)
+            print(f"   Inflation Type: {supply_analysis['inflation_type']}", file=out)
+            print(f"   Supply Status: {supply_analysis['supply_status']}", file=out)
+            print(f"   Inflation Pressure: {supply_analysis['inflation_pressure']}", file=out)
         
         # Test 3: Liquidity Analysis
-        print("\n💧 Testing Liquidity Analysis...")
+        print("\n💧 Testing Liquidity Analysis...", file=out)
         if coingecko_data:
             liquidity_analysis = service.analyze_liquidity(coingecko_data['market'])
-            print(f"✅ Liquidity Analysis:")
-            print(f"   Market Cap Tier: {liquidity_analysis['market_cap_tier']}")
-            print(f"   Liquidity Rating: {liquidity_analysis['liquidity_rating']}")
-            print(f"   Volume Rating: {liquidity_analysis['volume_rating']}")
+            print(f"✅ Liquidity Analysis:", file=out)
+            print(f"   Market Cap Tier: {liquidity_analysis['market_cap_tier']}", file=out)
+            print(f"   Liquidity Rating: {liquidity_analysis['liquidity_rating']}", file=out)
+            print(f"   Volume Rating: {liquidity_analysis['volume_rating']}", file=out)
         
         # Test 4: Developer Activity
-        print("\n👨‍💻 Testing Developer Activity Assessment...")
+        print("\n👨‍💻 Testing Developer Activity Assessment...", file=out)
         if coingecko_data:
             developer_assessment = service.assess_developer_activity(coingecko_data['developer'])
-            print(f"✅ Developer Assessment:")
-            print(f"   Activity Level: {developer_assessment['activity_level']}")
-            print(f"   Project Health: {developer_assessment['project_health']}")
+            print(f"✅ Developer Assessment:", file=out)
+            print(f"   Activity Level: {developer_assessment['activity_level']}", file=out)
+            print(f"   Project Health: {developer_assessment['project_health']}", file=out)
         
         # Test 5: Comprehensive Tokenomics
-        print("\n🎯 Testing Comprehensive Tokenomics Aggregation...")
-        comprehensive = await service.get_comprehensive_tokenomics(
-            symbol="ETHUSDT",
-            current_price=3500,
-            market_cap=420000000000,
-            volume_24h=15000000000
-        )
-        
-        print(f"✅ Comprehensive Tokenomics:")
-        print(f"   Coin: {comprehensive.get('coin_name', 'N/A')}")
-        print(f"   Blockchain: {comprehensive.get('blockchain', 'N/A')}")
-        print(f"   Data Quality: {comprehensive.get('data_quality', 'N/A')}")
-        print(f"\n   Supply Analysis:")
+        print("\n🎯 Testing Comprehensive Tokenomics Aggregation...", file=out)
+        print(f"✅ Comprehensive Tokenomics:", file=out)
+        print(f"   Coin: {comprehensive.get('coin_name', 'N/A')}", file=out)
+        print(f"   Blockchain: {comprehensive.get('blockchain', 'N/A')}", file=out)
+        print(f"   Data Quality: {comprehensive.get('data_quality', 'N/A')}", file=out)
+        print(f"\n   Supply Analysis:", file=out)
         supply_anal = comprehensive.get('supply_analysis', {})
-        print(f"      Type: {supply_anal.get('inflation_type', 'N/A')}")
-        print(f"      Pressure: {supply_anal.get('inflation_pressure', 'N/A')}")
-        print(f"\n   Liquidity Analysis:")
+        print(f"      Type: {supply_anal.get('inflation_type', 'N/A')}", file=out)
+        print(f"      Pressure: {supply_anal.get('inflation_pressure', 'N/A')}", file=out)
+        print(f"\n   Liquidity Analysis:", file=out)
         liq_anal = comprehensive.get('liquidity_analysis', {})
-        print(f"      Tier: {liq_anal.get('market_cap_tier', 'N/A')}")
-        print(f"      Rating: {liq_anal.get('liquidity_rating', 'N/A')}")
-        print(f"\n   Developer Assessment:")
+        print(f"      Tier: {liq_anal.get('market_cap_tier', 'N/A')}", file=out)
+        print(f"      Rating: {liq_anal.get('liquidity_rating', 'N/A')}", file=out)
+        print(f"\n   Developer Assessment:", file=out)
         dev_assess = comprehensive.get('developer_assessment', {})
-        print(f"      Activity: {dev_assess.get('activity_level', 'N/A')}")
-        print(f"      Health: {dev_assess.get('project_health', 'N/A')}")
+        print(f"      Activity: {dev_assess.get('activity_level', 'N/A')}", file=out)
+        print(f"      Health: {dev_assess.get('project_health', 'N/A')}", file=out)
         
-        await service.close()
-        
-        print("\n✅ All Tokenomics Service tests passed!")
+        print("\n✅ All Tokenomics Service tests passed!", file=out)
         return True
         
     except Exception as e:
-        print(f"\n❌ Tokenomics Service test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"\n❌ Tokenomics Service test failed: {e}", file=out)
+        traceback.print_exc(file=out)
         return False
     finally:
-        db.close()
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
 
 
-async def test_tokenomics_analyst_with_real_data():
-    """Test Tokenomics Analyst using real data."""
-    print("\n" + "="*80)
-    print("TEST 2: Tokenomics Analyst with Real Data")
-    print("="*80)
-    
-    db = SessionLocal()
+async def test_tokenomics_analyst_with_real_data(token_data):
+    """Test Tokenomics Analyst using real data fetched once in main()."""
+    out = io.StringIO()
+    print("\n" + SEP, file=out)
+    print("TEST 2: Tokenomics Analyst with Real Data", file=out)
+    print(SEP, file=out)
     
     try:
-        # First, fetch comprehensive tokenomics data
-        print("\n📡 Fetching real tokenomics data...")
-        tokenomics_service = TokenomicsService(db)
-        
-        token_data = await tokenomics_service.get_comprehensive_tokenomics(
-            symbol="BTCUSDT",
-            current_price=45000,
-            market_cap=880000000000,
-            volume_24h=30000000000
-        )
-        
-        await tokenomics_service.close()
-        
-        print(f"✅ Fetched tokenomics data:")
-        print(f"   Coin: {token_data.get('coin_name', 'N/A')}")
-        print(f"   Data Quality: {token_data.get('data_quality', 'N/A')}")
+        print(f"\n✅ Fetched tokenomics data:", file=out)
+        print(f"   Coin: {token_data.get('coin_name', 'N/A')}", file=out)
+        print(f"   Data Quality: {token_data.get('data_quality', 'N/A')}", file=out)
         
         # Now run Tokenomics Analyst
-        print("\n🤖 Running Tokenomics Analyst with real data...")
-        
-        llm_client = LLMClient(db)
-        analyst = TokenomicsAnalyst(db, llm_client)
+        print("\n🤖 Running Tokenomics Analyst with real data...", file=out)
         
         context = {
             "symbol": "BTCUSDT",
@@ -165,62 +169,66 @@ async def test_tokenomics_analyst_with_real_data():
             "token_data": token_data
         }
         
-        result = analyst.analyze_structured(context)
+        # Only hold a session (and its pooled connection) for the LLM call
+        with SessionLocal() as db:
+            analyst = TokenomicsAnalyst(db, LLMClient(db))
+            result = await analyst.aanalyze_structured(context)
         
-        print(f"\n✅ Tokenomics Analysis Complete:")
+        print(f"\n✅ Tokenomics Analysis Complete:", file=out)
         analysis = result["analysis"]
         
-        print(f"\n📊 TOKENOMICS ANALYSIS RESULTS:")
-        print(f"   Fundamental Rating: {analysis['fundamental_rating']}")
-        print(f"   Value Assessment: {analysis['value_assessment']}")
-        print(f"   Long-term Outlook: {analysis['long_term_outlook']}")
-        print(f"   Competitive Position: {analysis['competitive_position'][:100]}...")
-        print(f"   Confidence: {analysis['confidence']}%")
+        print(f"\n📊 TOKENOMICS ANALYSIS RESULTS:", file=out)
+        print(f"   Fundamental Rating: {analysis['fundamental_rating']}", file=out)
+        print(f"   Value Assessment: {analysis['value_assessment']}", file=out)
+        print(f"   Long-term Outlook: {analysis['long_term_outlook']}", file=out)
+        print(f"   Competitive Position: {analysis['competitive_position'][:100]}...", file=out)
+        print(f"   Confidence: {analysis['confidence']}%", file=out)
         
-        print(f"\n📈 Supply Analysis:")
+        print(f"\n📈 Supply Analysis:", file=out)
         supply_analysis = analysis.get('supply_analysis', {})
         if isinstance(supply_analysis, dict):
-            print(f"   Inflation Rate: {supply_analysis.get('inflation_rate', 'N/A')}")
-            print(f"   Supply Distribution: {supply_analysis.get('supply_distribution', 'N/A')[:80]}...")
+            print(f"   Inflation Rate: {supply_analysis.get('inflation_rate', 'N/A')}", file=out)
+            print(f"   Supply Distribution: {supply_analysis.get('supply_distribution', 'N/A')[:80]}...", file=out)
         
-        print(f"\n💧 Liquidity Analysis:")
+        print(f"\n💧 Liquidity Analysis:", file=out)
         liquidity_analysis = analysis.get('liquidity_analysis', {})
         if isinstance(liquidity_analysis, dict):
-            print(f"   Market Cap Size: {liquidity_analysis.get('market_cap_size', 'N/A')}")
-            print(f"   Trading Liquidity: {liquidity_analysis.get('trading_liquidity', 'N/A')[:80]}...")
+            print(f"   Market Cap Size: {liquidity_analysis.get('market_cap_size', 'N/A')}", file=out)
+            print(f"   Trading Liquidity: {liquidity_analysis.get('trading_liquidity', 'N/A')[:80]}...", file=out)
         
-        print(f"\n💪 Strengths ({len(analysis.get('strengths', []))}):")
+        print(f"\n💪 Strengths ({len(analysis.get('strengths', []))}):", file=out)
         for strength in analysis.get('strengths', [])[:3]:
-            print(f"   • {strength}")
+            print(f"   • {strength}", file=out)
         
-        print(f"\n⚠️  Weaknesses ({len(analysis.get('weaknesses', []))}):")
+        print(f"\n⚠️  Weaknesses ({len(analysis.get('weaknesses', []))}):", file=out)
         for weakness in analysis.get('weaknesses', [])[:3]:
-            print(f"   • {weakness}")
+            print(f"   • {weakness}", file=out)
         
-        print(f"\n🎯 Key Observations ({len(analysis.get('key_observations', []))}):")
+        print(f"\n🎯 Key Observations ({len(analysis.get('key_observations', []))}):", file=out)
         for obs in analysis.get('key_observations', [])[:3]:
-            print(f"   • {obs}")
+            print(f"   • {obs}", file=out)
         
-        print(f"\n📈 Trading Implication:")
-        print(f"   {analysis.get('trading_implication', 'N/A')[:150]}...")
+        print(f"\n📈 Trading Implication:", file=out)
+        print(f"   {analysis.get('trading_implication', 'N/A')[:150]}...", file=out)
         
-        print("\n✅ Tokenomics Analyst test passed!")
+        print("\n✅ Tokenomics Analyst test passed!", file=out)
         return True
         
     except Exception as e:
-        print(f"\n❌ Tokenomics Analyst test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"\n❌ Tokenomics Analyst test failed: {e}", file=out)
+        traceback.print_exc(file=out)
         return False
     finally:
-        db.close()
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
 
 
-async def test_comparison_mock_vs_real():
+async def test_comparison_mock_vs_real(real_token_data):
     """Compare tokenomics analysis with mock vs real data."""
-    print("\n" + "="*80)
-    print("TEST 3: Comparison - Mock Data vs Real Data")
-    print("="*80)
+    out = io.StringIO()
+    print("\n" + SEP, file=out)
+    print("TEST 3: Comparison - Mock Data vs Real Data", file=out)
+    print(SEP, file=out)
     
     db = SessionLocal()
     
@@ -228,8 +236,6 @@ async def test_comparison_mock_vs_real():
         llm_client = LLMClient(db)
         analyst = TokenomicsAnalyst(db, llm_client)
         
-        # Test with mock data
-        print("\n❌ Running with MOCK data (old approach)...")
         mock_context = {
             "symbol": "BTCUSDT",
             "current_price": 45000,
@@ -237,80 +243,97 @@ async def test_comparison_mock_vs_real():
             "volume_24h": 30000000000,
             "token_data": {}  # Empty = mock data
         }
+        real_context = {**mock_context, "token_data": real_token_data}
         
-        mock_result = analyst.analyze_structured(mock_context)
-        mock_confidence = mock_result["analysis"]["confidence"]
-        print(f"   Confidence with mock data: {mock_confidence}%")
-        print(f"   Value Assessment: {mock_result['analysis']['value_assessment']}")
-        
-        # Test with real data
-        print("\n✅ Running with REAL data (new approach)...")
-        tokenomics_service = TokenomicsService(db)
-        real_token_data = await tokenomics_service.get_comprehensive_tokenomics(
-            symbol="BTCUSDT",
-            current_price=45000,
-            market_cap=880000000000,
-            volume_24h=30000000000
+        # The two analyses are independent, so run them side by side
+        mock_result, real_result = await asyncio.gather(
+            analyst.aanalyze_structured(mock_context),
+            analyst.aanalyze_structured(real_context)
         )
-        await tokenomics_service.close()
         
-        real_context = {
-            "symbol": "BTCUSDT",
-            "current_price": 45000,
-            "market_cap": 880000000000,
-            "volume_24h": 30000000000,
-            "token_data": real_token_data
-        }
+        # Test with mock data
+        print("\n❌ Ran with MOCK data (old approach):", file=out)
+        mock_confidence = mock_result["analysis"]["confidence"]
+        print(f"   Confidence with mock data: {mock_confidence}%", file=out)
+        print(f"   Value Assessment: {mock_result['analysis']['value_assessment']}", file=out)
         
-        real_result = analyst.analyze_structured(real_context)
+        # Test with real data
+        print("\n✅ Ran with REAL data (new approach):", file=out)
         real_confidence = real_result["analysis"]["confidence"]
-        print(f"   Confidence with real data: {real_confidence}%")
-        print(f"   Value Assessment: {real_result['analysis']['value_assessment']}")
+        print(f"   Confidence with real data: {real_confidence}%", file=out)
+        print(f"   Value Assessment: {real_result['analysis']['value_assessment']}", file=out)
         
         # Compare
-        print(f"\n📊 COMPARISON:")
-        print(f"   Confidence Delta: {real_confidence - mock_confidence:+d}%")
-        print(f"   Data Quality: Real data provides supply, market, community, and developer metrics")
-        print(f"   Mock Limitations: No supply info, no developer activity, no community data")
-        print(f"   Improvement: {'✅ Significant' if abs(real_confidence - mock_confidence) > 10 else '⚠️  Minimal'}")
+        print(f"\n📊 COMPARISON:", file=out)
+        print(f"   Confidence Delta: {real_confidence - mock_confidence:+d}%", file=out)
+        print(f"   Data Quality: Real data provides supply, market, community, and developer metrics", file=out)
+        print(f"   Mock Limitations: No supply info, no developer activity, no community data", file=out)
+        print(f"   Improvement: {'✅ Significant' if abs(real_confidence - mock_confidence) > 10 else '⚠️  Minimal'}", file=out)
         
-        print("\n✅ Comparison test passed!")
+        print("\n✅ Comparison test passed!", file=out)
         return True
         
     except Exception as e:
-        print(f"\n❌ Comparison test failed: {e}")
-        import traceback
-        traceback.print_exc()
+        print(f"\n❌ Comparison test failed: {e}", file=out)
+        traceback.print_exc(file=out)
         return False
     finally:
         db.close()
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
 
 
 async def main():
     """Run all tests."""
     print("\n🚀 Tokenomics Analyst Improvement Tests")
-    print("="*80)
+    print(SEP)
     print("Testing real tokenomics data integration:")
     print("  1. CoinGecko comprehensive data")
     print("  2. Supply structure analysis")
     print("  3. Liquidity and market tier assessment")
     print("  4. Developer activity tracking")
     print("  5. LLM analysis with real data")
-    print("="*80)
-    
-    # Test 1: Tokenomics Service
-    test1_passed = await test_tokenomics_service()
+    print(SEP)
     
-    # Test 2: Tokenomics Analyst with real data
-    test2_passed = await test_tokenomics_analyst_with_real_data()
+    # One service and one fetch per symbol shared by every test
+    db = SessionLocal()
+    service = TokenomicsService(db)
     
-    # Test 3: Comparison
-    test3_passed = await test_comparison_mock_vs_real()
+    try:
+        print(f"\n📡 Fetching real tokenomics data for {len(SYMBOLS)} symbols...")
+        tasks = [
+            asyncio.create_task(service.get_comprehensive_tokenomics(
+                symbol=symbol,
+                current_price=price,
+                market_cap=market_cap,
+                volume_24h=volume
+            ))
+            for symbol, price, market_cap, volume in SYMBOLS
+        ]
+        token_data = {}
+        for fut in asyncio.as_completed(tasks):
+            data = await fut
+            token_data[data['symbol']] = data
+            print_summary(data)
+        btc_data = token_data["BTCUSDT"]
+        
+        # Each test buffers its own output, so running them concurrently
+        # keeps every report in one piece
+        results = await asyncio.gather(
+            test_tokenomics_service(service),
+            test_tokenomics_analyst_with_real_data(btc_data),
+            test_comparison_mock_vs_real(btc_data),
+            return_exceptions=True
+        )
+        test1_passed, test2_passed, test3_passed = (r is True for r in results)
+    finally:
+        await service.close()
+        db.close()
     
     # Summary
-    print("\n" + "="*80)
+    print("\n" + SEP)
     print("TEST SUMMARY")
-    print("="*80)
+    print(SEP)
     print(f"Tokenomics Service: {'✅ PASSED' if test1_passed else '❌ FAILED'}")
     print(f"Tokenomics Analyst: {'✅ PASSED' if test2_passed else '❌ FAILED'}")
     print(f"Mock vs Real: {'✅ PASSED' if test3_passed else '❌ FAILED'}")
@@ -329,4 +352,11 @@ async def main():
 
 
 if __name__ == "__main__":
+    # uvloop comes with uvicorn[standard]; fall back to the default loop without it
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
     asyncio.run(main())
@@ -0,0 +1,122 @@
+"""
+Shared helpers for the signal debug scripts.
+
+Kline fetches and indicator calculations are cached on disk, so iterating
+on a script doesn't refetch and recompute identical data on every run.
+"""
+import asyncio
+import hashlib
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from app.services.binance import BinanceService
+from app.services.indicators import calculate_rsi, calculate_macd
+
+
+HOUR_MS = 60 * 60 * 1000
+
+
+def klines_to_frame(klines) -> pd.DataFrame:
+    """
+    Convert raw Binance klines to an OHLCV DataFrame indexed by open time.
+    
+    Args:
+        klines: Klines as returned by BinanceService.fetch_klines
+    
+    Returns:
+        DataFrame with open, high, low, close and volume columns
+    """
+    # Convert whole columns at once instead of building a dict per candle
+    arr = np.asarray(klines, dtype=object)
+    df = pd.DataFrame({
+        "open": arr[:, 1].astype(np.float64),
+        "high": arr[:, 2].astype(np.float64),
+        "low": arr[:, 3].astype(np.float64),
+        "close": arr[:, 4].astype(np.float64),
+        "volume": arr[:, 5].astype(np.float64),
+    }, index=pd.to_datetime(arr[:, 0].astype(np.int64), unit="ms"))
+    df.index.name = "timestamp"
+    return df
+
+
+async def load_indicators(
+    binance: BinanceService,
+    symbol: str,
+    interval: str,
+    start_time: int,
+    end_time: int,
+    limit: int = 100
+) -> pd.DataFrame:
+    """
+    Fetch klines and add RSI/MACD columns, reusing a cached copy if present.
+    
+    Results are pickled to the temp directory (pyarrow isn't a dependency,
+    so parquet isn't available), keyed on the fetch arguments.
+    
+    Args:
+        binance: Binance service to fetch with on a cache miss
+        symbol: Trading pair symbol
+        interval: Timeframe
+        start_time: Start timestamp in milliseconds
+        end_time: End timestamp in milliseconds
+        limit: Number of candles to fetch (max 1000)
+    
+    Returns:
+        OHLCV DataFrame with rsi, macd, macd_signal and macd_hist columns
+    """
+    key = hashlib.sha1(f"{symbol}{interval}{start_time}{end_time}{limit}".encode()).hexdigest()[:16]
+    path = Path(tempfile.gettempdir()) / f"klines_{key}.pkl"
+    if path.exists():
+        return pd.read_pickle(path)
+    
+    klines = await binance.fetch_klines(
+        symbol=symbol,
+        interval=interval,
+        limit=limit,
+        start_time=start_time,
+        end_time=end_time
+    )
+    df = klines_to_frame(klines)
+    
+    df["rsi"] = calculate_rsi(df, 14)
+    macd_data = calculate_macd(df)
+    df["macd"] = macd_data["macd"]
+    df["macd_signal"] = macd_data["macd_signal"]
+    df["macd_hist"] = macd_data["macd_diff"]
+    
+    df.to_pickle(path)
+    return df
+
+
+async def load_recent_indicators(symbols: List[str], days: int, limit: int = 100) -> List[pd.DataFrame]:
+    """
+    Load hourly indicator frames for the last `days` days, one per symbol.
+    
+    The symbols are fetched concurrently. The window ends on the current
+    hour, so reruns within the hour hit the load_indicators cache.
+    
+    Args:
+        symbols: Trading pair symbols
+        days: Days of history to load
+        limit: Number of candles to fetch per symbol (max 1000)
+    
+    Returns:
+        Indicator frames in the same order as symbols
+    """
+    end_time = int(datetime.now().timestamp() * 1000) // HOUR_MS * HOUR_MS
+    start_time = end_time - days * 24 * HOUR_MS
+    
+    binance = BinanceService()
+    try:
+        return await asyncio.gather(*[
+            load_indicators(binance, symbol, "1h", start_time, end_time, limit=limit)
+            for symbol in symbols
+        ])
+    finally:
+        await binance.close()
+        binance.close_sync()
@@ -5,7 +5,7 @@ Tests all agents with mocked LLM responses.
 """
 import json
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from decimal import Decimal
 from datetime import datetime
 
@@ -17,6 +17,7 @@ from app.agents.researcher import Researcher
 from app.agents.trader import Trader
 from app.agents.risk import RiskManager
 from app.agents.pipeline import AgentPipeline
+from app.agents.researcher_react import ResearcherReAct
 
 
 @pytest.fixture
@@ -122,6 +123,143 @@ class TestLLMClient:
         
         with pytest.raises(BudgetExceededError):
             client.call(messages, agent_name="test_agent")
+    
+    @patch('app.agents.llm_client.OpenAI')
+    def test_call_response_cache(self, mock_openai_class):
+        """Test identical calls are served from the response cache when enabled."""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app.core.database import Base
+        
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = '{"test": "response"}'
+        mock_response.choices[0].finish_reason = "stop"
+        mock_response.usage.prompt_tokens = 100
+        mock_response.usage.completion_tokens = 50
+        mock_response.usage.total_tokens = 150
+        mock_client.chat.completions.create.return_value = mock_response
+        
+        client = LLMClient(db)
+        messages = [{"role": "user", "content": "Test message"}]
+        
+        with patch('app.agents.llm_client.settings.llm_cache', True):
+            first = client.call(messages, agent_name="test_agent")
+            second = client.call(messages, agent_name="test_agent")
+            client.call(messages, agent_name="test_agent", temperature=0.0)
+        
+        assert second["content"] == first["content"]
+        assert second["cached"] is True
+        assert second["cost"] == 0.0
+        assert mock_client.chat.completions.create.call_count == 2
+        db.close()
+    
+    @patch('app.agents.llm_client.OpenAI')
+    def test_call_ignores_corrupt_cache_entry(self, mock_openai_class):
+        """Test an undecodable cache entry falls back to the API instead of raising."""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app.core.database import Base
+        from app.models import LLMResponseCache
+        
+        engine = create_engine('sqlite:///:memory:')
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        
+        mock_client = Mock()
+        mock_openai_class.return_value = mock_client
+        mock_response = Mock()
+        mock_response.choices = [Mock()]
+        mock_response.choices[0].message.content = '{"test": "response"}'
+        mock_response.choices[0].finish_reason = "stop"
+        mock_response.usage.prompt_tokens = 100
+        mock_response.usage.completion_tokens = 50
+        mock_response.usage.total_tokens = 150
+        mock_client.chat.completions.create.return_value = mock_response
+        
+        client = LLMClient(db)
+        messages = [{"role": "user", "content": "Test message"}]
+        
+        with patch('app.agents.llm_client.settings.llm_cache', True):
+            client.call(messages, agent_name="test_agent")
+            for row in db.query(LLMResponseCache).all():
+                row.payload = b"not zlib"
+            db.commit()
+            result = client.call(messages, agent_name="test_agent")
+        
+        assert result["content"] == '{"test": "response"}'
+        assert mock_client.chat.completions.create.call_count == 2
+        db.close()
+    
+    @patch('app.agents.llm_client.AsyncOpenAI')
+    def test_acall_streams_tokens(self, mock_async_openai_class, mock_db):
+        """Test streamed calls forward text chunks and reassemble tool calls."""
+        import asyncio
+        from types import SimpleNamespace as NS
+        
+        def chunk(content=None, tool_calls=None, finish_reason=None, usage=None):
+            choices = [] if usage else [NS(delta=NS(content=content, tool_calls=tool_calls), finish_reason=finish_reason)]
+            return NS(choices=choices, usage=usage)
+        
+        async def stream():
+            yield chunk(content="Thought: ")
+            yield chunk(content="check news")
+            yield chunk(tool_calls=[NS(index=0, id="call_1", function=NS(name="fetch_recent_news", arguments='{"sym'))])
+            yield chunk(tool_calls=[NS(index=0, id=None, function=NS(name=None, arguments='bol": "BTCUSDT"}'))])
+            yield chunk(finish_reason="tool_calls")
+            yield chunk(usage=NS(prompt_tokens=100, completion_tokens=20, total_tokens=120))
+        
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(return_value=stream())
+        mock_async_openai_class.return_value = mock_client
+        
+        client = LLMClient(mock_db)
+        chunks = []
+        result = asyncio.run(client.acall(
+            [{"role": "user", "content": "Test message"}],
+            tools=[{"type": "function", "function": {"name": "fetch_recent_news"}}],
+            on_token=chunks.append
+        ))
+        
+        assert chunks == ["Thought: ", "check news"]
+        assert result["content"] == "Thought: check news"
+        assert result["tool_calls"] == [
+            {"id": "call_1", "name": "fetch_recent_news", "arguments": {"symbol": "BTCUSDT"}}
+        ]
+        assert result["total_tokens"] == 120
+        assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+    
+    @patch('app.agents.llm_client.AsyncOpenAI')
+    def test_acall_malformed_tool_arguments(self, mock_async_openai_class, mock_db):
+        """Test malformed tool arguments are dropped without retrying the paid call."""
+        import asyncio
+        from types import SimpleNamespace as NS
+        
+        bad_call = NS(id="call_1", function=NS(name="fetch_recent_news", arguments='{"symbol": "BTCUSDT",}'))
+        response = NS(
+            choices=[NS(message=NS(content="Thought: check news", tool_calls=[bad_call]), finish_reason="tool_calls")],
+            usage=NS(prompt_tokens=100, completion_tokens=20, total_tokens=120)
+        )
+        mock_client = Mock()
+        mock_client.chat.completions.create = AsyncMock(return_value=response)
+        mock_async_openai_class.return_value = mock_client
+        
+        client = LLMClient(mock_db)
+        result = asyncio.run(client.acall(
+            [{"role": "user", "content": "Test message"}],
+            tools=[{"type": "function", "function": {"name": "fetch_recent_news"}}]
+        ))
+        
+        assert result["tool_calls"] == []
+        assert result["content"] == "Thought: check news"
+        assert mock_client.chat.completions.create.call_count == 1
+        assert mock_db.add.call_args.args[0].tokens_used == 120
 
 
 class TestTechnicalAnalyst:
@@ -557,3 +695,43 @@ class TestAgentPipeline:
         assert result["status"] == "failed"
         assert len(result["errors"]) > 0
         assert result["errors"][0]["type"] == "budget_exceeded"
+
+
+class TestReActAgent:
+    """Tests for the ReAct agent loop."""
+    
+    def test_tool_schemas(self, mock_db):
+        """Test tool signatures are exposed as function-calling schemas."""
+        researcher = ResearcherReAct(mock_db, Mock(), max_iterations=3)
+        schemas = {s["function"]["name"]: s["function"] for s in researcher.tool_schemas}
+        
+        news = schemas["fetch_recent_news"]["parameters"]
+        assert news["properties"] == {"symbol": {"type": "string"}, "hours": {"type": "integer"}}
+        assert news["required"] == ["symbol"]
+        
+        other = ResearcherReAct(mock_db, Mock(), max_iterations=3)
+        assert other.tool_schemas[0] is researcher.tool_schemas[0]
+    
+    def test_react_loop_uses_native_tool_calls(self, mock_db):
+        """Test each step is one completion whose tool call is executed as the action."""
+        import asyncio
+        
+        llm_client = Mock()
+        llm_client.acall = AsyncMock(side_effect=[
+            {
+                "content": "Thought: Check the news first.",
+                "tool_calls": [{"id": "call_1", "name": "fetch_recent_news", "arguments": {"symbol": "BTCUSDT"}}],
+            },
+            {"content": 'Final Answer: {"direction": "bullish", "conviction": 70}', "tool_calls": []},
+        ])
+        researcher = ResearcherReAct(mock_db, llm_client, max_iterations=3)
+        
+        result = asyncio.run(researcher.react_loop("Form a thesis", {"symbol": "BTCUSDT"}))
+        
+        assert llm_client.acall.await_count == 2
+        assert llm_client.acall.call_args.kwargs["tool_choice"] == "auto"
+        assert result["analysis"]["direction"] == "bullish"
+        history = result["metadata"]["history"]
+        assert [h["type"] for h in history] == ["thought", "action", "observation"]
+        assert history[0]["content"] == "Check the news first."
+        assert history[1]["content"] == "fetch_recent_news(symbol=BTCUSDT)"
@@ -188,3 +188,56 @@ def test_bollinger_bands_width(sample_candles):
     assert indicators['bb_upper'] > indicators['bb_middle']
     assert indicators['bb_middle'] > indicators['bb_lower']
     assert indicators['bb_width'] > 0
+
+
+def test_timeframe_stats_matches_masks():
+    """Test the fused signal counter agrees with the equivalent numpy masks."""
+    import numpy as np
+    from app.services.indicators_numba import timeframe_stats
+    
+    rng = np.random.default_rng(42)
+    n = 500
+    macd, sig = rng.normal(0, 1, n), rng.normal(0, 1, n)
+    rsi = rng.uniform(0, 100, n)
+    close = rng.normal(100, 5, n)
+    bb_lo, bb_up = close + rng.normal(2, 3, n), close - rng.normal(2, 3, n)
+    vol, vol_ma = rng.uniform(0, 3, n), np.ones(n)
+    rsi[:14] = bb_lo[:20] = bb_up[:20] = vol_ma[:20] = np.nan
+    
+    above = macd > sig
+    prev = np.concatenate(([False], above[:-1]))
+    bull, bear = ~prev & above, prev & ~above
+    entries = bull & (rsi < 50)
+    surge = (vol / vol_ma >= 1.5) & ~np.isnan(bb_lo) & ~np.isnan(bb_up)
+    expected = (
+        bull.sum(), bear.sum(), entries.sum(), (bear & (rsi > 50)).sum(),
+        (surge & (close <= bb_lo)).sum(), (surge & (close >= bb_up)).sum(),
+    )
+    
+    result = timeframe_stats(macd, sig, rsi, close, bb_lo, bb_up, vol, vol_ma, 1.5)
+    
+    assert tuple(result[:6]) == expected
+    assert np.array_equal(result[6], entries)
+
+
+def test_cross_signals_matches_shifted_masks():
+    """Test the crossover kernel agrees with the pandas shift(1) comparisons."""
+    import numpy as np
+    import pandas as pd
+    from app.services.indicators_numba import cross_signals
+    
+    rng = np.random.default_rng(7)
+    n = 500
+    macd, sig = pd.Series(rng.normal(0, 1, n)), pd.Series(rng.normal(0, 1, n))
+    rsi = pd.Series(rng.uniform(0, 100, n))
+    macd[:25] = np.nan
+    sig[:33] = np.nan
+    rsi[:14] = np.nan
+    
+    bull = (macd > sig) & (macd.shift(1) <= sig.shift(1))
+    bear = (macd < sig) & (macd.shift(1) >= sig.shift(1))
+    
+    entries, exits = cross_signals(rsi.to_numpy(), macd.to_numpy(), sig.to_numpy(), 50.0, 50.0)
+    
+    assert np.array_equal(entries, (bull & (rsi < 50)).to_numpy())
+    assert np.array_equal(exits, (bear & (rsi > 50)).to_numpy())
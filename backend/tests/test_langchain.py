@@ -0,0 +1,97 @@
+"""
+Tests for LangChain-based agents.
+"""
+import asyncio
+import threading
+from unittest.mock import Mock, patch
+from langchain_core.language_models.fake_chat_models import FakeMessagesListChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool
+
+from app.langchain.agents import LangChainResearcher
+
+
+RESEARCH_CONTEXT = {
+    "symbol": "BTCUSDT",
+    "current_price": 44500,
+    "technical_analysis": {
+        "recommendation": "strong_buy",
+        "confidence": 85,
+        "key_insight": "RSI oversold",
+        "top_signals": ["RSI: 28"]
+    },
+    "sentiment_analysis": {
+        "recommendation": "bearish",
+        "confidence": 70,
+        "key_insight": "Extreme fear",
+        "top_signals": ["Fear & Greed: 25"]
+    },
+    "tokenomics_analysis": {
+        "recommendation": "hold",
+        "confidence": 60,
+        "key_insight": "Fairly valued",
+        "top_signals": ["Market cap: mega"]
+    }
+}
+
+RENDEZVOUS_TIMEOUT = 5.0
+
+
+class FakeToolCallingModel(FakeMessagesListChatModel):
+    """Fake chat model that accepts tool bindings."""
+    
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def slow_tool(name, barrier=None):
+    """
+    Create a blocking tool, optionally waiting at a barrier before returning.
+    
+    A two-party barrier only releases when both tools are running at once;
+    run one after the other, the first one times out.
+    """
+    def run(symbol: str) -> str:
+        if barrier is not None:
+            barrier.wait()
+        return f"{name} data for {symbol}"
+    
+    return StructuredTool.from_function(func=run, name=name, description=f"Fetch {name}")
+
+
+def test_researcher_runs_tool_calls_in_parallel():
+    """Test tool calls emitted in one step run concurrently."""
+    llm = FakeToolCallingModel(responses=[
+        AIMessage(content="", tool_calls=[
+            {"name": "fetch_news", "args": {"symbol": "BTCUSDT"}, "id": "call_1"},
+            {"name": "fetch_order_book", "args": {"symbol": "BTCUSDT"}, "id": "call_2"},
+        ]),
+        AIMessage(content='{"direction": "bullish", "confidence": 65}'),
+    ])
+    barrier = threading.Barrier(2, timeout=RENDEZVOUS_TIMEOUT)
+    tools = [slow_tool("fetch_news", barrier), slow_tool("fetch_order_book", barrier)]
+    
+    with patch("app.langchain.agents.create_chat_model", return_value=llm), \
+         patch("app.langchain.agents.create_researcher_tools", return_value=tools):
+        researcher = LangChainResearcher(Mock(), max_iterations=3, enable_parallel_tools=True)
+        result = asyncio.run(researcher.analyze(RESEARCH_CONTEXT))
+    
+    assert sorted(result["metadata"]["tools_used"]) == ["fetch_news", "fetch_order_book"]
+    assert result["analysis"]["direction"] == "bullish"
+    assert not barrier.broken
+
+
+def test_researcher_parallel_tools_prompt_is_cacheable():
+    """Test prompt caching applies to the native tool-calling prompt too."""
+    llm = FakeToolCallingModel(responses=[AIMessage(content="{}")])
+    
+    with patch("app.langchain.agents.create_chat_model", return_value=llm), \
+         patch("app.langchain.agents.create_researcher_tools", return_value=[slow_tool("fetch_news")]):
+        researcher = LangChainResearcher(Mock(), enable_prompt_cache=True, enable_parallel_tools=True)
+    
+    messages = researcher.prompt.format_messages(analyst_outputs="outputs", agent_scratchpad=[])
+    system_block = messages[0].content[0]
+    
+    assert messages[0].type == "system"
+    assert system_block["cache_control"] == {"type": "ephemeral"}
+    assert "outputs" in messages[1].content
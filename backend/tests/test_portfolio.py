@@ -204,3 +204,39 @@ def test_average_entry_price(portfolio_manager):
     expected_avg = (50000.0 + 52000.0) / 2
     assert abs(position.avg_entry_price - expected_avg) < 0.01
     assert position.quantity == 0.02
+
+
+def test_batch_execute_trades(portfolio_manager):
+    """Test batch execution rolls back only the rejected trade."""
+    results = portfolio_manager.batch_execute_trades([
+        {"symbol": "BTCUSDT", "side": "BUY", "quantity": 0.01, "price": 50000.0},
+        {"symbol": "ETHUSDT", "side": "SELL", "quantity": 0.1, "price": 3000.0},
+        {"symbol": "BTCUSDT", "side": "SELL", "quantity": 0.005, "price": 52000.0},
+    ])
+    
+    assert [r['success'] for r in results] == [True, False, True]
+    assert "Insufficient position" in results[1]['error']
+    
+    position = portfolio_manager.get_position("BTCUSDT")
+    assert position.quantity == 0.005
+    assert portfolio_manager.get_position("ETHUSDT") is None
+    assert len(portfolio_manager.get_trade_history(limit=10)) == 2
+
+
+def test_get_position_uses_identity_map(portfolio_manager, db_session):
+    """Test repeat position lookups are served without a SELECT."""
+    from sqlalchemy import event
+    
+    portfolio_manager.execute_trade("BTCUSDT", "BUY", 0.01, 50000.0)
+    position = portfolio_manager.get_position("BTCUSDT")
+    
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert portfolio_manager.get_position("BTCUSDT") is position
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    
+    assert statements == []
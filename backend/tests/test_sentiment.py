@@ -0,0 +1,84 @@
+"""
+Tests for sentiment data service.
+"""
+import asyncio
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from app.services.sentiment import SentimentService
+
+
+RENDEZVOUS_TIMEOUT = 5.0
+
+
+def test_comprehensive_sentiment_fetches_sources_concurrently():
+    """Test the Fear & Greed and CoinGecko fetches overlap."""
+    service = SentimentService(Mock())
+    
+    # Each fetch waits for the other to start, which only completes if both
+    # are in flight at once; run one after the other, the first times out
+    async def fear_greed():
+        started["fear_greed"].set()
+        await asyncio.wait_for(started["coingecko"].wait(), RENDEZVOUS_TIMEOUT)
+        return {"value": 20, "classification": "Extreme Fear", "timestamp": None}
+    
+    async def coingecko(symbol):
+        started["coingecko"].set()
+        await asyncio.wait_for(started["fear_greed"].wait(), RENDEZVOUS_TIMEOUT)
+        return None
+    
+    service.fetch_fear_greed_index = fear_greed
+    service.fetch_coingecko_sentiment = coingecko
+    
+    async def run():
+        started.update(fear_greed=asyncio.Event(), coingecko=asyncio.Event())
+        return await service.get_comprehensive_sentiment(
+            symbol="BTCUSDT",
+            current_price=45000,
+            price_change_24h=2.5,
+            volume_24h=1_000_000,
+            avg_volume=650_000,
+            indicators={"rsi": 65.0, "macd": 100.0, "macd_signal": 95.0},
+        )
+    
+    started = {}
+    result = asyncio.run(run())
+    
+    assert result["fear_greed_index"]["value"] == 20
+    assert result["data_sources_available"]["fear_greed"] is True
+    assert result["data_sources_available"]["coingecko"] is False
+
+
+@pytest.mark.parametrize("rsi,label,extremes", [
+    (20, "extreme_fear", ["oversold"]),
+    (30, "fear", ["oversold"]),
+    (50, "neutral", []),
+    (70, "greed", ["overbought"]),
+    (80, "extreme_greed", ["overbought"]),
+    (float("nan"), "neutral", []),
+])
+def test_rsi_sentiment_buckets(rsi, label, extremes):
+    """Test RSI bucket boundaries, with NaN (indicator warm-up) reading as neutral."""
+    result = SentimentService(Mock()).analyze_technical_sentiment({"rsi": rsi})
+    
+    assert result["rsi_sentiment"] == label
+    assert result["extremes_detected"] == extremes
+
+
+@pytest.mark.parametrize("score,label", [
+    (-61, "Extreme Fear"),
+    (-60, "Fear"),
+    (-30, "Neutral"),
+    (29, "Neutral"),
+    (30, "Greed"),
+    (60, "Extreme Greed"),
+    (float("nan"), "Extreme Fear"),
+])
+def test_classify_sentiment_buckets(score, label):
+    """Test score bucket boundaries match the original if/elif chain."""
+    service = SentimentService(Mock())
+    
+    assert service._classify_sentiment(score) == label
+    assert SentimentService.classify_sentiment_batch(np.array([score], dtype=float))[0] == label
@@ -0,0 +1,306 @@
+"""
+Tests for tokenomics data service.
+"""
+import asyncio
+import orjson
+import pytest
+from unittest.mock import Mock, AsyncMock
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from app.core.database import Base
+from app.models.database import TokenomicsCache
+from app.services.tokenomics import TokenomicsService
+
+
+COINGECKO_BITCOIN = {
+    "name": "Bitcoin",
+    "asset_platform_id": None,
+    "categories": ["Cryptocurrency", "Layer 1 (L1)"],
+    "market_cap_rank": 1,
+    "market_data": {
+        "circulating_supply": 19_500_000,
+        "total_supply": 21_000_000,
+        "max_supply": 21_000_000,
+        "market_cap": {"usd": 1_000_000_000_000},
+        "fully_diluted_valuation": {"usd": 1_100_000_000_000},
+        "total_volume": {"usd": 30_000_000_000},
+        "ath": {"usd": 73_000},
+        "ath_change_percentage": {"usd": -5.0},
+        "atl": {"usd": 67.81},
+        "atl_change_percentage": {"usd": 100_000.0},
+        "price_change_percentage_24h": 1.5,
+        "price_change_percentage_7d": -2.0,
+    },
+    "community_data": {"twitter_followers": 6_000_000, "reddit_subscribers": 5_000_000},
+    "developer_data": {"commit_count_4_weeks": 120, "total_issues": 100, "closed_issues": 90},
+    "links": {"homepage": ["https://bitcoin.org"], "blockchain_site": [""], "official_forum_url": [""]},
+    "last_updated": "2026-01-01T00:00:00.000Z",
+}
+
+
+@pytest.fixture
+def db_session():
+    """Create a test database session."""
+    engine = create_engine('sqlite:///:memory:')
+    Base.metadata.create_all(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    session = SessionLocal()
+    
+    yield session
+    
+    session.close()
+
+
+@pytest.fixture(autouse=True)
+def clear_memory_cache():
+    """Reset the process-wide CoinGecko cache between tests."""
+    TokenomicsService._mem_cache.clear()
+    yield
+    TokenomicsService._mem_cache.clear()
+
+
+def make_service(db, payload=COINGECKO_BITCOIN):
+    """Create a service whose HTTP client returns the given CoinGecko payload."""
+    service = TokenomicsService(db)
+    response = Mock()
+    response.content = orjson.dumps(payload)
+    response.status_code = 200
+    response.headers = {"etag": 'W/"abc123"', "last-modified": "Thu, 01 Jan 2026 00:00:00 GMT"}
+    response.raise_for_status = Mock()
+    service.client = AsyncMock()
+    service.client.get = AsyncMock(return_value=response)
+    return service
+
+
+def test_fetch_coingecko_tokenomics(db_session):
+    """Test CoinGecko payload is parsed into tokenomics sections."""
+    service = make_service(db_session)
+    
+    data = asyncio.run(service.fetch_coingecko_tokenomics("BTCUSDT"))
+    
+    assert data["coin_id"] == "bitcoin"
+    assert data["supply"]["percentage_circulating"] == 92.86
+    assert data["market"]["market_cap"] == 1_000_000_000_000
+    assert data["market"]["fdv_to_mcap_ratio"] == 1.1
+    assert data["developer"]["commit_count_4_weeks"] == 120
+    assert data["links"]["homepage"] == "https://bitcoin.org"
+
+
+def test_fetch_unknown_symbol(db_session):
+    """Test unknown symbols return None without an HTTP call."""
+    service = make_service(db_session)
+    
+    assert asyncio.run(service.fetch_coingecko_tokenomics("FOOUSDT")) is None
+    service.client.get.assert_not_called()
+
+
+def test_fetch_uses_memory_cache(db_session):
+    """Test repeat fetches for the same coin are served from cache."""
+    service = make_service(db_session)
+    
+    first = asyncio.run(service.fetch_coingecko_tokenomics("BTCUSDT"))
+    second = asyncio.run(service.fetch_coingecko_tokenomics("BTCUSDT"))
+    
+    assert first == second
+    assert service.client.get.call_count == 1
+
+
+def test_concurrent_fetches_share_one_request(db_session):
+    """Test concurrent cold-cache fetches for one coin issue a single request."""
+    service = make_service(db_session)
+    response = service.client.get.return_value
+    
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0.05)
+        return response
+    
+    service.client.get.side_effect = slow_get
+    
+    # A second instance, as a concurrent request would create, shares the lookup
+    other = make_service(db_session)
+    
+    async def fetch_twice():
+        return await asyncio.gather(
+            service.fetch_coingecko_tokenomics("BTCUSDT"),
+            other.fetch_coingecko_tokenomics("BTCUSDT"),
+        )
+    
+    first, second = asyncio.run(fetch_twice())
+    
+    assert first == second
+    assert first is not second
+    assert service.client.get.call_count == 1
+    other.client.get.assert_not_called()
+    assert not service._inflight
+
+
+def test_fetch_retries_rate_limited_requests(db_session):
+    """Test 429 responses are retried, honoring Retry-After."""
+    service = make_service(db_session)
+    rate_limited = Mock(status_code=429, headers={"retry-after": "0"})
+    service.client.get.side_effect = [rate_limited, rate_limited, service.client.get.return_value]
+    
+    data = asyncio.run(service.fetch_coingecko_tokenomics("BTCUSDT"))
+    
+    assert data["coin_id"] == "bitcoin"
+    assert service.client.get.call_count == 3
+
+
+def test_fetch_uses_db_cache(db_session):
+    """Test a fresh service instance falls back to the database cache."""
+    asyncio.run(make_service(db_session).fetch_coingecko_tokenomics("BTCUSDT"))
+    assert db_session.get(TokenomicsCache, "bitcoin") is not None
+    
+    TokenomicsService._mem_cache.clear()
+    service = make_service(db_session)
+    data = asyncio.run(service.fetch_coingecko_tokenomics("BTCUSDT"))
+    
+    assert data["coin_id"] == "bitcoin"
+    service.client.get.assert_not_called()
+
+
+def test_comprehensive_tokenomics_batch(db_session):
+    """Test batch tokenomics keeps input order and falls back per symbol."""
+    service = make_service(db_session)
+    
+    results = asyncio.run(service.get_comprehensive_tokenomics_batch([
+        ("BTCUSDT", 50000.0, 1e12, 3e10),
+        ("FOOUSDT", 1.0, 1e6, 1e5),
+    ]))
+    
+    assert [r["symbol"] for r in results] == ["BTCUSDT", "FOOUSDT"]
+    assert results[0]["data_quality"] == "COMPREHENSIVE"
+    assert results[0]["liquidity_analysis"]["market_cap_tier"] == "mega"
+    assert results[1]["data_quality"] == "LIMITED_DATA"
+
+
+@pytest.mark.parametrize("market_cap,tier", [
+    (0, "micro"),
+    (99_999_999, "micro"),
+    (100_000_000, "small"),
+    (1_000_000_000, "mid"),
+    (10_000_000_000, "large"),
+    (100_000_000_000, "mega"),
+])
+def test_market_cap_tiers(db_session, market_cap, tier):
+    """Test market cap tier boundaries are inclusive lower bounds."""
+    service = make_service(db_session)
+    result = service.analyze_liquidity({"market_cap": market_cap, "volume_to_mcap_ratio": 0.05})
+    assert result["market_cap_tier"] == tier
+
+
+def test_supply_and_activity_buckets(db_session):
+    """Test supply and developer activity classification boundaries."""
+    service = make_service(db_session)
+    
+    supply = service.analyze_supply_structure({"percentage_circulating": 80})
+    assert supply["supply_status"] == "partial"
+    assert supply["inflation_pressure"] == "low"
+    
+    activity = service.assess_developer_activity({
+        "commit_count_4_weeks": 50, "total_issues": 10, "closed_issues": 5
+    })
+    assert activity["activity_level"] == "active"
+    assert activity["project_health"] == "stable"
+
+
+def test_classify_batch():
+    """Test vectorized classification matches the scalar buckets."""
+    from app.services.tokenomics import classify_batch, _MCAP_THRESHOLDS, _MCAP_LABELS
+    
+    tiers = classify_batch([0, 1e8, 5e9, 1e12], _MCAP_THRESHOLDS, _MCAP_LABELS)
+    assert list(tiers) == ["micro", "small", "mid", "mega"]
+
+
+def test_analyze_liquidity_batch_matches_scalar(db_session):
+    """Test batch liquidity analysis agrees with the per-symbol analyzer."""
+    service = make_service(db_session)
+    markets = [
+        {"market_cap": 2e11, "volume_to_mcap_ratio": 0.06},
+        {"market_cap": 5e9, "volume_to_mcap_ratio": 0.04},
+        {"market_cap": 5e8, "volume_to_mcap_ratio": 0.02},
+        {"market_cap": 1e6, "volume_to_mcap_ratio": 0.5},
+    ]
+    
+    assert service.analyze_liquidity_batch(markets) == [service.analyze_liquidity(m) for m in markets]
+
+
+def test_fetch_revalidates_stale_cache(db_session):
+    """Test a stale cache entry is revalidated with a conditional request."""
+    from datetime import datetime, timedelta
+    
+    asyncio.run(make_service(db_session).fetch_coingecko_tokenomics("BTCUSDT"))
+    row = db_session.get(TokenomicsCache, "bitcoin")
+    row.fetched_at = datetime.utcnow() - timedelta(days=1)
+    db_session.commit()
+    TokenomicsService._mem_cache.clear()
+    
+    service = make_service(db_session, payload={})
+    service.client.get.return_value.status_code = 304
+    data = asyncio.run(service.fetch_coingecko_tokenomics("BTCUSDT"))
+    
+    headers = service.client.get.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == 'W/"abc123"'
+    assert data["name"] == "Bitcoin"
+    assert service._load_cached("bitcoin") is not None
+
+
+def test_fetch_without_developer_data(db_session):
+    """Test partial fetches skip developer data and are cached separately."""
+    service = make_service(db_session)
+    
+    partial = asyncio.run(service.fetch_coingecko_tokenomics("BTCUSDT", need_developer=False))
+    full = asyncio.run(service.fetch_coingecko_tokenomics("BTCUSDT"))
+    
+    first_params = service.client.get.call_args_list[0].kwargs["params"]
+    assert first_params["developer_data"] == "false"
+    assert partial["developer"] == {}
+    assert full["developer"]["commit_count_4_weeks"] == 120
+    assert service.client.get.call_count == 2
+
+
+def test_corrupt_cache_row_is_refetched(db_session):
+    """Test an undecodable cache row is treated as a miss and re-downloaded."""
+    asyncio.run(make_service(db_session).fetch_coingecko_tokenomics("BTCUSDT"))
+    db_session.get(TokenomicsCache, "bitcoin").payload = b"not zlib"
+    db_session.commit()
+    TokenomicsService._mem_cache.clear()
+    
+    service = make_service(db_session)
+    data = asyncio.run(service.fetch_coingecko_tokenomics("BTCUSDT"))
+    
+    assert data["coin_id"] == "bitcoin"
+    assert service.client.get.call_count == 1
+    assert service.client.get.call_args.kwargs["headers"] is None
+
+
+def test_comprehensive_without_developer_data_skips_assessment(db_session):
+    """Test skipped developer data isn't reported as a dormant project."""
+    service = make_service(db_session)
+    
+    data = asyncio.run(service.get_comprehensive_tokenomics(
+        "BTCUSDT", 45000, 880_000_000_000, 30_000_000_000, need_developer=False
+    ))
+    
+    assert data["developer_assessment"]["activity_level"] == "not_fetched"
+    assert data["data_sources_available"]["developer_metrics"] is False
+
+
+def test_batch_runs_across_event_loops():
+    """Test a service can run large batches under separate event loops."""
+    from app.services.tokenomics import MAX_CONCURRENT_REQUESTS, _SYMBOL_MAP
+    service = make_service(None)  # no DB cache, so every run hits the client
+    response = service.client.get.return_value
+    
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0)
+        return response
+    
+    service.client.get.side_effect = slow_get
+    symbols = list(_SYMBOL_MAP)[:MAX_CONCURRENT_REQUESTS + 2]
+    requests = [(symbol, 1.0, 1e9, 1e8) for symbol in symbols]
+    
+    for _ in range(2):
+        TokenomicsService._mem_cache.clear()
+        results = asyncio.run(service.get_comprehensive_tokenomics_batch(requests))
+        assert all(r["data_quality"] == "COMPREHENSIVE" for r in results)